@@ -1,1304 +1,4261 @@
 #!/usr/bin/env python3
 import os
+import sys
+import csv
+import json
+import argparse
+import asyncio
 import time
 import re
-import uuid
+import contextlib
+import inspect
+import hashlib
+import sqlite3
+import gzip
+import collections
+import multiprocessing
+import multiprocessing.connection
 import random
 import string
-from playwright.sync_api import sync_playwright, expect, TimeoutError # type: ignore
-import pandas as pd
+import weakref
+from html.parser import HTMLParser
+from urllib.parse import urlparse, unquote
+from playwright.async_api import async_playwright, TimeoutError, Page, Locator, Mouse, Keyboard, ElementHandle # type: ignore
 from slugify import slugify # type: ignore
-from datetime import datetime
+from datetime import datetime, timedelta
 from tqdm import tqdm
 
+# Parquet çıktısı isteğe bağlı; pyarrow yoksa yalnızca --dataset kullanılamaz
+try:
+    import pyarrow as pa # type: ignore
+    import pyarrow.parquet as pq # type: ignore
+    import pyarrow.dataset as ds # type: ignore
+except ImportError:
+    pa = pq = ds = None
+
 def generate_random_id(length=8):
     """Unique ID oluştur"""
     letters = string.ascii_lowercase + string.digits
     return ''.join(random.choice(letters) for i in range(length))
 
-def scrape_google_maps(url, max_reviews=100, sort_by="newest"):
-    # Benzersiz bir ID oluştur
-    session_id = generate_random_id()
-    print(f"Google Maps verisi çekiliyor... (Sıralama: {sort_by}, Maksimum yorum: {max_reviews}, İşlem ID: {session_id})")
+# Yorum kartları ve alanları için seçiciler (locator ve toplu çıkarım ortak kullanır)
+REVIEW_CONTAINER_SELECTORS = [
+    'div.jftiEf',
+    'div[data-review-id]',
+    'div[jsaction*="reviewActionsGroup"]',
+    'div[jslog*="review"]',
+    'div.fontBodyMedium[style*="line-height"]',
+    'div[class*="review"]',
+    '[jsinstance*="review"]',
+    'div[data-hveid]'
+]
+REVIEW_STAR_SELECTOR = 'span[role="img"], span[aria-label*="yıldız"], div[role="img"]'
+REVIEW_TEXT_SELECTORS = ['span', 'div > span', '*[role="text"]', '[jscontroller]']
+REVIEW_USER_SELECTORS = ["a", "div.d4r55", "div[class*='user']", "div.WNxzHc"]
+REVIEW_NAME_SELECTORS = ['div.d4r55', 'a', 'div > a', 'div[class*="user"]', 'div[class*="name"]']
+REVIEW_DATE_SELECTORS = [
+    'span.rsqaWe', 
+    'span[class*="date"]', 
+    'span[aria-label*="gün"]', 
+    'span:has-text("ay önce")', 
+    'span:has-text("gün önce")',
+    'span:has-text("hafta önce")', 
+    'span:has-text("week")'
+]
+REVIEW_RATING_SELECTORS = ['span.kvMYJc', 'span[role="img"]', 'div[role="img"]', 'span[aria-label*="yıldız"]']
+
+# Yorum alanlarını doğrulayan kalıplar ve anahtar kelimeler (küçük harfli metne uygulanır)
+LINK_TEXT_PATTERN = re.compile(r'http|www|\.(com|net|org)')
+YEAR_PATTERN = re.compile(r'\d{4}')
+REVIEW_DATE_KEYWORDS = ("gün", "ay", "yıl", "hafta", "week")
+RELATIVE_DATE_UNITS = ("gün", "ay", "yıl", "hafta", "week", "day", "month", "year")
+
+# Çıkarım katmanları: fast her alan için yalnızca birincil (ilk) seçiciyi dener ve ıskalamaları kaydeder,
+# thorough yedek seçicileri yalnızca birincil seçicinin ıskaladığı alanlar için çalıştırır
+EXTRACTION_TIERS = ("fast", "thorough")
+# Kart alan gruplarında birincil seçicinin isabet sayılması için değerin uyması gereken kalıplar
+# (sayfa içinde büyük/küçük harf duyarsız RegExp olarak kullanılır; kalıbı olmayan grupta boş olmayan değer yeter)
+REVIEW_FIELD_HIT_PATTERNS = {
+    'text': r'(\S+\s+){10}\S',
+    'date': '|'.join(REVIEW_DATE_KEYWORDS) + r'|\d{4}',
+    'rating': r'yıldız|star'
+}
+
+def is_review_date(text):
+    """Metin bir yorum tarihine benziyor mu (göreli zaman ifadesi veya yıl)"""
+    lowered = text.lower()
+    return any(keyword in lowered for keyword in REVIEW_DATE_KEYWORDS) or bool(YEAR_PATTERN.search(text))
+
+def is_relative_date(text):
+    """'3 hafta önce' / '2 weeks ago' gibi kısa göreli zaman metni mi (küçük harfli metin beklenir)"""
+    return ("önce" in text or "ago" in text) and len(text) < 30 and any(unit in text for unit in RELATIVE_DATE_UNITS)
+
+# Yüklenmiş tüm yorum kartlarını tek bir evaluate çağrısıyla döndüren sayfa içi script.
+# Her alan grubu için seçici sırasına göre aday metinler döner, seçim Python tarafında yapılır.
+# Playwright'a özgü ':has-text("...")' son eki burada elle taklit edilir.
+# fresh: yalnızca daha önce çıkarılmamış kartları döndürür ve onları data-gms-extracted ile işaretler.
+# trim: döndürülen kartların içini boşaltır (yükseklik ve data-review-id korunur, kaydırma konumu bozulmaz).
+# tier: her alan grubunda önce birincil seçici denenir; yedekler yalnızca 'thorough' katmanında ve birincil
+# seçici ıskaladığında toplanır. Iskalayan gruplar kartın misses listesinde döner.
+REVIEW_CARDS_JS = r"""
+(groups) => {
+    const query = (root, selector) => {
+        const m = selector.match(/^(.*):has-text\("(.*)"\)$/);
+        if (!m) return Array.from(root.querySelectorAll(selector));
+        const needle = m[2].toLowerCase();
+        return Array.from(root.querySelectorAll(m[1]))
+            .filter(el => (el.textContent || '').toLowerCase().includes(needle));
+    };
+    const text = el => (el.textContent || '').trim();
+    const hits = Object.fromEntries(Object.entries(groups.hits).map(([group, pattern]) => [group, new RegExp(pattern, 'i')]));
+    const hit = (group, value) => {
+        const v = value && typeof value === 'object' ? value.text : value;
+        return !!v && (!hits[group] || hits[group].test(v));
+    };
+    const collect = (card, group, fn, misses) => {
+        const run = selector => {
+            try { return query(card, selector).map(fn); } catch (e) { return []; }
+        };
+        const selectors = groups[group];
+        const primary = run(selectors[0]);
+        if (primary.some(value => hit(group, value))) return [primary];
+        misses.push(group);
+        return groups.tier === 'fast' ? [primary] : [primary, ...selectors.slice(1).map(run)];
+    };
+
+    let cards = [];
+    for (const selector of groups.containers) {
+        let found;
+        try { found = query(document, selector); } catch (e) { continue; }
+        if (groups.fresh) {
+            found = found.filter(el => !el.closest('[data-gms-extracted]') && !el.querySelector('[data-gms-extracted]'));
+        }
+        const valid = found.filter(el => el.querySelector(groups.star) && (el.textContent || '').length > 50);
+        if (valid.length > (groups.fresh ? 0 : 5)) { cards = valid; break; }
+    }
+
+    const records = cards.map(card => {
+        const idNode = card.matches('[data-review-id]') ? card : card.querySelector('[data-review-id]');
+        const misses = [];
+        return {
+            id: idNode ? idNode.getAttribute('data-review-id') : null,
+            text: collect(card, 'text', text, misses),
+            user: collect(card, 'user', el => ({text: text(el), href: el.getAttribute('href') || ''}), misses),
+            name: collect(card, 'name', text, misses),
+            date: collect(card, 'date', text, misses),
+            rating: collect(card, 'rating', el => el.getAttribute('aria-label'), misses),
+            misses,
+        };
+    });
+
+    if (groups.fresh) {
+        // Önce tüm yükseklikleri oku, sonra yaz (tek yerleşim hesabı)
+        const heights = groups.trim ? cards.map(card => card.offsetHeight) : [];
+        cards.forEach((card, i) => {
+            card.setAttribute('data-gms-extracted', '');
+            if (!groups.trim) return;
+            if (records[i].id) card.setAttribute('data-review-id', records[i].id);
+            card.style.height = heights[i] + 'px';
+            card.replaceChildren();
+        });
+    }
+    return records;
+}
+"""
+
+async def extract_review_cards(page, fresh=False, trim=False, tier="thorough", misses=None):
+    """Yüklenmiş yorum kartlarını tek bir sayfa içi script ile JSON dizisi olarak al
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context(
-            viewport={'width': 1366, 'height': 768},
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-        page = context.new_page()
-        
-        # URL'ye git
+    fresh True ise yalnızca önceki çağrılarda alınmamış kartlar döner; trim ile bu kartların içi
+    sayfada boşaltılır. tier EXTRACTION_TIERS'tan biridir; birincil seçicinin ıskaladığı alan grupları
+    misses sayacına (collections.Counter) eklenir.
+    """
+    cards = await page.evaluate(REVIEW_CARDS_JS, {
+        'fresh': fresh,
+        'trim': trim,
+        'tier': tier,
+        'hits': REVIEW_FIELD_HIT_PATTERNS,
+        'containers': REVIEW_CONTAINER_SELECTORS,
+        'star': REVIEW_STAR_SELECTOR,
+        'text': REVIEW_TEXT_SELECTORS,
+        'user': REVIEW_USER_SELECTORS,
+        'name': REVIEW_NAME_SELECTORS,
+        'date': REVIEW_DATE_SELECTORS,
+        'rating': REVIEW_RATING_SELECTORS
+    })
+    if misses is not None:
+        for card in cards:
+            misses.update(card['misses'])
+    return cards
+
+def parse_review_card(card):
+    """Toplu alınan bir yorum kartını mevcut sezgisel kurallarla yorum kaydına çevir"""
+    # Yorum metni: ilk 10 kelimeden uzun metin
+    review_text = ""
+    for texts in card['text']:
+        for text in texts:
+            if len(text.split()) > 10:
+                review_text = text
+                break
+        if review_text:
+            break
+    
+    if not review_text or len(review_text.split()) <= 10:
+        return None
+    
+    # Kullanıcı bloğu: katkıda bulunan linki veya kısa bir isim metni
+    user_name = "Bilinmeyen Kullanıcı"
+    user_text = ""
+    for candidates in card['user']:
+        for candidate in candidates:
+            content = candidate['text']
+            if "contrib" in candidate['href'] and content:
+                user_text = content
+                break
+            if content and len(content) > 2 and len(content) < 50 and "+" not in content:
+                if not LINK_TEXT_PATTERN.search(content.lower()):
+                    user_text = content
+                    break
+        if user_text:
+            break
+    
+    if user_text:
+        user_name = user_text.split('\n')[0].strip() if '\n' in user_text else user_text
+    
+    # Kullanıcı ismi boşsa veya çok uzunsa, alternatif seçicileri dene
+    if not user_name or len(user_name) > 50 or user_name == "Bilinmeyen Kullanıcı":
+        for texts in card['name']:
+            for text in texts:
+                if text and len(text) > 2 and len(text) < 50 and "+" not in text and "yorum" not in text.lower() and "yıldız" not in text.lower():
+                    user_name = text
+                    break
+            if user_name != "Bilinmeyen Kullanıcı":
+                break
+    
+    # Yorum tarihi
+    review_date = "Belirtilmemiş"
+    for texts in card['date']:
+        for text in texts:
+            if text and is_review_date(text):
+                review_date = text
+                break
+        if review_date != "Belirtilmemiş":
+            break
+    
+    # "birkaç hafta önce" tarzındaki genel zaman metinleri
+    if review_date == "Belirtilmemiş":
+        for text in card['text'][0]:
+            text = text.lower()
+            if is_relative_date(text):
+                review_date = text
+                break
+    
+    if review_date == "Belirtilmemiş":
+        review_date = "Yeni yorum"
+    
+    # Puan: her seçicinin ilk elementinin aria-label değeri
+    rating = "Belirtilmemiş"
+    for labels in card['rating']:
+        if labels:
+            aria_label = labels[0]
+            if aria_label and ("yıldız" in aria_label.lower() or "star" in aria_label.lower()):
+                rating = aria_label
+                break
+    
+    if len(user_name) > 50:
+        user_name = user_name[:47] + "..."
+    
+    return {
+        'Kullanici': user_name,
+        'Tarih': review_date,
+        'Puan': rating,
+        'Yorum': review_text,
+        'Yorum_ID': card['id'] or ""
+    }
+
+async def extract_reviews_batch(page, max_reviews, writer, skip_ids=None, stop_ids=None, tier="thorough", misses=None, stats=None):
+    """Yorumları tek bir sayfa içi script ile toplu çıkar, Python tarafında işle ve yazıcıya aktar
+    
+    skip_ids içindeki yorumlar atlanır, stop_ids içindeki bir yoruma gelince (son çalıştırmanın
+    işareti) durulur ve stats verilirse stats['reached_known'] True yapılır; yazılan yorum sayısı döner.
+    """
+    try:
+        cards = await extract_review_cards(page, tier=tier, misses=misses)
+    except Exception as e:
+        print(f"Toplu yorum çıkarımı başarısız, locator yöntemine geçiliyor: {e}")
+        return await extract_reviews_with_locators(page, max_reviews, writer, skip_ids, stop_ids, stats)
+    
+    print(f"İşlenecek {len(cards)} yorum kartı bulundu (toplu çıkarım)")
+    counter = 0
+    for card in cards:
+        # İşaret sınırdan önce bakılır; sınır tam işaretin önünde dolduysa da işarete ulaşılmış sayılır
+        if stop_ids and card['id'] in stop_ids:
+            print("Son çalıştırmada görülen yoruma ulaşıldı, çıkarım durduruldu")
+            if stats is not None:
+                stats['reached_known'] = True
+            break
+        if counter >= max_reviews:
+            break
+        if skip_ids and card['id'] in skip_ids:
+            continue
         try:
-            page.goto(url, wait_until="networkidle")
-        except:
-            page.goto(url, wait_until="load")
-            
-        # Çerezleri kabul et (gerekirse)
+            record = parse_review_card(card)
+        except Exception as e:
+            print(f"Yorum işlenirken hata: {e}")
+            continue
+        if record and writer.write(record):
+            counter += 1
+    
+    return counter
+
+# Yorum listesini taşıyan XHR uç noktaları (yeni ve eski Maps arayüzü)
+REVIEW_RESPONSE_PATTERN = re.compile(r'/maps/rpc/listugcposts|/maps/preview/review/listentitiesreviews')
+# Google JSON yanıtlarının başındaki XSSI koruma öneki
+XSSI_PREFIX = ")]}'"
+
+def _dig(data, *path):
+    """İç içe listelerde güvenli indeksleme; yol yoksa None döndür"""
+    for key in path:
+        try:
+            data = data[key]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return data
+
+def _review_record(review_id, user_name, review_date, rating, review_text):
+    """Ağdan çözülen alanları DOM çıkarımıyla aynı yorum kaydı biçimine getir"""
+    if not isinstance(review_id, str) or not isinstance(rating, int) or not 1 <= rating <= 5:
+        return None
+    if not isinstance(review_text, str) or not review_text.strip():
+        return None
+    
+    user_name = user_name if isinstance(user_name, str) and user_name else "Bilinmeyen Kullanıcı"
+    if len(user_name) > 50:
+        user_name = user_name[:47] + "..."
+    
+    return {
+        'Kullanici': user_name,
+        'Tarih': review_date if isinstance(review_date, str) and review_date else "Yeni yorum",
+        'Puan': f"{rating} yıldız",
+        'Yorum': review_text.strip(),
+        'Yorum_ID': review_id
+    }
+
+def _decode_ugc_post(item):
+    """listugcposts yanıtındaki tek bir yorumu çöz"""
+    post = _dig(item, 0)
+    return _review_record(
+        _dig(post, 0),
+        _dig(post, 1, 4, 5, 0),
+        _dig(post, 1, 6),
+        _dig(post, 2, 0, 0),
+        _dig(post, 2, 15, 0, 0)
+    )
+
+def _decode_entity_review(item):
+    """listentitiesreviews (eski arayüz) yanıtındaki tek bir yorumu çöz"""
+    return _review_record(
+        _dig(item, 10),
+        _dig(item, 0, 1),
+        _dig(item, 1),
+        _dig(item, 4),
+        _dig(item, 3)
+    )
+
+def decode_review_payload(text):
+    """Yorum listesi XHR yanıtının gövdesini yorum kayıtlarına çevir"""
+    text = text.strip()
+    if text.startswith(XSSI_PREFIX):
+        text = text[len(XSSI_PREFIX):]
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return []
+    
+    records = []
+    for item in _dig(data, 2) or []:
+        record = _decode_ugc_post(item) or _decode_entity_review(item)
+        if record:
+            records.append(record)
+    return records
+
+class ReviewResponseCollector:
+    """page.on("response") ile yorum listesi yanıtlarını dinleyip yorum kayıtlarına çözen toplayıcı
+    
+    Yazıcı bağlanana kadar çözülen kayıtlar bellekte tutulur, sonrasında doğrudan yazıcıya gider.
+    """
+    
+    def __init__(self, max_reviews):
+        self.max_reviews = max_reviews
+        self.buffer = []
+        self.writer = None
+        self.written = 0
+        self.responses = 0
+        self.seen_ids = set()
+        self.stop_ids = None
+        self.reached_watermark = False
+        self.pending = set()
+    
+    def attach(self, page):
+        page.on("response", self.on_response)
+    
+    def detach(self, page):
         try:
-            accept_button = page.get_by_role("button", name=re.compile("(Kabul|Accept|Tümünü kabul|Agree)", re.IGNORECASE))
-            if accept_button:
-                accept_button.click(timeout=5000)
-                time.sleep(2)
+            page.remove_listener("response", self.on_response)
         except:
             pass
-                
-        # Sayfanın tamamen yüklenmesi için bekle
-        time.sleep(5)
-        
-        # Mekan ismini al - daha sağlam yöntemlerle
-        place_name = ""
+    
+    def on_response(self, response):
+        if REVIEW_RESPONSE_PATTERN.search(response.url):
+            task = asyncio.ensure_future(self._read(response))
+            self.pending.add(task)
+            task.add_done_callback(self.pending.discard)
+    
+    async def _read(self, response):
         try:
-            # Daha fazla şans vermek için sayfanın yüklenmesini bekle
-            time.sleep(5)
-            
-            # Birkaç farklı seçici dene
-            selectors = [
-                'h1.DUwDvf',  # En çok kullanılan h1 sınıfı
-                'h1',  # Herhangi bir h1
-                '[role="main"] h1', 
-                'header h1', 
-                'div[role="main"] div[role="heading"]', 
-                'div.fontHeadlineLarge',
-                'div.tAiQdd',
-                'div.kSQYJe',
-                'div[data-attrid] span'  # Bilgi panelindeki isim
-            ]
-            
-            for selector in selectors:
-                try:
-                    place_name_elements = page.locator(selector).all()
-                    for elem in place_name_elements:
-                        text = elem.text_content().strip()
-                        if text and len(text) >= 3 and len(text) < 100:
-                            # Yapılan kontrollerle, gerçekten isim mi diye kontrol et
-                            # Tipik olarak restoran isimleri linklerde olmaz
-                            if not elem.locator('a').count() and not re.search(r'http|www|\.(com|net|org)', text.lower()):
-                                place_name = text
-                                print(f"Mekan bulundu: {place_name}")
-                                break
-                    if place_name:
-                        break
-                except:
-                    continue
-            
-            # Hala bulunamadıysa, sayfa başlığından almayı dene
-            if not place_name:
-                try:
-                    title = page.title()
-                    # Başlık genellikle "Restoran İsmi - Google Haritalar" formatındadır
-                    if " - " in title:
-                        place_name = title.split(" - ")[0].strip()
-                        print(f"Mekan başlıktan bulundu: {place_name}")
-                except:
-                    pass
-            
-            # Son çare olarak, herhangi bir title veya h1 içeriğini al
-            if not place_name:
-                try:
-                    # Meta bilgilerinden al
-                    meta_title = page.locator('meta[property="og:title"]').get_attribute('content')
-                    if meta_title:
-                        # "xxx - Google Haritalar" formatını temizle
-                        place_name = re.sub(r' - Google (Haritalar|Maps)$', '', meta_title).strip()
-                        print(f"Mekan meta bilgisinden bulundu: {place_name}")
-                except:
-                    # Herhangi bir heading bul
-                    try:
-                        all_h1 = page.locator('h1, [role="heading"][aria-level="1"]').all()
-                        for h in all_h1:
-                            text = h.text_content().strip()
-                            if text and len(text) >= 3 and len(text) < 100:
-                                place_name = text
-                                print(f"Mekan herhangi bir başlıktan bulundu: {place_name}")
-                                break
-                    except:
-                        pass
-            
-            # Cümle içinde geçen "Maps" kelimesini temizle
-            if place_name and ("Maps" in place_name or "Haritalar" in place_name):
-                place_name = re.sub(r' - Google (Haritalar|Maps)$', '', place_name).strip()
-            
-            if not place_name:
-                place_name = "Bilinmeyen_Mekan"
-                print("Mekan adı bulunamadı, varsayılan isim kullanılıyor")
+            body = await response.text()
         except Exception as e:
-            place_name = "Bilinmeyen_Mekan"
-            print(f"Mekan adı alınamadı: {e}")
-        
-        # Klasör oluştur (mekan adı + random ID ile)
-        folder_name = f"{slugify(place_name)}_{session_id}"
-        folder_path = os.path.join(os.path.expanduser("~/Downloads"), folder_name)
-        os.makedirs(folder_path, exist_ok=True)
-        print(f"Veriler şu klasörde toplanacak: {folder_path}")
-        
-        # Debug için ekran görüntüsü al
+            print(f"Yorum yanıtı okunamadı: {e}")
+            return
+        self.responses += 1
+        for record in decode_review_payload(body):
+            if self.reached_watermark:
+                break
+            if self.stop_ids and record['Yorum_ID'] in self.stop_ids:
+                self.reached_watermark = True
+                break
+            if record['Yorum_ID'] not in self.seen_ids:
+                self.seen_ids.add(record['Yorum_ID'])
+                self._emit(record)
+    
+    def _emit(self, record):
+        if self.writer is None:
+            self.buffer.append(record)
+        elif self.written < self.max_reviews and self.writer.write(record):
+            self.written += 1
+    
+    def bind(self, writer, stop_ids=None):
+        """Yazıcıyı bağla ve bekleyen kayıtları ona aktar; stop_ids yorumlarından sonrası yazılmaz"""
+        self.writer = writer
+        self.stop_ids = stop_ids
+        buffered, self.buffer = self.buffer, []
+        for record in buffered:
+            if stop_ids and record['Yorum_ID'] in stop_ids:
+                self.reached_watermark = True
+                break
+            self._emit(record)
+    
+    async def drain(self):
+        """Okunmakta olan yanıtların bitmesini bekle"""
+        if self.pending:
+            await asyncio.gather(*self.pending, return_exceptions=True)
+
+async def extract_reviews_network(page, collector, max_reviews, writer, stop_ids=None, tier="thorough", misses=None, stats=None):
+    """Ağ yanıtlarından çözülen yorumları kullan; ağda görülmeyen kartları DOM'dan tamamla"""
+    await collector.drain()
+    counter = collector.written
+    print(f"{len(collector.seen_ids)} yorum {collector.responses} ağ yanıtından çözüldü")
+    
+    # İlk yorumlar sayfaya gömülü gelebilir; eksik kalanları DOM'dan al
+    if counter < max_reviews:
+        counter += await extract_reviews_batch(page, max_reviews - counter, writer, skip_ids=collector.seen_ids, stop_ids=stop_ids,
+                                              tier=tier, misses=misses, stats=stats)
+    
+    return counter
+
+# Yüklenen yorum kartlarını saymak için kullanılan seçici
+REVIEW_COUNT_SELECTOR = 'div.jftiEf, div[data-review-id], div[jslog*="review"]'
+
+# Yorum kartlarını içeren kaydırılabilir akışı bulup sonuna kaydıran script.
+# Kart sayısını döndürür; kart yoksa bilinen akış sınıfına veya sayfanın kendisine düşer.
+SCROLL_FEED_JS = r"""
+(selector) => {
+    const scrollable = el => {
+        const overflow = getComputedStyle(el).overflowY;
+        return (overflow === 'auto' || overflow === 'scroll') && el.scrollHeight > el.clientHeight;
+    };
+    const card = document.querySelector(selector);
+    let feed = card ? card.parentElement : null;
+    while (feed && !scrollable(feed)) feed = feed.parentElement;
+    if (!feed) feed = document.querySelector('div.m6QErb.DxyBCb') || document.scrollingElement;
+    feed.scrollTop = feed.scrollHeight;
+    return document.querySelectorAll(selector).length;
+}
+"""
+
+async def loaded_review_ids(page):
+    """Sayfada yüklü yorum kartlarının data-review-id değerlerini al"""
+    return await page.evaluate("() => Array.from(new Set(Array.from(document.querySelectorAll('[data-review-id]'), el => el.getAttribute('data-review-id'))))")
+
+# start'tan sonraki data-review-id elementlerinin kimliklerini ve toplam element sayısını döndüren script
+NEW_REVIEW_IDS_JS = r"""
+(start) => {
+    const elements = document.querySelectorAll('[data-review-id]');
+    const ids = new Set();
+    for (let i = start; i < elements.length; i++) ids.add(elements[i].getAttribute('data-review-id'));
+    return [elements.length, Array.from(ids)];
+}
+"""
+
+async def new_review_ids(page, start=0):
+    """Yalnızca son bakıştan beri yüklenen kartların kimliklerini al; (element sayısı, kimlikler) döndür"""
+    count, ids = await page.evaluate(NEW_REVIEW_IDS_JS, start)
+    return count, ids
+
+async def load_reviews(page, max_reviews, max_stalls=3, growth_timeout=5000, stop_ids=None):
+    """Yorum akışını kaydır ve kart sayısı artana kadar bekle; hedefe ulaşınca veya akış durunca bitir
+    
+    stop_ids verilirse (en yeni sıralamada bilinen yorumlar) bunlardan birine ulaşıldığında durur.
+    """
+    target = int(max_reviews * 1.2)  # Biraz fazladan yorum yükleyelim (bazıları filtreleneceği için)
+    batches = []
+    stalls = 0
+    scrolls = 0
+    batch_start = time.time()
+    
+    try:
+        review_count = await page.locator(REVIEW_COUNT_SELECTOR).count()
+    except:
+        review_count = 0
+    
+    print(f"Yorumlar yükleniyor... (hedef: {target} kart, {max_stalls} başarısız denemede durulacak)")
+    progress = tqdm(total=target, initial=min(review_count, target))
+    
+    reached_known = False
+    checked = 0  # stop_ids ile karşılaştırılmış data-review-id element sayısı
+    while review_count < target and stalls < max_stalls:
+        if stop_ids:
+            checked, ids = await new_review_ids(page, checked)
+            if stop_ids.intersection(ids):
+                reached_known = True
+                break
         try:
-            page.screenshot(path=os.path.join(folder_path, "main_page.png"), full_page=True)
-        except:
-            pass
+            await page.evaluate(SCROLL_FEED_JS, REVIEW_COUNT_SELECTOR)
+            scrolls += 1
+            # Yeni kartlar gelene kadar bekle (sabit uyku yerine)
+            await page.wait_for_function(
+                "([selector, count]) => document.querySelectorAll(selector).length > count",
+                arg=[REVIEW_COUNT_SELECTOR, review_count],
+                timeout=growth_timeout
+            )
+        except TimeoutError:
+            stalls += 1
+            print(f"Yeni yorum yüklenmedi ({stalls}/{max_stalls})")
+            continue
+        except Exception as e:
+            stalls += 1
+            print(f"Kaydırma sırasında hata: {e}")
+            continue
         
-        # ===== Restoran genel bilgilerini topla (iyileştirilmiş) =====
-        general_info = {
-            'Mekan_Adi': [place_name],
-            'Puan': [""],
-            'Yorum_Sayisi': [""],
-            'Adres': [""],
-            'Telefon': [""],
-            'Web_Sitesi': [""],
-            'Kategori': [""],
-            'Fiyat_Seviyesi': [""],
-            'Calisma_Saatleri': [""]
+        new_count = await page.locator(REVIEW_COUNT_SELECTOR).count()
+        elapsed = time.time() - batch_start
+        batches.append({
+            'batch': len(batches) + 1,
+            'scrolls': scrolls,
+            'seconds': round(elapsed, 3),
+            'new_cards': new_count - review_count,
+            'total_cards': new_count
+        })
+        progress.update(min(new_count, target) - min(review_count, target))
+        review_count = new_count
+        stalls = 0
+        scrolls = 0
+        batch_start = time.time()
+    
+    progress.close()
+    
+    for batch in batches:
+        print(f"Parti {batch['batch']}: {batch['new_cards']} yeni kart, {batch['scrolls']} kaydırma, {batch['seconds']:.2f} sn (toplam {batch['total_cards']})")
+    if reached_known:
+        print(f"Daha önce çekilmiş yorumlara ulaşıldı ({review_count} kart), kaydırma sonlandırıldı")
+    elif review_count >= target:
+        print(f"Yeterli yorum yüklendi ({review_count} kart), kaydırma sonlandırıldı")
+    else:
+        print(f"Akış büyümeyi durdurdu, {review_count} kart yüklendi")
+    
+    return batches
+
+# Kısaltılmış yorumları açan "Daha fazla" / "More" butonlarının metinleri ve aria-label değerleri
+REVIEW_MORE_LABELS = ["Daha fazla", "More", "Devamını oku", "See more"]
+
+# Yüklenmiş her yorum kartındaki ilk açılmamış "Daha fazla" butonuna tek bir script içinde tıklar
+EXPAND_REVIEWS_JS = r"""
+({selector, labels}) => {
+    const needles = labels.map(label => label.toLowerCase());
+    const matches = el => {
+        const label = (el.getAttribute('aria-label') || '').trim().toLowerCase();
+        const text = (el.textContent || '').trim().toLowerCase();
+        return needles.includes(label) || (text.length <= 20 && needles.some(needle => text.includes(needle)));
+    };
+    let clicked = 0;
+    for (const card of document.querySelectorAll(selector)) {
+        const button = Array.from(card.querySelectorAll('button, [role="button"], span[aria-label]'))
+            .find(el => el.getAttribute('aria-expanded') !== 'true' && matches(el));
+        if (button) {
+            button.click();
+            clicked++;
         }
-        
-        print("Genel bilgiler toplanıyor...")
-        
-        # Önce ana sayfaya veya genel bakış sekmesine geçmeye çalışalım
+    }
+    return clicked;
+}
+"""
+
+# DOM'da belirtilen süre boyunca değişiklik olmayana kadar bekler
+SETTLE_DOM_JS = r"""
+(quietMs) => new Promise(resolve => {
+    let timer;
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(done, quietMs);
+    });
+    function done() {
+        observer.disconnect();
+        resolve(true);
+    }
+    observer.observe(document.body, {subtree: true, childList: true, characterData: true});
+    timer = setTimeout(done, quietMs);
+})
+"""
+
+async def expand_reviews(page, quiet_ms=300, timeout=3000):
+    """Yüklenmiş tüm kısaltılmış yorumları tek seferde aç ve DOM durulana kadar bir kez bekle"""
+    try:
+        clicked = await page.evaluate(EXPAND_REVIEWS_JS, {'selector': REVIEW_COUNT_SELECTOR, 'labels': REVIEW_MORE_LABELS})
+    except Exception as e:
+        print(f"'Daha fazla' butonları açılamadı: {e}")
+        return 0
+    if clicked:
         try:
-            for selector in [
-                'button[data-tab-index="0"]',
-                'button:has-text("Genel bakış")',
-                'button:has-text("Ana bilgiler")',
-                'div[role="tab"]:has-text("Genel")'
-            ]:
-                try:
-                    elements = page.locator(selector).all()
-                    for element in elements:
-                        if "genel" in element.text_content().lower() or "ana" in element.text_content().lower() or "bakış" in element.text_content().lower():
-                            element.click(timeout=3000)
-                            print("Ana bilgiler sekmesine geçildi")
-                            time.sleep(2)
-                            break
-                except:
-                    continue
-        except:
+            await asyncio.wait_for(page.evaluate(SETTLE_DOM_JS, quiet_ms), timeout / 1000)
+        except asyncio.TimeoutError:
             pass
-        
-        # Daha çok veri görmek için ekranı biraz kaydır
-        page.mouse.wheel(0, 300)
-        time.sleep(1)
-        
-        # Kategori bilgisini al
+        except Exception as e:
+            print(f"DOM'un durulması beklenirken hata: {e}")
+        print(f"{clicked} kısaltılmış yorum açıldı")
+    return clicked
+
+# Akış modunda bir çıkarım turundan önce biriktirilen en az yeni kart sayısı
+STREAM_CHUNK_CARDS = 30
+
+class HeapMonitor:
+    """CDP Performance.getMetrics ile sayfanın JS heap boyutunu ve DOM düğüm sayısını örnekleyen ölçer
+    
+    Yalnızca Chromium'da çalışır; CDP oturumu açılamazsa örnekler sessizce atlanır.
+    """
+    
+    def __init__(self):
+        self.session = None
+        self.samples = []
+    
+    async def attach(self, page):
+        # CDP oturumu sayaçlı vekil değil, asıl Page nesnesiyle açılmalı
+        page = page._target if isinstance(page, MeteredObject) else page
         try:
-            for selector in [
-                'button[jsaction*="category"] span',
-                'div[jsaction*="category"]',
-                'span.DkEaL',
-                'span[jstcache*="category"]',
-                'div.cX2WmPgCkHi__section-info-text',
-                'div.fontBodyMedium span', 
-                'button[aria-label*="işletme kategorisi"]',
-                'span.YhemCb'
-            ]:
-                try:
-                    elements = page.locator(selector).all()
-                    for element in elements:
-                        text = element.text_content().strip()
-                        if text and len(text) > 2 and len(text) < 50 and not re.search(r'\d', text):
-                            # Restoran, Kafe gibi kategorileri içeriyor mu kontrol et
-                            if any(keyword in text.lower() for keyword in ["restoran", "kafe", "cafe", "bar", "pub", "lokanta", "bistro", "pizzeria", "kebap"]):
-                                general_info['Kategori'] = [text]
-                                print(f"Kategori: {text}")
-                                break
-                    if general_info['Kategori'] != [""]:
-                        break
-                except:
-                    continue
+            self.session = await page.context.new_cdp_session(page)
+            await self.session.send("Performance.enable")
+        except Exception as e:
+            print(f"JS heap ölçümü kullanılamıyor: {e}")
+            self.session = None
+    
+    async def sample(self, cards):
+        """O anki heap ve düğüm sayısını işlenen/yüklenen kart sayısıyla birlikte kaydet"""
+        if self.session is None:
+            return None
+        try:
+            response = await self.session.send("Performance.getMetrics")
+        except Exception:
+            return None
+        values = {metric['name']: metric['value'] for metric in response['metrics']}
+        sample = {
+            'cards': cards,
+            'heap_mb': round(values.get('JSHeapUsedSize', 0) / 1_000_000, 1),
+            'nodes': int(values.get('Nodes', 0))
+        }
+        self.samples.append(sample)
+        return sample
+    
+    def summary(self):
+        if not self.samples:
+            return {}
+        return {
+            'peak_heap_mb': max(sample['heap_mb'] for sample in self.samples),
+            'peak_nodes': max(sample['nodes'] for sample in self.samples),
+            'samples': self.samples
+        }
+
+async def extract_stream_chunk(page, max_reviews, writer, stats, stop_ids=None, trim=True, tier="thorough", misses=None):
+    """Henüz işlenmemiş kartları aç, çıkar (trim ile sayfada boşalt) ve yazıcıya aktar
+    
+    stop_ids içindeki bir yoruma ulaşılırsa False döner.
+    """
+    await expand_reviews(page)
+    cards = await extract_review_cards(page, fresh=True, trim=trim, tier=tier, misses=misses)
+    stats['extracted'] += len(cards)
+    for card in cards:
+        if stop_ids and card['id'] in stop_ids:
+            print("Daha önce çekilmiş yoruma ulaşıldı, akış durduruldu")
+            return False
+        if writer.count >= max_reviews:
+            break
+        try:
+            record = parse_review_card(card)
+        except Exception as e:
+            print(f"Yorum işlenirken hata: {e}")
+            continue
+        if not record:
+            continue
+        if writer.write(record):
+            stats['new'] += 1
+        else:
+            stats['duplicates'] += 1
+    return True
+
+async def stream_reviews(page, max_reviews, writer, stats=None, stop_ids=None, trim=True, heap=None, max_stalls=3, growth_timeout=5000,
+                         tier="thorough", misses=None):
+    """Akışı kaydırırken biriken kartları STREAM_CHUNK_CARDS'lık turlarla çıkarıp yazıcıya aktar
+    
+    trim True ise işlenen kartların içi sayfada boşaltılır; böylece DOM ve JS heap yorum sayısıyla
+    büyümez. Hedef yazıcının toplam sayısına göre uygulanır, aynı yazıcıyı paylaşan paralel parçalar
+    ortak hedefte birlikte durur. heap verilirse her turdan sonra örnek alınır. İstatistikleri döndürür.
+    """
+    stats = stats if stats is not None else {}
+    for key in ('cards', 'extracted', 'new', 'duplicates'):
+        stats.setdefault(key, 0)
+    prefix = f"[{stats['sort_by']}] " if 'sort_by' in stats else ""
+    extracted_at = 0
+    stalls = 0
+    reached_known = False
+    while writer.count < max_reviews and stalls < max_stalls and not reached_known:
+        try:
+            loaded = await page.evaluate(SCROLL_FEED_JS, REVIEW_COUNT_SELECTOR)
+            await page.wait_for_function(
+                "([selector, count]) => document.querySelectorAll(selector).length > count",
+                arg=[REVIEW_COUNT_SELECTOR, loaded],
+                timeout=growth_timeout
+            )
+            stalls = 0
+        except TimeoutError:
+            stalls += 1
         except Exception as e:
-            print(f"Kategori alınamadı: {e}")
+            stalls += 1
+            print(f"{prefix}Kaydırma sırasında hata: {e}")
         
-        # Puanı al (daha güvenilir)
+        # Yeterince yeni kart birikmediyse ve akış hâlâ büyüyorsa kaydırmaya devam et
+        loaded = await page.locator(REVIEW_COUNT_SELECTOR).count()
+        stats['cards'] = loaded
+        if stalls == 0 and loaded - extracted_at < STREAM_CHUNK_CARDS:
+            continue
+        reached_known = not await extract_stream_chunk(page, max_reviews, writer, stats, stop_ids, trim, tier, misses)
+        extracted_at = loaded
+        if heap:
+            await heap.sample(stats['extracted'])
+    
+    stats['exhausted'] = stalls >= max_stalls
+    stats['reached_known'] = reached_known
+    return stats
+
+async def extract_reviews_with_locators(page, max_reviews, writer, skip_ids=None, stop_ids=None, stats=None):
+    """Yorumları her kart için ayrı locator çağrılarıyla çıkar (eski yöntem); stop_ids ve stats extract_reviews_batch'teki gibi"""
+    # Yorumları bul
+    review_elements = []
+    
+    for selector in REVIEW_CONTAINER_SELECTORS:
         try:
-            rating_found = False
-            
-            # Birinci yöntem: Başlık yanındaki büyük puan
-            for selector in [
-                'span.fontDisplayLarge', 
-                'div.F7nice',
-                'span.ceNzKf',
-                'span[aria-hidden="true"]',
-                '[role="img"][aria-label*="yıldız"]',
-                '[aria-label*="yıldız"]',
-                'div[role="img"]'
-            ]:
-                try:
-                    elements = page.locator(selector).all()
-                    for element in elements:
-                        text = element.text_content().strip()
-                        if text and re.search(r'[0-9]', text) and len(text) < 5:
-                            # 1 ile 5 arasında bir puan olduğunu doğrula
-                            if re.search(r'[1-5]', text):
-                                # Virgül içeren metinlerde (4,7 gibi) nokta ile değiştir
-                                if ',' in text:
-                                    text = text.replace(',', '.')
-                                
-                                # Sadece sayı içeren metinlerde küsurat yoksa .0 ekle
-                                if text.isdigit() and len(text) == 1:
-                                    text = text + '.0'
-                                
-                                general_info['Puan'] = [text]
-                                print(f"Puan: {text}")
-                                rating_found = True
-                                break
-                    if rating_found:
-                        break
-                except:
-                    continue
-            
-            # İkinci yöntem: Puan yanındaki yıldız ikonlarından çıkarma
-            if not rating_found:
-                for star_selector in [
-                    'aria-label*="stars"',
-                    'aria-label*="star"',
-                    'aria-label*="yıldız"',
-                    '[role="img"][aria-label]'
-                ]:
-                    try:
-                        star_elements = page.locator(f'[{star_selector}]').all()
-                        for star_elem in star_elements:
-                            aria_label = star_elem.get_attribute('aria-label')
-                            if aria_label:
-                                # "4.5 stars" veya "4,5 yıldız" formatlarını bul
-                                star_match = re.search(r'([0-9][.,][0-9]|[0-9])\s*(stars|star|yıldız|puan)', aria_label.lower())
-                                if star_match:
-                                    # Standardize et (nokta kullan, virgül değil)
-                                    rating_text = star_match.group(1).replace(',', '.')
-                                    general_info['Puan'] = [rating_text]
-                                    print(f"Puan (yıldız ikonundan): {rating_text}")
-                                    rating_found = True
-                                    break
-                        if rating_found:
-                            break
-                    except:
-                        continue
-            
-            # Üçüncü yöntem: Sayfa içeriğinde "5 üzerinden X" gibi ifadeler ara
-            if not rating_found:
-                rating_patterns = [
-                    r'([0-9],[0-9]) üzerinden 5',
-                    r'([0-9]\.[0-9]) out of 5',
-                    r'([0-9],[0-9])/5',
-                    r'5 üzerinden ([0-9],[0-9])',
-                    r'5 out of ([0-9]\.[0-9])'
-                ]
+            found_elements = await page.locator(selector).all()
+            if found_elements and len(found_elements) > 0:
+                print(f"{len(found_elements)} potansiyel yorum elementi bulundu: {selector}")
                 
-                page_text = page.content()
-                for pattern in rating_patterns:
-                    match = re.search(pattern, page_text)
-                    if match:
-                        # Grup 1'i al, eğer yoksa grup 0'ı al
-                        rating_text = match.group(1) if match.group(1) else match.group(0)
-                        rating_text = rating_text.replace(',', '.')
-                        general_info['Puan'] = [rating_text]
-                        print(f"Puan (metin içinden): {rating_text}")
-                        rating_found = True
-                        break
-            
-            # Dördüncü yöntem: Sayfa başlığından çıkarma
-            if not rating_found:
-                try:
-                    title = page.title()
-                    # "Restaurant Name - 4.5 (123 reviews)" formatı
-                    title_match = re.search(r'([0-9][.,][0-9]|[0-9])\s*\(', title)
-                    if title_match:
-                        rating_text = title_match.group(1).replace(',', '.')
-                        general_info['Puan'] = [rating_text]
-                        print(f"Puan (başlıktan): {rating_text}")
-                        rating_found = True
-                except:
-                    pass
-            
-            # Eğer hala bulunamadıysak, sayfadaki tüm potansiyel puan metinlerini ara
-            if not rating_found:
-                all_texts = page.locator('span, div').all()
-                for elem in all_texts:
+                # İçerik kontrolü yap
+                valid_elements = []
+                for elem in found_elements:
                     try:
-                        text = elem.text_content().strip()
-                        # "4.5" veya "4,5" formatında bir metin ara
-                        if re.match(r'^[0-9][.,][0-9]$', text) or re.match(r'^[1-5]$', text):
-                            rating_text = text.replace(',', '.')
-                            general_info['Puan'] = [rating_text]
-                            print(f"Puan (genel arama): {rating_text}")
-                            rating_found = True
-                            break
-                    except Exception:
+                        # Yorum içeriği kontrolü
+                        content = await elem.text_content()
+                        # Yıldız değeri kontrolü
+                        has_star = await elem.locator(REVIEW_STAR_SELECTOR).count() > 0
+                        
+                        if has_star and len(content) > 50:  # Mantıklı bir içerik mi?
+                            valid_elements.append(elem)
+                    except:
                         pass
+                
+                if len(valid_elements) > 5:  # Yeterince yorum bulduk mu?
+                    review_elements = valid_elements
+                    break
         except Exception as e:
-            print(f"Puan alınamadı: {e}")
-        
-        # Yorum sayısını al
+            print(f"Yorum elementleri aranırken hata: {e}")
+    
+    print(f"İşlenecek {len(review_elements)} yorum elementi bulundu")
+    counter = 0
+    
+    # Her bir yorum için işlem yap
+    for review in review_elements:
         try:
-            for selector in [
-                'div.fontBodyMedium span:has-text("review")',
-                'span.UY7F9',
-                'button[data-tab-index="1"] div',
-                'span:has-text("yorum")',
-                'span:has-text("değerlendirme")',
-                'span.F7nice',
-                'div[aria-label*="yorum"]'
-            ]:
-                try:
-                    elements = page.locator(selector).all()
-                    for element in elements:
-                        text = element.text_content().strip()
-                        if re.search(r'[0-9]', text) and ("yorum" in text.lower() or "review" in text.lower() or "değerlendirme" in text.lower()):
-                            # Sadece rakamı almak için regex kullan
-                            nums = re.findall(r'[0-9]+', text)
-                            if nums:
-                                review_count = ''.join(nums)
-                                general_info['Yorum_Sayisi'] = [f"{review_count} yorum"]
-                                print(f"Yorum sayısı: {review_count}")
-                                break
-                    if general_info['Yorum_Sayisi'] != [""]:
-                        break
-                except:
-                    continue
-        except Exception as e:
-            print(f"Yorum sayısı alınamadı: {e}")
+            review_id = await review.get_attribute('data-review-id') or ""
+            if stop_ids and review_id in stop_ids:
+                print("Son çalıştırmada görülen yoruma ulaşıldı, çıkarım durduruldu")
+                if stats is not None:
+                    stats['reached_known'] = True
+                break
+            if counter >= max_reviews:
+                break
+            if skip_ids and review_id in skip_ids:
+                continue
             
-        # Adresi al
-        try:
-            address_found = False
-            for selector in [
-                'button[data-item-id="address"]',
-                'button[aria-label*="adres"]',
-                'button[data-tooltip="Adresi kopyala"]',
-                'button:has-text("Adres")',
-                'div:has-text("Adres") ~ div',
-                'button[jsaction*="si_address"]',
-                'div[jsaction*="si_address"]'
-            ]:
+            # Önce yorum metnini bul
+            review_text = ""
+            for text_selector in REVIEW_TEXT_SELECTORS:
                 try:
-                    elements = page.locator(selector).all()
-                    for element in elements:
-                        text = element.text_content().strip()
-                        if text and len(text) > 10:
-                            general_info['Adres'] = [text]
-                            print(f"Adres: {text}")
-                            address_found = True
+                    elements = await review.locator(text_selector).all()
+                    for el in elements:
+                        text = (await el.text_content()).strip()
+                        if len(text.split()) > 10:  # 10 kelimeden uzun
+                            review_text = text
                             break
-                    if address_found:
+                    if review_text:
                         break
                 except:
                     continue
+            
+            # Kısaltılmış yorumlar çıkarımdan önce expand_reviews ile toplu olarak açılır
+            if not review_text or len(review_text.split()) <= 10:
+                continue
+            
+            # Kullanıcı adını çek; kullanıcı bloğunun ilk satırı isimdir
+            user_name = "Bilinmeyen Kullanıcı"
+            
+            # ÖNEMLİ: Kullanıcı bloğunu doğru bul
+            user_block = None
+            try:
+                # Kullanıcı bloğu genellikle yorum içindeki ilk link veya belirli sınıfları içeren bir div
+                for selector in REVIEW_USER_SELECTORS:
+                    elements = await review.locator(selector).all()
+                    for elem in elements:
+                        # Bağlantı varsa ve katkıda bulunan kullanıcı linki ise
+                        href = await elem.get_attribute("href") or ""
+                        content = (await elem.text_content()).strip()
+                        
+                        if ("contrib" in href or "maps/contrib" in href) and content:
+                            user_block = elem
+                            break
+                            
+                        # Link olmayan bir kullanıcı bloğu olabilir
+                        if content and len(content) > 2 and len(content) < 50 and "+" not in content:
+                            if not LINK_TEXT_PATTERN.search(content.lower()):
+                                user_block = elem
+                                break
                     
-            # Alternatif: Adres bilgisinin görüntülendiği butonu tıkla
-            if not address_found:
-                address_buttons = page.locator('button:has-text("Adres"), button[jsaction*="address"]').all()
-                for button in address_buttons:
+                    if user_block:
+                        break
+                
+                # Bulunan bloğun ilk satırını isim olarak al (sonraki satırlar yerel rehber/inceleme sayısı bilgisidir)
+                if user_block:
+                    user_name = (await user_block.text_content()).strip().split('\n')[0].strip()
+            except Exception as e:
+                print(f"Kullanıcı bilgileri alınırken hata: {e}")
+            
+            # Kullanıcı ismi boşsa veya çok uzunsa, alternatif yöntemleri dene
+            if not user_name or len(user_name) > 50 or user_name == "Bilinmeyen Kullanıcı":
+                for name_selector in REVIEW_NAME_SELECTORS:
                     try:
-                        button.click(timeout=2000)
-                        time.sleep(1)
-                        # Tıklamadan sonra popup içinde adresi ara
-                        address_texts = page.locator('div[role="dialog"] div').all()
-                        for elem in address_texts:
-                            text = elem.text_content().strip()
-                            if text and len(text) > 15 and ("cadde" in text.lower() or "sokak" in text.lower() or "mah" in text.lower()):
-                                general_info['Adres'] = [text]
-                                print(f"Adres (alternatif): {text}")
-                                # Popupı kapat
-                                page.keyboard.press("Escape")
-                                address_found = True
+                        elements = await review.locator(name_selector).all()
+                        for el in elements:
+                            text = (await el.text_content()).strip()
+                            if text and len(text) > 2 and len(text) < 50 and "+" not in text and "yorum" not in text.lower() and "yıldız" not in text.lower():
+                                user_name = text
                                 break
-                        if address_found:
+                        if user_name != "Bilinmeyen Kullanıcı":
                             break
                     except:
                         continue
-        except Exception as e:
-            print(f"Adres alınamadı: {e}")
             
-        # Telefon numarası al
-        try:
-            for selector in [
-                'button[data-tooltip="Telefon numarasını kopyala"]', 
-                'button[aria-label*="telefon"]',
-                'div:has-text("Telefon") ~ div',
-                'button:has-text("Telefon")',
-                'span:has-text("Telefon") + span',
-                'button[jsaction*="phone"]',
-                'div[jsaction*="phone"]'
-            ]:
+            # Yorum tarihini bul
+            review_date = "Belirtilmemiş"
+            for date_selector in REVIEW_DATE_SELECTORS:
                 try:
-                    elements = page.locator(selector).all()
-                    for element in elements:
-                        text = element.text_content().strip()
-                        if text and (re.search(r'[0-9]', text) or "+" in text):
-                            # Numarayı düzgün formatla
-                            if len(text) >= 10:  # Geçerli telefon numarası en az 10 karakter olmalı
-                                general_info['Telefon'] = [text]
-                                print(f"Telefon: {text}")
-                                break
-                    if general_info['Telefon'] != [""]:
+                    elements = await review.locator(date_selector).all()
+                    for el in elements:
+                        text = (await el.text_content()).strip()
+                        if text and is_review_date(text):
+                            review_date = text
+                            break
+                    if review_date != "Belirtilmemiş":
                         break
                 except:
                     continue
-                    
-            # Alternatif: Telefon bilgisinin görüntülendiği butonu tıkla
-            if general_info['Telefon'] == [""]:
-                phone_buttons = page.locator('button:has-text("Telefon"), button[jsaction*="phone"]').all()
-                for button in phone_buttons:
-                    try:
-                        button.click(timeout=2000)
-                        time.sleep(1)
-                        # Tıklamadan sonra popup içinde telefonu ara
-                        phone_texts = page.locator('div[role="dialog"] div').all()
-                        for elem in phone_texts:
-                            text = elem.text_content().strip()
-                            if text and re.search(r'[0-9]', text) and len(text) >= 10:
-                                general_info['Telefon'] = [text]
-                                print(f"Telefon (alternatif): {text}")
-                                # Popup'ı kapat
-                                page.keyboard.press("Escape")
-                                break
-                        if general_info['Telefon'] != [""]:
+            
+            # Tarih belirtilmemişse ve "birkaç hafta önce" tarzında bir şey olabilir
+            if review_date == "Belirtilmemiş":
+                try:
+                    # Genel zamana ilişkin metinleri kontrol et
+                    time_texts = await review.locator('span').all()
+                    for el in time_texts:
+                        text = (await el.text_content()).strip().lower()
+                        if is_relative_date(text):
+                            review_date = text
                             break
-                    except:
-                        continue
-        except Exception as e:
-            print(f"Telefon alınamadı: {e}")
-        
-        # Fiyat seviyesini kişi başı fiyat üzerinden al
-        try:
-            price_found = False
-            # Öncelik: kişi başı fiyatı arayalım
-            per_person_keywords = [
-                "kişi başı", "kişi başı fiyat", "kişi başı ücret", "kişi başı maliyet", "kişi başı ortalama",
-                "per person", "per-person", "per head", "per capita", "per guest"
-            ]
-            for keyword in per_person_keywords:
+                except:
+                    pass
+            
+            # Eğer hala bulunamadıysa ve içerik kısa bir süre önce gönderildiyse, varsayılan bir değer atayabiliriz
+            if review_date == "Belirtilmemiş":
+                review_date = "Yeni yorum"
+            
+            # Puanı bul
+            rating = "Belirtilmemiş"
+            for rating_selector in REVIEW_RATING_SELECTORS:
                 try:
-                    elements = page.locator(f'span:has-text("{keyword}"), div:has-text("{keyword}"), *:has-text("{keyword}")').all()
-                    for element in elements:
-                        text = element.text_content().strip()
-                        if keyword in text.lower() and len(text) < 50:
-                            general_info['Fiyat_Seviyesi'] = [text]
-                            print(f"Kişi başı fiyat bulundu: {text}")
-                            price_found = True
+                    elements = await review.locator(rating_selector).all()
+                    for el in elements:
+                        try:
+                            # Önce aria-label'dan bak
+                            aria_label = await el.get_attribute('aria-label')
+                            if aria_label and ("yıldız" in aria_label.lower() or "star" in aria_label.lower()):
+                                rating = aria_label
                             break
-                    if price_found:
+                        except:
+                            pass
+                    if rating != "Belirtilmemiş":
                         break
                 except:
                     continue
             
-            # Eğer kişi başı fiyat bulunamazsa, eski yöntemlerle devam et
-            if not price_found:
-                # Metot 1: Doğrudan fiyat seviyesi içeren elementleri bul
-                for selector in [
-                    'span:has-text("₺")',
-                    'span.mgr77e',
-                    'span:has-text("Fiyat") + span',
-                    'span[aria-label*="fiyat"]',
-                    'div[jsaction*="price"]',
-                    'span[aria-label*="price"]',
-                    'span[class*="price"]'
-                ]:
-                    try:
-                        elements = page.locator(selector).all()
-                        for element in elements:
-                            text = element.text_content().strip()
-                            if "₺" in text and len(text) <= 5:
-                                general_info['Fiyat_Seviyesi'] = [text]
-                                print(f"Fiyat seviyesi: {text}")
-                                price_found = True
-                                break
-                        if price_found:
-                            break
-                    except Exception as e:
-                        print(f"Fiyat elementi aranırken hata: {e}")
-                        continue
-                
-                # Metot 2: Fiyat kategorisi içeren elementleri bul
-                if not price_found:
-                    price_indicators = [
-                        "ucuz", "cheap", "inexpensive", 
-                        "ekonomik", "orta", "moderate", 
-                        "pahalı", "lüks", "expensive", "luxury"
-                    ]
-                    
-                    for indicator in price_indicators:
-                        try:
-                            elements = page.locator(f'span:has-text("{indicator}"), div:has-text("{indicator}")').all()
-                            for element in elements:
-                                text = element.text_content().strip()
-                                if len(text) < 30:  # Kısa metinler, muhtemelen fiyat bilgisi
-                                    general_info['Fiyat_Seviyesi'] = [text]
-                                    print(f"Fiyat seviyesi (açıklama): {text}")
-                                    price_found = True
-                                    break
-                        except:
-                            continue
-                        
-                        if price_found:
-                            break
-                            
-                # Metot 3: Fiyat aralığı içeren elementleri bul
-                if not price_found:
-                    price_range_patterns = [
-                        r'([₺$€£]{1,4})\s*[-–]\s*([₺$€£]{1,4})',  # ₺₺ - ₺₺₺ format
-                        r'([₺$€£]{1,4})[-–]([₺$€£]{1,4})'          # ₺₺-₺₺₺ format
-                    ]
-                    
-                    try:
-                        page_text = page.content()
-                        for pattern in price_range_patterns:
-                            match = re.search(pattern, page_text)
-                            if match:
-                                price_text = match.group(0)
-                                general_info['Fiyat_Seviyesi'] = [price_text]
-                                print(f"Fiyat aralığı: {price_text}")
-                                price_found = True
-                                break
-                    except Exception as e:
-                        print(f"Fiyat aralığı araması sırasında hata: {e}")
-                            
-            # Eğer hala bulunamadıysa, bara bir şey yaz
-            if not price_found or general_info['Fiyat_Seviyesi'] == [""]:
-                general_info['Fiyat_Seviyesi'] = ["Belirtilmemiş"]
+            # Temizlik işlemi: Kullanıcı adını sadeleştir
+            if len(user_name) > 50:
+                user_name = user_name[:47] + "..."
+            # Veri eklerken filtreleme yapıyoruz - müşteri isteğine göre
+            if not writer.write({
+                'Kullanici': user_name,
+                'Tarih': review_date,
+                'Puan': rating,
+                'Yorum': review_text,
+                'Yorum_ID': review_id
+            }):
+                continue
+            counter += 1
         except Exception as e:
-            print(f"Fiyat seviyesi alınamadı: {e}")
-            general_info['Fiyat_Seviyesi'] = ["Belirtilmemiş"]
+            print(f"Yorum işlenirken hata: {e}")
+            continue
+    
+    return counter
+
+
+# yorumlar.csv sütunları
+REVIEW_FIELDS = ['Kullanici', 'Tarih', 'Puan', 'Yorum', 'Yorum_ID']
+# Mekan başına kontrol noktası dosyalarının tutulduğu klasör
+CHECKPOINT_DIR = os.path.expanduser("~/Downloads/.google_maps_checkpoints")
+
+def review_key(review):
+    """Yorumun tekilleştirme anahtarı: data-review-id, yoksa içerik özeti"""
+    if review.get('Yorum_ID'):
+        return review['Yorum_ID']
+    # Göreli tarih ("2 hafta önce") zamanla değiştiği için özete dahil edilmez
+    content = "|".join([review.get('Kullanici', ''), review.get('Puan', ''), review.get('Yorum', '')])
+    return "h:" + hashlib.sha1(content.encode('utf-8')).hexdigest()[:20]
+
+# "Son çalıştırmadan beri" modunun mekan başına işaretlerini tutan durum dosyası
+WATERMARK_PATH = os.path.expanduser("~/Downloads/.google_maps_watermarks.json")
+# İşaret olarak saklanan en yeni yorum sayısı (en yenisi silinse bile diğerleri durdurur)
+WATERMARK_SIZE = 5
+
+class WatermarkStore:
+    """Mekan başına son çalıştırmada görülen en yeni yorum kimliklerini tutan küçük JSON durum deposu
+    
+    Aynı anda çekilen mekanlar ve süreçler aynı dosyaya yazdığı için her yazımda dosya yeniden okunup birleştirilir.
+    """
+    
+    def __init__(self, path=WATERMARK_PATH):
+        self.path = path
+        self.state = self._load()
+    
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"İşaret dosyası okunamadı: {e}")
+            return {}
+    
+    def get(self, place_key):
+        """Mekanın işaret kimliklerini döndür (yoksa boş küme)"""
+        return set(self.state.get(place_key, {}).get('review_ids', []))
+    
+    def update(self, place_key, review_ids):
+        """Mekanın işaretini en yeni yorum kimlikleriyle güncelle ve kaydet"""
+        if not review_ids:
+            return
+        self.state = self._load()
+        self.state[place_key] = {
+            'review_ids': review_ids[:WATERMARK_SIZE],
+            'updated_at': datetime.now().isoformat(timespec='seconds')
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+def watermark_complete(watermark_ids, written, max_reviews, reached=False):
+    """Bu çalıştırmanın yorumları eski işarete kadar kesintisiz çekildiyse True döndür
+
+    İşaret yoksa, eski işarete ulaşıldıysa veya akış max_reviews dolmadan bittiyse aradaki bütün yeni
+    yorumlar yazılmıştır. max_reviews sınırı araya girdiyse işaret ilerletilmez; yoksa sonraki çalıştırma
+    yeni işarette durur ve yazılmayan yorumlar bir daha çekilmez.
+    """
+    return not watermark_ids or reached or written < max_reviews
+
+# Mekan kimliğine göre önbelleğe alınan genel bilgilerin tutulduğu durum dosyası
+PLACE_CACHE_PATH = os.path.expanduser("~/Downloads/.google_maps_place_cache.json")
+
+class PlaceInfoCache:
+    """Genel bilgileri kanonik mekan kimliğine (bkz. canonical_place_id) göre ttl_hours saat saklayan JSON önbellek
+
+    Taze kaydı olan mekanlarda genel bilgi aşaması tamamen atlanır, yalnızca yorumlar yenilenir. Aynı dosyaya
+    birden çok süreç yazabildiği için her yazımda dosya yeniden okunup birleştirilir.
+    """
+
+    def __init__(self, ttl_hours, path=PLACE_CACHE_PATH):
+        self.path = path
+        self.ttl = timedelta(hours=ttl_hours)
+        self.state = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Mekan önbelleği okunamadı: {e}")
+            return {}
+
+    def get(self, place_id):
+        """Mekanın taze kaydını ({'place_name', 'general_info', 'cached_at'}) döndür; yoksa veya süresi dolduysa None"""
+        entry = self.state.get(place_id)
+        if not entry:
+            return None
+        try:
+            cached_at = datetime.fromisoformat(entry['cached_at'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if datetime.now() - cached_at > self.ttl:
+            return None
+        return entry
+
+    def put(self, place_id, place_name, general_info):
+        """Mekanın adını ve genel bilgilerini önbelleğe yaz ve kaydet"""
+        self.state = self._load()
+        self.state[place_id] = {
+            'place_name': place_name,
+            'general_info': general_info,
+            'cached_at': datetime.now().isoformat(timespec='seconds')
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+class Checkpoint:
+    """Mekan başına çıktı klasörünü ve kaydedilmiş yorum anahtarlarını tutan kontrol noktası"""
+    
+    def __init__(self, place_key):
+        self.path = os.path.join(CHECKPOINT_DIR, f"{place_key}.json")
+        self.folder_path = None
+        self.review_ids = set()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    data = json.load(f)
+                self.folder_path = data.get('folder_path')
+                self.review_ids = set(data.get('review_ids', []))
+            except (OSError, ValueError) as e:
+                print(f"Kontrol noktası okunamadı, sıfırdan başlanacak: {e}")
+    
+    def reset(self, folder_path):
+        self.folder_path = folder_path
+        self.review_ids = set()
+    
+    def add(self, key):
+        self.review_ids.add(key)
+    
+    def save(self):
+        """Kontrol noktasını geçici dosya üzerinden atomik olarak yaz"""
+        os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'folder_path': self.folder_path,
+                'review_ids': sorted(self.review_ids),
+                'updated_at': datetime.now().isoformat(timespec='seconds')
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+class ReviewWriter:
+    """Yorumları ayrıştırıldıkları anda yorumlar.csv'ye (isteğe bağlı yorumlar.jsonl'e) ekleyen akış yazıcısı
+    
+    Her flush_every yorumda bir dosyalar flush edilir ve fsync ile diske indirilir; yarıda kalan
+    bir çalıştırmada o ana kadar yazılan yorumlar kaybolmaz. Daha önce yazılmış yorumlar (aynı
+    review_key) atlanır; checkpoint verilirse her flush'tan sonra güncellenir. sinks içindeki ek
+    çıktılara (append/close metotlu, ör. ParquetReviewWriter) yalnızca yeni yorumlar aktarılır.
+    """
+    
+    def __init__(self, folder_path, jsonl=False, flush_every=25, fsync=True, checkpoint=None, sinks=()):
+        csv_path = os.path.join(folder_path, 'yorumlar.csv')
+        write_header = not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0
+        self.csv_file = open(csv_path, 'a', newline='', encoding='utf-8')
+        self.csv_writer = csv.DictWriter(self.csv_file, fieldnames=REVIEW_FIELDS, extrasaction='ignore')
+        if write_header:
+            self.csv_writer.writeheader()
+        self.jsonl_file = open(os.path.join(folder_path, 'yorumlar.jsonl'), 'a', encoding='utf-8') if jsonl else None
+        self.flush_every = flush_every
+        self.fsync = fsync
+        self.checkpoint = checkpoint
+        self.sinks = list(sinks)
+        self.seen = set(checkpoint.review_ids) if checkpoint else set()
+        self.count = 0
+        self.skipped = 0
+        self.unflushed = 0
+    
+    def write(self, review, placeholder=False):
+        """Yorumu ekle; daha önce yazılmışsa atla ve False döndür"""
+        if not placeholder:
+            key = review_key(review)
+            if key in self.seen:
+                self.skipped += 1
+                return False
+            self.seen.add(key)
+            if self.checkpoint:
+                self.checkpoint.add(key)
         
-        # Çalışma saatlerini al - geliştirilmiş metot
+        self.csv_writer.writerow(review)
+        if self.jsonl_file:
+            self.jsonl_file.write(json.dumps(review, ensure_ascii=False) + "\n")
+        if not placeholder:
+            for sink in self.sinks:
+                sink.append(review)
+        self.unflushed += 1
+        # Yer tutucu satırlar (hata / yorum yok) yorum olarak sayılmaz
+        if not placeholder:
+            self.count += 1
+        if self.unflushed >= self.flush_every:
+            self.flush()
+        return True
+    
+    def flush(self):
+        for f in (self.csv_file, self.jsonl_file):
+            if f:
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+        self.unflushed = 0
+        # Kontrol noktası yalnızca diske inmiş yorumları içerir
+        if self.checkpoint:
+            self.checkpoint.save()
+    
+    def close(self):
+        if self.csv_file.closed:
+            return
+        self.flush()
+        self.csv_file.close()
+        if self.jsonl_file:
+            self.jsonl_file.close()
+        for sink in self.sinks:
+            sink.close()
+
+def write_general_info(folder_path, general_info):
+    """Genel bilgileri tek satırlık genel_bilgiler.csv olarak kaydet"""
+    with open(os.path.join(folder_path, 'genel_bilgiler.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(general_info.keys())
+        writer.writerow(values[0] for values in general_info.values())
+
+# ===== Parquet veri kümesi çıktısı =====
+# Mekanlar ve yorumlar, mekana ve çekim tarihine göre Hive bölümlemeli iki tabloya eklenir:
+#   <kök>/reviews/place=<slug>/date=<YYYY-MM-DD>/<oturum>.parquet
+#   <kök>/places/place=<slug>/date=<YYYY-MM-DD>/<oturum>.parquet
+# Her çalıştırma kendi dosyasını yazar, böylece eşzamanlı süreçler birbirini ezmez. pyarrow yalnızca bu
+# çıktı kullanılırken gereklidir.
+
+# Ondalık ayırıcısı virgül veya nokta olabilen puan değeri ("4,0 yıldız", "Rated 4.5 out of 5")
+RATING_VALUE_PATTERN = re.compile(r'\d+(?:[.,]\d+)?')
+
+def parse_rating(text):
+    """Puan metnini 0-5 arası sayıya çevir; bulunamazsa None"""
+    match = RATING_VALUE_PATTERN.search(text or "")
+    if not match:
+        return None
+    value = float(match.group(0).replace(',', '.'))
+    return value if 0 <= value <= 5 else None
+
+def parse_count(text):
+    """'1.234 yorum' -> 1234; sayı yoksa None"""
+    digits = ''.join(NUMBER_PATTERN.findall(text or ""))
+    return int(digits) if digits else None
+
+def _dataset_schemas():
+    return {
+        'reviews': pa.schema([
+            ('review_id', pa.string()),
+            ('user', pa.string()),
+            ('rating', pa.float64()),
+            ('date_text', pa.string()),
+            ('text', pa.string()),
+            ('url', pa.string()),
+            ('session_id', pa.string()),
+            ('scraped_at', pa.timestamp('s'))
+        ]),
+        'places': pa.schema([
+            ('name', pa.string()),
+            ('rating', pa.float64()),
+            ('review_count', pa.int64()),
+            ('address', pa.string()),
+            ('phone', pa.string()),
+            ('website', pa.string()),
+            ('category', pa.string()),
+            ('price_level', pa.string()),
+            ('opening_hours', pa.string()),
+            ('url', pa.string()),
+            ('session_id', pa.string()),
+            ('scraped_at', pa.timestamp('s'))
+        ])
+    }
+
+def _known(value):
+    """'Belirtilmemiş' gibi yer tutucular veri kümesine boş değer olarak yazılır"""
+    return None if not value or value == "Belirtilmemiş" else value
+
+class ParquetReviewWriter:
+    """Yorumları bellekte biriktirip row_group_size'da bir Parquet satır grubu olarak yazan akış yazıcısı
+    
+    Dosya kapanana kadar noktayla başlayan geçici adla yazılır (okuyucular bu dosyaları atlar), kapanınca
+    asıl adına taşınır.
+    """
+    
+    def __init__(self, path, schema, url, session_id, scraped_at, row_group_size=5000):
+        self.path = path
+        self.tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+        self.schema = schema
+        self.url = url
+        self.session_id = session_id
+        self.scraped_at = scraped_at
+        self.row_group_size = row_group_size
+        self.rows = []
+        self.writer = None
+        self.count = 0
+    
+    def append(self, review):
+        self.rows.append({
+            'review_id': review.get('Yorum_ID') or review_key(review),
+            'user': review.get('Kullanici'),
+            'rating': parse_rating(review.get('Puan')),
+            'date_text': review.get('Tarih'),
+            'text': review.get('Yorum'),
+            'url': self.url,
+            'session_id': self.session_id,
+            'scraped_at': self.scraped_at
+        })
+        if len(self.rows) >= self.row_group_size:
+            self.flush()
+    
+    def flush(self):
+        if not self.rows:
+            return
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.tmp_path, self.schema, compression="zstd")
+        self.writer.write_table(pa.Table.from_pylist(self.rows, schema=self.schema))
+        self.count += len(self.rows)
+        self.rows = []
+    
+    def close(self):
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            os.replace(self.tmp_path, self.path)
+
+class ParquetDataset:
+    """Mekan bilgilerini ve yorumları mekan/tarih bölümlü Parquet veri kümesine ekleyen çıktı"""
+    
+    def __init__(self, root, row_group_size=5000):
+        if pa is None:
+            raise RuntimeError("Parquet çıktısı için pyarrow gerekli: pip install pyarrow")
+        self.root = os.path.expanduser(root)
+        self.row_group_size = row_group_size
+    
+    def _path(self, table, place_key, session_id, scraped_at):
+        folder = os.path.join(self.root, table, f"place={place_key}", f"date={scraped_at:%Y-%m-%d}")
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, f"{session_id}.parquet")
+    
+    def write_place(self, place_key, session_id, url, general_info, scraped_at):
+        """Genel bilgileri places tablosuna tek satır olarak yaz"""
+        info = {field: values[0] for field, values in general_info.items()}
+        row = {
+            'name': info.get('Mekan_Adi'),
+            'rating': parse_rating(info.get('Puan')),
+            'review_count': parse_count(info.get('Yorum_Sayisi')),
+            'address': _known(info.get('Adres')),
+            'phone': _known(info.get('Telefon')),
+            'website': _known(info.get('Web_Sitesi')),
+            'category': _known(info.get('Kategori')),
+            'price_level': _known(info.get('Fiyat_Seviyesi')),
+            'opening_hours': _known(info.get('Calisma_Saatleri')),
+            'url': url,
+            'session_id': session_id,
+            'scraped_at': scraped_at
+        }
+        schema = _dataset_schemas()['places']
+        path = self._path('places', place_key, session_id, scraped_at)
+        tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+        pq.write_table(pa.Table.from_pylist([row], schema=schema), tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+    
+    def review_writer(self, place_key, session_id, url, scraped_at):
+        """Bu çalıştırmanın yorumları için reviews tablosuna yazan akış yazıcısı"""
+        return ParquetReviewWriter(self._path('reviews', place_key, session_id, scraped_at), _dataset_schemas()['reviews'],
+                                   url, session_id, scraped_at, self.row_group_size)
+
+def read_dataset(root, table="reviews", since=None, until=None, places=None):
+    """Veri kümesindeki bir tabloyu pyarrow Table olarak oku
+    
+    since/until ('YYYY-MM-DD', dahil) ve places (slug listesi) bölüm filtresi olarak uygulanır; yalnızca
+    eşleşen klasörlerdeki dosyalar açılır.
+    """
+    if pa is None:
+        raise RuntimeError("Parquet veri kümesini okumak için pyarrow gerekli: pip install pyarrow")
+    partitioning = ds.partitioning(pa.schema([('place', pa.string()), ('date', pa.string())]), flavor="hive")
+    dataset = ds.dataset(os.path.join(os.path.expanduser(root), table), format="parquet", partitioning=partitioning)
+    conditions = []
+    if since:
+        conditions.append(ds.field('date') >= since)
+    if until:
+        conditions.append(ds.field('date') <= until)
+    if places:
+        conditions.append(ds.field('place').isin(list(places)))
+    condition = None
+    for part in conditions:
+        condition = part if condition is None else condition & part
+    return dataset.to_table(filter=condition)
+
+# ===== SQLite çıktısı =====
+# Tüm çalıştırmalar tek bir veritabanındaki places ve reviews tablolarına yazılır. Yorumlar yorum
+# kimliğine göre upsert edilir; veritabanı ayrıca --resume için tekilleştirme, --since-last-run için
+# işaret kaynağı olarak kullanılır.
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS places (
+    place_id TEXT PRIMARY KEY,
+    name TEXT,
+    rating REAL,
+    review_count INTEGER,
+    address TEXT,
+    phone TEXT,
+    website TEXT,
+    category TEXT,
+    price_level TEXT,
+    opening_hours TEXT,
+    url TEXT,
+    watermark TEXT,
+    first_scraped_at TEXT,
+    last_scraped_at TEXT
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    review_id TEXT PRIMARY KEY,
+    place_id TEXT NOT NULL,
+    user TEXT,
+    rating REAL,
+    date_text TEXT,
+    review_date TEXT,
+    text TEXT,
+    session_id TEXT,
+    first_seen_at TEXT,
+    last_seen_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_date ON reviews (review_date);
+CREATE INDEX IF NOT EXISTS idx_reviews_place_date ON reviews (place_id, review_date);
+"""
+
+SQLITE_UPSERT_REVIEW = """
+INSERT INTO reviews (review_id, place_id, user, rating, date_text, review_date, text, session_id, first_seen_at, last_seen_at)
+VALUES (:review_id, :place_id, :user, :rating, :date_text, :review_date, :text, :session_id, :seen_at, :seen_at)
+ON CONFLICT (review_id) DO UPDATE SET
+    user = excluded.user,
+    rating = excluded.rating,
+    date_text = excluded.date_text,
+    review_date = COALESCE(reviews.review_date, excluded.review_date),
+    text = excluded.text,
+    session_id = excluded.session_id,
+    last_seen_at = excluded.last_seen_at
+"""
+
+SQLITE_UPSERT_PLACE = """
+INSERT INTO places (place_id, name, rating, review_count, address, phone, website, category, price_level, opening_hours, url,
+                    first_scraped_at, last_scraped_at)
+VALUES (:place_id, :name, :rating, :review_count, :address, :phone, :website, :category, :price_level, :opening_hours, :url,
+        :scraped_at, :scraped_at)
+ON CONFLICT (place_id) DO UPDATE SET
+    name = COALESCE(excluded.name, places.name),
+    rating = COALESCE(excluded.rating, places.rating),
+    review_count = COALESCE(excluded.review_count, places.review_count),
+    address = COALESCE(excluded.address, places.address),
+    phone = COALESCE(excluded.phone, places.phone),
+    website = COALESCE(excluded.website, places.website),
+    category = COALESCE(excluded.category, places.category),
+    price_level = COALESCE(excluded.price_level, places.price_level),
+    opening_hours = COALESCE(excluded.opening_hours, places.opening_hours),
+    url = excluded.url,
+    last_scraped_at = excluded.last_scraped_at
+"""
+
+# "3 gün önce", "bir hafta önce", "2 months ago" gibi göreli tarihler ve birimlerinin yaklaşık gün karşılığı
+RELATIVE_DATE_PATTERN = re.compile(r'(\d+|bir|an?|one)\s+(dakika|saat|gün|hafta|ay|yıl|minute|hour|day|week|month|year)s?\s+(?:önce|ago)')
+RELATIVE_DATE_DAYS = {
+    'dakika': 0, 'saat': 0, 'gün': 1, 'hafta': 7, 'ay': 30, 'yıl': 365,
+    'minute': 0, 'hour': 0, 'day': 1, 'week': 7, 'month': 30, 'year': 365
+}
+
+def estimate_review_date(text, now):
+    """Göreli yorum tarihini çekim anına göre yaklaşık 'YYYY-MM-DD' tarihine çevir; çevrilemezse None"""
+    text = (text or "").lower()
+    if text.startswith("yeni"):
+        return now.strftime("%Y-%m-%d")
+    match = RELATIVE_DATE_PATTERN.search(text)
+    if not match:
+        return None
+    amount = int(match.group(1)) if match.group(1).isdigit() else 1
+    return (now - timedelta(days=amount * RELATIVE_DATE_DAYS[match.group(2)])).strftime("%Y-%m-%d")
+
+class SqliteStore:
+    """places ve reviews tablolarını tutan, WAL modunda çalışan SQLite deposu
+    
+    Bağlantı ilk kullanımda açılır; nesne süreç modunda işçilere aktarılabilir (her süreç kendi
+    bağlantısını açar). WatermarkStore ile aynı get/update arayüzünü sağlar.
+    """
+    
+    def __init__(self, path, batch_size=200):
+        self.path = os.path.expanduser(path)
+        self.batch_size = batch_size
+        self._conn = None
+    
+    def __getstate__(self):
+        return {'path': self.path, 'batch_size': self.batch_size, '_conn': None}
+    
+    @property
+    def conn(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SQLITE_SCHEMA)
+        return self._conn
+    
+    def write_place(self, place_id, url, general_info, scraped_at):
+        """Mekanın genel bilgilerini upsert et (bulunamayan alanlar önceki değerini korur)"""
+        info = {field: values[0] for field, values in general_info.items()}
+        with self.conn:
+            self.conn.execute(SQLITE_UPSERT_PLACE, {
+                'place_id': place_id,
+                'name': _known(info.get('Mekan_Adi')) if info.get('Mekan_Adi') != "Bilinmeyen_Mekan" else None,
+                'rating': parse_rating(info.get('Puan')),
+                'review_count': parse_count(info.get('Yorum_Sayisi')),
+                'address': _known(info.get('Adres')),
+                'phone': _known(info.get('Telefon')),
+                'website': _known(info.get('Web_Sitesi')),
+                'category': _known(info.get('Kategori')),
+                'price_level': _known(info.get('Fiyat_Seviyesi')),
+                'opening_hours': _known(info.get('Calisma_Saatleri')),
+                'url': url,
+                'scraped_at': scraped_at.isoformat(timespec='seconds')
+            })
+    
+    def write_reviews(self, rows):
+        """Yorum satırlarını tek bir işlemde upsert et"""
+        with self.conn:
+            self.conn.executemany(SQLITE_UPSERT_REVIEW, rows)
+    
+    def review_writer(self, place_id, session_id, scraped_at):
+        """Bu çalıştırmanın yorumlarını batch_size'lık işlemlerle yazan akış yazıcısı"""
+        return SqliteReviewWriter(self, place_id, session_id, scraped_at)
+    
+    def review_ids(self, place_id):
+        """Mekan için kayıtlı yorum anahtarları (tekilleştirme kaynağı)"""
+        return {row[0] for row in self.conn.execute("SELECT review_id FROM reviews WHERE place_id = ?", (place_id,))}
+    
+    def get(self, place_key):
+        """Mekanın son çalıştırma işaretini döndür (yoksa boş küme)"""
+        row = self.conn.execute("SELECT watermark FROM places WHERE place_id = ?", (place_key,)).fetchone()
+        return set(json.loads(row[0])) if row and row[0] else set()
+    
+    def update(self, place_key, review_ids):
+        """Mekanın işaretini en yeni yorum kimlikleriyle güncelle"""
+        if not review_ids:
+            return
+        with self.conn:
+            self.conn.execute("UPDATE places SET watermark = ? WHERE place_id = ?", (json.dumps(review_ids[:WATERMARK_SIZE]), place_key))
+    
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+class SqliteReviewWriter:
+    """ReviewWriter'a bağlanan ve yorumları toplu işlemlerle SqliteStore'a aktaran çıktı"""
+    
+    def __init__(self, store, place_id, session_id, scraped_at):
+        self.store = store
+        self.place_id = place_id
+        self.session_id = session_id
+        self.scraped_at = scraped_at
+        self.seen_at = scraped_at.isoformat(timespec='seconds')
+        self.rows = []
+    
+    def append(self, review):
+        self.rows.append({
+            'review_id': review_key(review),
+            'place_id': self.place_id,
+            'user': review.get('Kullanici'),
+            'rating': parse_rating(review.get('Puan')),
+            'date_text': review.get('Tarih'),
+            'review_date': estimate_review_date(review.get('Tarih'), self.scraped_at),
+            'text': review.get('Yorum'),
+            'session_id': self.session_id,
+            'seen_at': self.seen_at
+        })
+        if len(self.rows) >= self.store.batch_size:
+            self.flush()
+    
+    def flush(self):
+        if self.rows:
+            self.store.write_reviews(self.rows)
+            self.rows = []
+    
+    def close(self):
+        self.flush()
+
+# Hata ayıklama çıktıları (ekran görüntüsü, sayfa kaynağı) için politikalar
+DEBUG_ARTIFACT_POLICIES = ("off", "on_error", "sampled", "always")
+
+class DebugArtifacts:
+    """Ekran görüntülerini ve sayfa kaynağını politikaya göre alan; sıkıştırma ve diske yazma ana iş
+    parçacığı dışında yapılır
+    
+    off: hiç kayıt alınmaz. on_error: yalnızca yorumlar çekilemediğinde alınır. sampled: mekanların
+    sample_rate kadarında always, kalanında on_error gibi davranır. always: her adımda tam sayfa alınır
+    (eski davranış). compress True ise ekran görüntüleri JPEG, sayfa kaynağı gzip olarak yazılır.
+    """
+    
+    def __init__(self, folder_path, policy="on_error", sample_rate=0.1, compress=False):
+        if policy not in DEBUG_ARTIFACT_POLICIES:
+            raise ValueError(f"Bilinmeyen hata ayıklama politikası: {policy}")
+        if policy == "sampled":
+            policy = "always" if random.random() < sample_rate else "on_error"
+        self.folder_path = folder_path
+        self.policy = policy
+        self.compress = compress
+        self.pending = []
+    
+    def _wanted(self, error):
+        return self.policy == "always" or (error and self.policy != "off")
+    
+    async def screenshot(self, page, name, error=False):
+        """Ekran görüntüsü al (always'de tam sayfa, hata kaydında yalnızca görünen alan)"""
+        if not self._wanted(error):
+            return
+        try:
+            if self.compress:
+                data = await page.screenshot(type="jpeg", quality=60, full_page=self.policy == "always")
+                name += ".jpg"
+            else:
+                data = await page.screenshot(full_page=self.policy == "always")
+                name += ".png"
+        except Exception as e:
+            print(f"Ekran görüntüsü alınamadı ({name}): {e}")
+            return
+        self._write(name, data)
+    
+    async def page_source(self, page, name="page_source", error=False):
+        """Sayfanın HTML kaynağını kaydet"""
+        if not self._wanted(error):
+            return
+        try:
+            data = (await page.content()).encode("utf-8")
+        except Exception as e:
+            print(f"Sayfa kaynağı kaydedilemedi: {e}")
+            return
+        self._write(name + (".html.gz" if self.compress else ".html"), data, gzip_data=self.compress)
+    
+    async def capture_error(self, page):
+        """Yorumlar çekilemediğinde sayfanın o anki hâlini kaydet"""
+        await self.screenshot(page, "hata_ekran_goruntusu", error=True)
+        await self.page_source(page, "hata_sayfa_kaynagi", error=True)
+    
+    def _write(self, name, data, gzip_data=False):
+        path = os.path.join(self.folder_path, name)
+        self.pending.append(asyncio.ensure_future(asyncio.to_thread(self._write_file, path, data, gzip_data)))
+    
+    @staticmethod
+    def _write_file(path, data, gzip_data):
+        if gzip_data:
+            data = gzip.compress(data, compresslevel=5)
+        with open(path, "wb") as f:
+            f.write(data)
+    
+    async def wait(self):
+        """Arka planda yazılan dosyaların bitmesini bekle; yazılan dosya sayısını döndür"""
+        results = await asyncio.gather(*self.pending, return_exceptions=True)
+        self.pending = []
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Hata ayıklama dosyası yazılamadı: {result}")
+        return sum(1 for result in results if not isinstance(result, Exception))
+
+# ===== Çalıştırma ölçümleri =====
+# Her mekan için aşama süreleri ve aşama başına Playwright çağrı sayıları tutulur; sonuç yorumlar.csv'nin
+# yanına run_metrics.json olarak yazılır, istenirse Prometheus metin biçiminde de dışa aktarılır.
+
+RUN_METRICS_FILE = "run_metrics.json"
+
+class RunMetrics:
+    """Aşama süreleri (iç içe aşamalarda en içtekine yazılır) ve aşama başına çağrı sayıları"""
+    
+    def __init__(self):
+        self.phases = {}
+        self.stack = ['setup']
+        self.started = self.mark = time.perf_counter()
+        self.extra = {}
+    
+    def _entry(self, name):
+        return self.phases.setdefault(name, {'seconds': 0.0, 'calls': {}})
+    
+    def _accrue(self):
+        now = time.perf_counter()
+        self._entry(self.stack[-1])['seconds'] += now - self.mark
+        self.mark = now
+    
+    def begin(self, name):
+        """Sıradaki üst düzey aşamaya geç"""
+        self._accrue()
+        self.stack[0] = name
+    
+    @contextlib.contextmanager
+    def phase(self, name):
+        """İç içe bir aşamayı ölç (ör. tek bir genel bilgi alanı)"""
+        self._accrue()
+        self.stack.append(name)
         try:
-            hours_text = ""
-            days_info = {}
+            yield
+        finally:
+            self._accrue()
+            self.stack.pop()
+    
+    def count(self, method):
+        calls = self._entry(self.stack[-1])['calls']
+        calls[method] = calls.get(method, 0) + 1
+    
+    def to_dict(self):
+        self._accrue()
+        totals = {}
+        for entry in self.phases.values():
+            for method, count in entry['calls'].items():
+                totals[method] = totals.get(method, 0) + count
+        return {
+            'total_seconds': round(self.mark - self.started, 3),
+            'phases': {name: {'seconds': round(entry['seconds'], 3), 'calls': entry['calls']} for name, entry in self.phases.items()},
+            'calls_total': totals,
+            **self.extra
+        }
+    
+    def save(self, folder_path):
+        data = self.to_dict()
+        with open(os.path.join(folder_path, RUN_METRICS_FILE), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return data
+
+class MeteredObject:
+    """Page/Locator/Mouse/Keyboard nesnelerini saran ve her metot çağrısını o anki aşamaya sayan vekil"""
+    
+    def __init__(self, target, metrics):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_metrics', metrics)
+    
+    def _wrap(self, value):
+        if isinstance(value, (Page, Locator, Mouse, Keyboard, ElementHandle)):
+            return MeteredObject(value, self._metrics)
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        return value
+    
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if not callable(value):
+            return self._wrap(value)
+        method = f"{type(self._target).__name__}.{name}"
+        if inspect.iscoroutinefunction(value):
+            async def metered(*args, **kwargs):
+                self._metrics.count(method)
+                return self._wrap(await value(*args, **kwargs))
+        else:
+            def metered(*args, **kwargs):
+                self._metrics.count(method)
+                return self._wrap(value(*args, **kwargs))
+        return metered
+
+def _prometheus_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+class PrometheusExport:
+    """Bu süreçte çekilen mekanların ölçümlerini Prometheus metin biçiminde (textfile collector) yaz"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.runs = {}
+    
+    def add(self, place, metrics, review_count):
+        self.runs[place] = (metrics, review_count)
+        self.write()
+    
+    def write(self):
+        lines = [
+            "# HELP gmaps_scraper_run_seconds Mekan başına toplam çalışma süresi",
+            "# TYPE gmaps_scraper_run_seconds gauge"
+        ]
+        lines += [f'gmaps_scraper_run_seconds{{place="{_prometheus_label(place)}"}} {metrics["total_seconds"]}' for place, (metrics, _) in self.runs.items()]
+        lines += [
+            "# HELP gmaps_scraper_reviews_written Mekan başına yazılan yorum sayısı",
+            "# TYPE gmaps_scraper_reviews_written gauge"
+        ]
+        lines += [f'gmaps_scraper_reviews_written{{place="{_prometheus_label(place)}"}} {count}' for place, (_, count) in self.runs.items()]
+        lines += [
+            "# HELP gmaps_scraper_phase_seconds Aşama başına süre",
+            "# TYPE gmaps_scraper_phase_seconds gauge"
+        ]
+        for place, (metrics, _) in self.runs.items():
+            for phase, entry in metrics['phases'].items():
+                lines.append(f'gmaps_scraper_phase_seconds{{place="{_prometheus_label(place)}",phase="{_prometheus_label(phase)}"}} {entry["seconds"]}')
+        lines += [
+            "# HELP gmaps_scraper_playwright_calls_total Aşama ve metot başına Playwright çağrısı",
+            "# TYPE gmaps_scraper_playwright_calls_total counter"
+        ]
+        for place, (metrics, _) in self.runs.items():
+            for phase, entry in metrics['phases'].items():
+                for method, count in entry['calls'].items():
+                    lines.append(f'gmaps_scraper_playwright_calls_total{{place="{_prometheus_label(place)}",phase="{_prometheus_label(phase)}",method="{method}"}} {count}')
+        
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.path)
+
+# ===== Tek DOM görüntüsünden genel bilgi ayrıştırma =====
+# Genel bilgi sezgileri, her seçici için ayrı locator/text_content çağrısı yapmak yerine sayfanın bir kez
+# alınan HTML görüntüsü üzerinde Python tarafında çalışır. Yalnızca alan kayıtlarının kullandığı biçimler
+# desteklenir: etiket veya *, .sınıf, [öz], [öz="x"], [öz*="x"], :has-text("x"), :has(...), :not(...),
+# virgül ve " ", +, ~ birleştiricileri. Başka her sözdizimi ValueError fırlatır; kayıtlardaki seçiciler
+# içe aktarırken derlendiği için desteklenmeyen bir seçici sessizce hiçbir şey bulmamak yerine hemen fark edilir.
+
+PLACE_SNAPSHOT_JS = r"""
+() => {
+    const meta = document.querySelector('meta[property="og:title"]');
+    return {
+        html: document.body ? document.body.outerHTML : '',
+        title: document.title,
+        og_title: meta ? meta.getAttribute('content') : ''
+    };
+}
+"""
+
+# İçeriği kopyalanmayan ve kapanış etiketi olmayan elementler
+SNAPSHOT_SKIPPED_TAGS = {'script', 'style'}
+SNAPSHOT_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+class DomNode:
+    """Görüntüdeki tek bir element; Locator'ın text_content/get_attribute arayüzünü taklit eder"""
+
+    def __init__(self, tag, attrs, parent=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.classes = set(attrs.get('class', '').split())
+        self.parent = parent
+        self.children = []
+        self.content = []
+        # Kardeş birleştiricileri (+, ~) için bir önceki kardeş; kardeş listesi dilimlenmeden geri yürünür
+        self.previous = parent.children[-1] if parent and parent.children else None
+        self._text = None
+        self._normalized = None
+        # Seçici parçası başına eşleşme sonuçları; görüntü değişmediği için bir kez hesaplanır
+        self._matches = {}
+        if parent:
+            parent.children.append(self)
+            parent.content.append(self)
+
+    def text_content(self):
+        if self._text is None:
+            self._text = ''.join(part if isinstance(part, str) else part.text_content() for part in self.content)
+        return self._text
+
+    def normalized_text(self):
+        """:has-text için boşlukları sadeleştirilmiş, küçük harfli metin"""
+        if self._normalized is None:
+            self._normalized = re.sub(r'\s+', ' ', self.text_content()).strip().lower()
+        return self._normalized
+
+    def get_attribute(self, name):
+        return self.attrs.get(name)
+
+    def iter(self, skip=None):
+        """Alt elementleri belge sırasıyla dolaş; skip (derlenmiş seçici) verilirse ona uyan alt ağaçlar atlanır"""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if skip and _match_selector(node, skip):
+                continue
+            yield node
+            stack.extend(reversed(node.children))
+
+    def select(self, selector, skip=None):
+        compiled = compile_selector(selector)
+        skip = compile_selector(skip) if skip else None
+        return [node for node in self.iter(skip) if _match_selector(node, compiled)]
+
+class SnapshotParser(HTMLParser):
+    """outerHTML metnini DomNode ağacına çevir"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = DomNode('#document', {})
+        self.stack = [self.root]
+        self.skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SNAPSHOT_SKIPPED_TAGS:
+            self.skipping += 1
+            return
+        if self.skipping:
+            return
+        node = DomNode(tag, {name: value or '' for name, value in attrs}, self.stack[-1])
+        if tag not in SNAPSHOT_VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in SNAPSHOT_VOID_TAGS and tag not in SNAPSHOT_SKIPPED_TAGS and not self.skipping:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        if tag in SNAPSHOT_SKIPPED_TAGS:
+            self.skipping = max(0, self.skipping - 1)
+            return
+        if self.skipping:
+            return
+        for index in range(len(self.stack) - 1, 0, -1):
+            if self.stack[index].tag == tag:
+                del self.stack[index:]
+                break
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.stack[-1].content.append(data)
+
+COMPOUND_TOKEN = re.compile(
+    r'(?P<tag>\*|[a-zA-Z][\w-]*)'
+    r'|\.(?P<cls>[\w-]+)'
+    r'|\[(?P<attr>[\w-]+)(?:(?P<op>\*?=)(?P<quote>["\'])(?P<value>.*?)(?P=quote))?\]'
+    r'|:(?P<pseudo>has-text|has|not)\('
+)
+QUOTED_ARGUMENT = re.compile(r'^(["\'])(.*)\1$', re.S)
+
+_SELECTOR_CACHE = {}
+
+def _scan_top_level(text, start=0):
+    """Tırnak ve parantez dışındaki karakterleri (konum, karakter, derinlik) olarak dolaş"""
+    depth = 0
+    quote = None
+    for index in range(start, len(text)):
+        char = text[index]
+        if quote:
+            if char == quote:
+                quote = None
+            continue
+        if char in '"\'':
+            quote = char
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        yield index, char, depth
+    if quote or depth > 0:
+        raise ValueError(f"Kapanmamış tırnak veya parantez: {text}")
+
+def _closing_paren(text, start):
+    for index, char, depth in _scan_top_level(text, start):
+        if char == ')' and depth < 0:
+            return index
+    raise ValueError(f"Kapanmamış parantez: {text}")
+
+def _parse_compound(text):
+    if not text:
+        raise ValueError("Boş seçici parçası")
+    compound = {'tag': None, 'classes': [], 'attrs': [], 'has_text': [], 'has': [], 'not': []}
+    position = 0
+    while position < len(text):
+        match = COMPOUND_TOKEN.match(text, position)
+        if not match:
+            raise ValueError(f"Desteklenmeyen seçici: {text}")
+        if match.group('tag'):
+            if position:
+                raise ValueError(f"Etiket bileşik seçicinin başında olmalı: {text}")
+            compound['tag'] = match.group('tag').lower()
+        elif match.group('cls'):
+            compound['classes'].append(match.group('cls'))
+        elif match.group('attr'):
+            compound['attrs'].append((match.group('attr'), match.group('op'), match.group('value')))
+        else:
+            end = _closing_paren(text, match.end())
+            argument = text[match.end():end].strip()
+            if match.group('pseudo') == 'has-text':
+                quoted = QUOTED_ARGUMENT.match(argument)
+                if not quoted:
+                    raise ValueError(f":has-text argümanı tırnak içinde olmalı: {text}")
+                compound['has_text'].append(re.sub(r'\s+', ' ', quoted.group(2)).lower())
+            else:
+                compound[match.group('pseudo')].append(compile_selector(argument))
+            position = end + 1
+            continue
+        position = match.end()
+    return compound
+
+def _parse_complex(text):
+    """'a b + c' gibi bir seçiciyi [(birleştirici, bileşik)] listesine çevir"""
+    parts = []
+    combinator = None
+    start = 0
+    text = text.strip()
+    for index, char, depth in _scan_top_level(text):
+        if depth != 0:
+            continue
+        if char == '>':
+            raise ValueError(f"Desteklenmeyen birleştirici '>': {text}")
+        if char in ' +~':
+            if index > start:
+                parts.append((combinator, _parse_compound(text[start:index])))
+                combinator = ' '
+            if char != ' ':
+                if combinator != ' ':
+                    raise ValueError(f"'{char}' birleştiricisinin solunda seçici yok: {text}")
+                combinator = char
+            start = index + 1
+    parts.append((combinator, _parse_compound(text[start:])))
+    return parts
+
+def compile_selector(selector):
+    """Virgülle ayrılmış seçiciyi bir kez ayrıştırıp önbellekte tut"""
+    if selector not in _SELECTOR_CACHE:
+        alternatives = []
+        start = 0
+        for index, char, depth in _scan_top_level(selector):
+            if char == ',' and depth == 0:
+                alternatives.append(_parse_complex(selector[start:index]))
+                start = index + 1
+        alternatives.append(_parse_complex(selector[start:]))
+        _SELECTOR_CACHE[selector] = alternatives
+    return _SELECTOR_CACHE[selector]
+
+def _match_compound(node, compound):
+    if compound['tag'] and compound['tag'] != '*' and node.tag != compound['tag']:
+        return False
+    if any(cls not in node.classes for cls in compound['classes']):
+        return False
+    for name, op, value in compound['attrs']:
+        actual = node.attrs.get(name)
+        if actual is None:
+            return False
+        if (op == '=' and actual != value) or (op == '*=' and value not in actual):
+            return False
+    if any(needle not in node.normalized_text() for needle in compound['has_text']):
+        return False
+    if any(_match_selector(node, selector) for selector in compound['not']):
+        return False
+    for selector in compound['has']:
+        if not any(_match_selector(descendant, selector) for descendant in node.iter()):
+            return False
+    return True
+
+def _match_chain(node, parts, index):
+    """node parts[:index + 1] zincirinin sonuna uyuyor mu; sonuç düğüm üzerinde saklanır"""
+    key = (id(parts), index)
+    matched = node._matches.get(key)
+    if matched is None:
+        matched = node._matches[key] = _match_chain_uncached(node, parts, index)
+    return matched
+
+def _match_chain_uncached(node, parts, index):
+    combinator, compound = parts[index]
+    if not _match_compound(node, compound):
+        return False
+    if index == 0:
+        return True
+    if combinator == ' ':
+        ancestor = node.parent
+        while ancestor is not None:
+            if _match_chain(ancestor, parts, index - 1):
+                return True
+            ancestor = ancestor.parent
+        return False
+    if combinator == '+':
+        return node.previous is not None and _match_chain(node.previous, parts, index - 1)
+    return _preceded_by(node, parts, index - 1)
+
+def _preceded_by(node, parts, index):
+    """node'dan önceki kardeşlerden biri parts[:index + 1] zincirine uyuyor mu (~ birleştiricisi)
+    
+    Her kardeş için "kendisi veya öncesinden biri uyuyor" sonucu saklanır; böylece n kardeşlik bir listede
+    toplam iş O(n²) yerine O(n) olur.
+    """
+    key = ('~', id(parts), index)
+    walked = []
+    sibling = node.previous
+    matched = False
+    while sibling is not None:
+        cached = sibling._matches.get(key)
+        if cached is not None:
+            matched = cached
+            break
+        walked.append(sibling)
+        if _match_chain(sibling, parts, index):
+            matched = True
+            break
+        sibling = sibling.previous
+    for sibling in walked:
+        sibling._matches[key] = matched
+    return matched
+
+def _match_selector(node, compiled):
+    return node.tag != '#document' and any(_match_chain(node, parts, len(parts) - 1) for parts in compiled)
+
+# Genel bilgi aramasında atlanan yorum kartları ve yedek seçicilerin arandığı mekan paneli. Yüklenmiş
+# binlerce kart genel bilgi taşımaz; kardeş birleştiricili geniş yedek seçicilerin onları taraması gereksizdir.
+PLACE_INFO_SCOPE_SELECTOR = 'div[role="main"]'
+PLACE_INFO_SKIPPED_SELECTOR = 'div.jftiEf, div[data-review-id]'
+
+class PlaceSnapshot:
+    """Mekan sayfasının tek seferde alınmış HTML görüntüsü"""
+
+    def __init__(self, html, title="", og_title=""):
+        parser = SnapshotParser()
+        parser.feed(html)
+        parser.close()
+        self.root = parser.root
+        self.title = title or ""
+        self.og_title = og_title or ""
+        self._info_root = None
+
+    @property
+    def info_root(self):
+        """Mekan paneli (yoksa belgenin kendisi)"""
+        if self._info_root is None:
+            self._info_root = next(iter(self.root.select(PLACE_INFO_SCOPE_SELECTOR)), self.root)
+        return self._info_root
+
+    def select(self, selector):
+        return self.root.select(selector)
+
+    def select_info(self, selector, scoped=False):
+        """Genel bilgi araması: yorum kartlarının alt ağaçlarına girilmez; scoped ise yalnızca mekan panelinde aranır"""
+        return (self.info_root if scoped else self.root).select(selector, skip=PLACE_INFO_SKIPPED_SELECTOR)
+
+    @property
+    def text(self):
+        return self.root.text_content()
+
+async def capture_place_snapshot(page):
+    """Sayfanın gövdesini, başlığını ve og:title bilgisini tek çağrıda al"""
+    try:
+        data = await page.evaluate(PLACE_SNAPSHOT_JS)
+    except Exception as e:
+        print(f"DOM görüntüsü alınamadı: {e}")
+        data = {'html': '', 'title': '', 'og_title': ''}
+    return PlaceSnapshot(data.get('html', ''), data.get('title', ''), data.get('og_title', ''))
+
+# Mekan adı için sırayla denenen seçiciler; ilki birincil seçicidir
+PLACE_NAME_SELECTORS = [
+    'h1.DUwDvf',  # En çok kullanılan h1 sınıfı
+    'h1',  # Herhangi bir h1
+    '[role="main"] h1',
+    'header h1',
+    'div[role="main"] div[role="heading"]',
+    'div.fontHeadlineLarge',
+    'div.tAiQdd',
+    'div.kSQYJe',
+    'div[data-attrid] span'  # Bilgi panelindeki isim
+]
+# Son çare olarak denenen herhangi bir sayfa başlığı
+PLACE_HEADING_SELECTOR = 'h1, [role="heading"][aria-level="1"]'
+# Seçicileri önceden derle ki hatalı seçici içe aktarırken fark edilsin
+for _selector in PLACE_NAME_SELECTORS + [PLACE_HEADING_SELECTOR, PLACE_INFO_SCOPE_SELECTOR, PLACE_INFO_SKIPPED_SELECTOR]:
+    compile_selector(_selector)
+
+def extract_place_name(snapshot, tier="thorough", misses=None):
+    """Mekan adını görüntüden bul; bulunamazsa 'Bilinmeyen_Mekan' döndür
+    
+    Birincil seçici (h1.DUwDvf) ıskalarsa misses listesine 'Mekan_Adi' eklenir; diğer seçiciler, başlık
+    ve meta bilgisi yalnızca 'thorough' katmanında denenir.
+    """
+    place_name = ""
+    try:
+        # Birkaç farklı seçici dene
+        for index, selector in enumerate(PLACE_NAME_SELECTORS):
+            for elem in snapshot.select(selector):
+                text = elem.text_content().strip()
+                if text and len(text) >= 3 and len(text) < 100:
+                    # Tipik olarak restoran isimleri linklerde olmaz
+                    if not elem.select('a') and not re.search(r'http|www|\.(com|net|org)', text.lower()):
+                        place_name = text
+                        print(f"Mekan bulundu: {place_name}")
+                        break
+            if place_name:
+                break
+            if index == 0:
+                # Birincil seçici ıskaladı; yedekler yalnızca thorough katmanında
+                if misses is not None:
+                    misses.append('Mekan_Adi')
+                if tier != "thorough":
+                    break
+
+        # Hala bulunamadıysa, sayfa başlığından almayı dene
+        # Başlık genellikle "Restoran İsmi - Google Haritalar" formatındadır
+        if not place_name and tier == "thorough" and " - " in snapshot.title:
+            place_name = snapshot.title.split(" - ")[0].strip()
+            print(f"Mekan başlıktan bulundu: {place_name}")
+
+        # Son çare olarak meta bilgisini veya herhangi bir başlığı kullan
+        if not place_name and tier == "thorough" and snapshot.og_title:
+            place_name = re.sub(r' - Google (Haritalar|Maps)$', '', snapshot.og_title).strip()
+            print(f"Mekan meta bilgisinden bulundu: {place_name}")
+        if not place_name and tier == "thorough":
+            for h in snapshot.select(PLACE_HEADING_SELECTOR):
+                text = h.text_content().strip()
+                if text and len(text) >= 3 and len(text) < 100:
+                    place_name = text
+                    print(f"Mekan herhangi bir başlıktan bulundu: {place_name}")
+                    break
+
+        # Cümle içinde geçen "Maps" kelimesini temizle
+        if place_name and ("Maps" in place_name or "Haritalar" in place_name):
+            place_name = re.sub(r' - Google (Haritalar|Maps)$', '', place_name).strip()
+    except Exception as e:
+        print(f"Mekan adı alınamadı: {e}")
+        place_name = ""
+
+    if not place_name:
+        place_name = "Bilinmeyen_Mekan"
+        print("Mekan adı bulunamadı, varsayılan isim kullanılıyor")
+    return place_name
+
+# Haftanın günleri (Türkçe ve İngilizce) ve Türkçe karşılıkları
+WEEKDAYS = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar",
+            "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+WEEKDAY_TR = {
+    "Monday": "Pazartesi", "Tuesday": "Salı", "Wednesday": "Çarşamba",
+    "Thursday": "Perşembe", "Friday": "Cuma", "Saturday": "Cumartesi", "Sunday": "Pazar"
+}
+
+def parse_opening_hours(text):
+    """Haftalık saat tablosu metnini 'Gün: saatler' satırlarına çevir; gün bulunamazsa None döndür"""
+    days_info = {}
+    day_matches = re.findall(rf'({"|".join(WEEKDAYS)})[\s:,]*([^a-zA-Z\n;]+)', text, re.IGNORECASE)
+    for day, hours in day_matches:
+        # Gün adını Türkçe'ye standardize et
+        day = next((name for name in WEEKDAYS if name.lower() == day.lower()), day)
+        days_info[WEEKDAY_TR.get(day, day)] = re.sub(r'\s+', ' ', hours).strip(' ,')
+
+    # Tüm günleri sıralı şekilde birleştir
+    hours_parts = [f"{day}: {days_info[day]}" for day in WEEKDAYS[:7] if day in days_info]
+    return "\n".join(hours_parts) if hours_parts else None
+
+def format_opening_hours(text):
+    """Düzensiz saat metnini her gün yeni satırda olacak şekilde düzenle"""
+    text = re.sub(r'\s+', ' ', text)
+    for day in WEEKDAYS:
+        text = re.sub(rf'({day})', r'\n\1', text, flags=re.IGNORECASE)
+    return text.strip()
+
+# ===== Genel bilgi alan çıkarıcıları =====
+# Her alan, öncelik sırasıyla denenen çıkarıcılardan oluşur. Seçiciler ve kalıplar modül yüklenirken
+# bir kez derlenir; ilk sonuç veren çıkarıcı kazanır ve isabet/süre istatistiği tutulur.
+
+EXTRACTOR_STATS_PATH = os.path.expanduser("~/Downloads/.google_maps_extractor_stats.json")
+
+class FieldExtractor:
+    """Bir alan için sıralı seçiciler, derlenmiş kalıplar, doğrulayıcı ve dönüştürücü
+
+    source: 'elements' (seçicilerle bulunan elementler), 'text' (sayfa metni) veya 'title' (sayfa başlığı).
+    read elementten değeri okur (varsayılan: metin içeriği), accept değeri doğrular; patterns verilirse
+    ilk eşleşen kalıbın Match nesnesi transform'a aktarılır.
+    """
+
+    def __init__(self, field, name, selectors=(), source='elements', patterns=(), read=None, accept=None, transform=None, priority=0):
+        self.field = field
+        self.name = name
+        self.selectors = list(selectors)
+        self.source = source
+        self.patterns = [re.compile(pattern) if isinstance(pattern, str) else pattern for pattern in patterns]
+        self.read = read or (lambda node: node.text_content().strip())
+        self.accept = accept
+        self.transform = transform
+        self.priority = priority
+        # Seçicileri önceden derle ki hatalı seçici içe aktarırken fark edilsin
+        for selector in self.selectors:
+            compile_selector(selector)
+
+    @property
+    def key(self):
+        return f"{self.field}.{self.name}"
+
+    def _value(self, value):
+        """Değeri doğrula ve dönüştür; uymuyorsa None döndür"""
+        if not value or (self.accept and not self.accept(value)):
+            return None
+        if self.patterns:
+            match = next((m for m in (pattern.search(value) for pattern in self.patterns) if m), None)
+            if not match:
+                return None
+            return self.transform(match) if self.transform else match.group(0)
+        return self.transform(value) if self.transform else value
+
+    def split_primary(self):
+        """(birincil, yedek) çıkarıcı çifti: birincil yalnızca ilk seçiciyi, yedek kalan seçicileri dener
+        
+        Tek seçicili veya seçicisiz (sayfa metni, başlık) çıkarıcının tamamı birincildir; yedeği None olur.
+        """
+        if len(self.selectors) <= 1:
+            return self, None
+        args = (self.source, self.patterns, self.read, self.accept, self.transform, self.priority)
+        return (FieldExtractor(self.field, "primary", self.selectors[:1], *args),
+                FieldExtractor(self.field, self.name, self.selectors[1:], *args))
+
+    def run(self, snapshot, scoped=False):
+        """(değer, kazanan seçici) döndür; sonuç yoksa (None, None)
+        
+        Yorum kartları aranmaz; scoped ise seçiciler belgenin tamamında değil mekan panelinde aranır
+        (bkz. PlaceSnapshot.select_info).
+        """
+        if self.source == 'title':
+            return self._value(snapshot.title), 'title'
+        if self.source == 'text':
+            return self._value(snapshot.text), 'text'
+        for selector in self.selectors:
+            for node in snapshot.select_info(selector, scoped):
+                value = self._value(self.read(node))
+                if value:
+                    return value, selector
+        return None, None
+
+class FieldRegistry:
+    """Alan çıkarıcılarını öncelik sırasıyla çalıştıran ve isabet oranlarını tutan motor
+    
+    Her alanın birincil çıkarıcısı, en öncelikli çıkarıcının yalnızca ilk seçicisidir; geri kalan zincir
+    yalnızca birincil çıkarıcı ıskaladığında ve 'thorough' katmanında, mekan paneliyle sınırlı çalışır.
+    """
+
+    def __init__(self, fields, extractors, defaults=None):
+        self.fields = list(fields)
+        self.defaults = defaults or {}
+        self.extractors = {field: [] for field in self.fields}
+        for extractor in extractors:
+            self.extractors[extractor.field].append(extractor)
+        for field in self.fields:
+            self.extractors[field].sort(key=lambda extractor: extractor.priority)
+        self.primary = {}
+        self.fallbacks = {}
+        for field in self.fields:
+            primary, rest = self.extractors[field][0].split_primary()
+            self.primary[field] = primary
+            self.fallbacks[field] = ([rest] if rest else []) + self.extractors[field][1:]
+        self.stats = {}
+
+    def _record(self, extractor, selector, seconds):
+        stats = self.stats.setdefault(extractor.key, {'runs': 0, 'hits': 0, 'seconds': 0.0, 'selector_hits': {}})
+        stats['runs'] += 1
+        stats['seconds'] += seconds
+        if selector:
+            stats['hits'] += 1
+            stats['selector_hits'][selector] = stats['selector_hits'].get(selector, 0) + 1
+
+    def run(self, snapshot, fields=None, metrics=None, tier="thorough", misses=None):
+        """İstenen alanları (varsayılan: hepsi) görüntüden çıkar; {alan: değer} döndür
+        
+        Birincil çıkarıcının ıskaladığı alanlar misses listesine eklenir; yedek zincir yalnızca tier
+        'thorough' ise ve yalnızca bu alanlar için çalışır.
+        """
+        result = {}
+        for field in fields or self.fields:
+            with metrics.phase(f"general_info.{field}") if metrics else contextlib.nullcontext():
+                value = self._run_chain(snapshot, field, [self.primary[field]])
+                if not value:
+                    if misses is not None:
+                        misses.append(field)
+                    if tier == "thorough":
+                        value = self._run_chain(snapshot, field, self.fallbacks[field], scoped=True)
+            result[field] = value or self.defaults.get(field, "")
+        return result
+    
+    def _run_chain(self, snapshot, field, extractors, scoped=False):
+        """Çıkarıcıları sırayla dene; ilk sonucu döndür"""
+        value = None
+        for extractor in extractors:
+            started = time.perf_counter()
+            try:
+                value, selector = extractor.run(snapshot, scoped)
+            except Exception as e:
+                print(f"{extractor.key} çıkarıcısında hata: {e}")
+                value, selector = None, None
+            self._record(extractor, selector if value else None, time.perf_counter() - started)
+            if value:
+                print(f"{field}: {value} ({extractor.name})")
+                break
+        return value
+
+    async def run_on_page(self, page, fields=None, tier="thorough"):
+        """Canlı sayfada çalıştır: önce tek bir DOM görüntüsü al"""
+        return self.run(await capture_place_snapshot(page), fields, tier=tier)
+
+    def report(self, stats_by_key=None):
+        """Çıkarıcı başına isabet oranı, ortalama süre ve hiç kazanmayan seçiciler
+        
+        stats_by_key verilmezse bu çalıştırmanın istatistikleri kullanılır.
+        """
+        stats_by_key = self.stats if stats_by_key is None else stats_by_key
+        rows = []
+        for field in self.fields:
+            for extractor in [self.primary[field]] + self.fallbacks[field]:
+                stats = stats_by_key.get(extractor.key)
+                if not stats:
+                    continue
+                rows.append({
+                    'extractor': extractor.key,
+                    'runs': stats['runs'],
+                    'hits': stats['hits'],
+                    'hit_rate': stats['hits'] / stats['runs'] if stats['runs'] else 0.0,
+                    'avg_ms': 1000 * stats['seconds'] / stats['runs'] if stats['runs'] else 0.0,
+                    'never_won': [selector for selector in extractor.selectors if selector not in stats['selector_hits']]
+                })
+        return rows
+
+    def print_report(self, stats_by_key=None):
+        print("Çıkarıcı istatistikleri (alan.çıkarıcı: isabet/çalışma, ortalama süre):")
+        for row in self.report(stats_by_key):
+            print(f"  {row['extractor']}: {row['hits']}/{row['runs']} ({row['hit_rate']:.0%}), {row['avg_ms']:.1f} ms")
+            if row['never_won'] and row['runs'] >= 5:
+                print(f"    hiç kazanmayan seçiciler: {', '.join(row['never_won'])}")
+
+    def merge_stats(self, stats_by_key, into=None):
+        """stats_by_key'i into'ya (varsayılan: bu çalıştırmanın istatistikleri, ör. bir işçi sürecinden gelenler) ekle"""
+        into = self.stats if into is None else into
+        for key, stats in stats_by_key.items():
+            total = into.setdefault(key, {'runs': 0, 'hits': 0, 'seconds': 0.0, 'selector_hits': {}})
+            total['runs'] += stats['runs']
+            total['hits'] += stats['hits']
+            total['seconds'] += stats['seconds']
+            for selector, hits in stats['selector_hits'].items():
+                total['selector_hits'][selector] = total['selector_hits'].get(selector, 0) + hits
+        return into
+
+    def save_stats(self, path=EXTRACTOR_STATS_PATH):
+        """İstatistikleri önceki çalıştırmalarınkiyle birleştirip atomik olarak yaz; birleşik hali döndür"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                merged = json.load(f)
+        except:
+            merged = {}
+        self.merge_stats(self.stats, into=merged)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        return merged
+
+def _normalize_rating(text):
+    """'4,7' -> '4.7', '4' -> '4.0'"""
+    text = text.replace(',', '.')
+    return text + '.0' if text.isdigit() and len(text) == 1 else text
+
+def _website_value(node):
+    """Linkin metni veya Google dışı bir href'i web sitesi sayılır"""
+    text = node.text_content().strip()
+    href = node.get_attribute("href")
+    if (text and ("http" in text.lower() or "www" in text.lower() or ".com" in text.lower() or ".net" in text.lower())) or (href and ("http" in href.lower() and "google" not in href.lower())):
+        return text or href
+    return None
+
+def _looks_like_weekly_hours(text):
+    return ("pazartesi" in text.lower() or "monday" in text.lower()) and ":" in text and len(text) > 20
+
+# Doğrulayıcılarda kullanılan derlenmiş kalıplar
+DIGIT_PATTERN = re.compile(r'\d')
+RATING_DIGIT_PATTERN = re.compile(r'[1-5]')
+NUMBER_PATTERN = re.compile(r'[0-9]+')
+
+CATEGORY_KEYWORDS = ["restoran", "kafe", "cafe", "bar", "pub", "lokanta", "bistro", "pizzeria", "kebap"]
+PER_PERSON_KEYWORDS = [
+    "kişi başı", "kişi başı fiyat", "kişi başı ücret", "kişi başı maliyet", "kişi başı ortalama",
+    "per person", "per-person", "per head", "per capita", "per guest"
+]
+PRICE_INDICATORS = ["ucuz", "cheap", "inexpensive", "ekonomik", "orta", "moderate", "pahalı", "lüks", "expensive", "luxury"]
+
+GENERAL_INFO_FIELDS = ['Puan', 'Yorum_Sayisi', 'Adres', 'Telefon', 'Web_Sitesi', 'Kategori', 'Fiyat_Seviyesi', 'Calisma_Saatleri']
+
+GENERAL_INFO_EXTRACTORS = [
+    FieldExtractor('Kategori', 'selectors', [
+        'button[jsaction*="category"] span',
+        'div[jsaction*="category"]',
+        'span.DkEaL',
+        'span[jstcache*="category"]',
+        'div.cX2WmPgCkHi__section-info-text',
+        'div.fontBodyMedium span',
+        'button[aria-label*="işletme kategorisi"]',
+        'span.YhemCb'
+    ], accept=lambda text: 2 < len(text) < 50 and not DIGIT_PATTERN.search(text) and any(keyword in text.lower() for keyword in CATEGORY_KEYWORDS)),
+
+    # Başlık yanındaki büyük puan
+    FieldExtractor('Puan', 'display', [
+        'span.fontDisplayLarge',
+        'div.F7nice',
+        'span.ceNzKf',
+        'span[aria-hidden="true"]',
+        '[role="img"][aria-label*="yıldız"]',
+        '[aria-label*="yıldız"]',
+        'div[role="img"]'
+    ], accept=lambda text: len(text) < 5 and RATING_DIGIT_PATTERN.search(text), transform=_normalize_rating, priority=0),
+    # Yıldız ikonlarının "4,5 yıldız" / "4.5 stars" etiketleri
+    FieldExtractor('Puan', 'star_label', [
+        '[aria-label*="stars"]',
+        '[aria-label*="star"]',
+        '[aria-label*="yıldız"]',
+        '[role="img"][aria-label]'
+    ], read=lambda node: node.get_attribute('aria-label').lower(),
+        patterns=[r'([0-9][.,][0-9]|[0-9])\s*(stars|star|yıldız|puan)'],
+        transform=lambda match: match.group(1).replace(',', '.'), priority=1),
+    # Sayfa metninde "5 üzerinden X" gibi ifadeler
+    FieldExtractor('Puan', 'text_pattern', source='text', patterns=[
+        r'([0-9],[0-9]) üzerinden 5',
+        r'([0-9]\.[0-9]) out of 5',
+        r'([0-9],[0-9])/5',
+        r'5 üzerinden ([0-9],[0-9])',
+        r'5 out of ([0-9]\.[0-9])'
+    ], transform=lambda match: match.group(1).replace(',', '.'), priority=2),
+    # "Restaurant Name - 4.5 (123 reviews)" formatındaki sayfa başlığı
+    FieldExtractor('Puan', 'title', source='title', patterns=[r'([0-9][.,][0-9]|[0-9])\s*\('],
+        transform=lambda match: match.group(1).replace(',', '.'), priority=3),
+    # Son çare: tek başına "4,5" veya "4" içeren herhangi bir span/div
+    FieldExtractor('Puan', 'generic', ['span, div'], patterns=[r'^[0-9][.,][0-9]$', r'^[1-5]$'],
+        transform=lambda match: match.group(0).replace(',', '.'), priority=4),
+
+    FieldExtractor('Yorum_Sayisi', 'selectors', [
+        'div.fontBodyMedium span:has-text("review")',
+        'span.UY7F9',
+        'button[data-tab-index="1"] div',
+        'span:has-text("yorum")',
+        'span:has-text("değerlendirme")',
+        'span.F7nice',
+        'div[aria-label*="yorum"]'
+    ], accept=lambda text: DIGIT_PATTERN.search(text) and any(keyword in text.lower() for keyword in ["yorum", "review", "değerlendirme"]),
+        transform=lambda text: f"{''.join(NUMBER_PATTERN.findall(text))} yorum"),
+
+    FieldExtractor('Adres', 'selectors', [
+        'button[data-item-id="address"]',
+        'button[aria-label*="adres"]',
+        'button[data-tooltip="Adresi kopyala"]',
+        'button:has-text("Adres")',
+        'div:has-text("Adres") ~ div',
+        'button[jsaction*="si_address"]',
+        'div[jsaction*="si_address"]'
+    ], accept=lambda text: len(text) > 10),
+
+    # Geçerli telefon numarası en az 10 karakter olmalı
+    FieldExtractor('Telefon', 'selectors', [
+        'button[data-tooltip="Telefon numarasını kopyala"]',
+        'button[aria-label*="telefon"]',
+        'div:has-text("Telefon") ~ div',
+        'button:has-text("Telefon")',
+        'span:has-text("Telefon") + span',
+        'button[jsaction*="phone"]',
+        'div[jsaction*="phone"]'
+    ], accept=lambda text: (DIGIT_PATTERN.search(text) or "+" in text) and len(text) >= 10),
+
+    FieldExtractor('Web_Sitesi', 'selectors', [
+        'a[data-tooltip="Web sitesi"]',
+        'a[aria-label*="web"]',
+        'div:has-text("Web sitesi") ~ div a',
+        'a:has-text("Web sitesi")',
+        'a[href*="http"]:not([href*="google"])',
+        'a[jsaction*="website"]',
+        'div[jsaction*="website"] a'
+    ], read=_website_value, accept=lambda website: "translate.google.com" not in website),
+
+    # Öncelik: kişi başı fiyat
+    FieldExtractor('Fiyat_Seviyesi', 'per_person', [f'*:has-text("{keyword}")' for keyword in PER_PERSON_KEYWORDS],
+        accept=lambda text: len(text) < 50, priority=0),
+    FieldExtractor('Fiyat_Seviyesi', 'symbols', [
+        'span:has-text("₺")',
+        'span.mgr77e',
+        'span:has-text("Fiyat") + span',
+        'span[aria-label*="fiyat"]',
+        'div[jsaction*="price"]',
+        'span[aria-label*="price"]',
+        'span[class*="price"]'
+    ], accept=lambda text: "₺" in text and len(text) <= 5, priority=1),
+    # Fiyat kategorisi içeren kısa metinler
+    FieldExtractor('Fiyat_Seviyesi', 'indicator', [f'span:has-text("{indicator}"), div:has-text("{indicator}")' for indicator in PRICE_INDICATORS],
+        accept=lambda text: len(text) < 30, priority=2),
+    # ₺₺ - ₺₺₺ veya ₺₺-₺₺₺ formatındaki fiyat aralığı
+    FieldExtractor('Fiyat_Seviyesi', 'range', source='text', patterns=[r'([₺$€£]{1,4})\s*[-–]\s*([₺$€£]{1,4})'], priority=3),
+
+    # Gizli haftalık saat tablosu çoğunlukla DOM'da hazır bulunur
+    FieldExtractor('Calisma_Saatleri', 'table', [
+        'table:has(tr:has-text("Pazartesi"))',
+        'table:has(tr:has-text("Monday"))'
+    ], accept=_looks_like_weekly_hours, transform=lambda text: parse_opening_hours(text) or format_opening_hours(text), priority=0),
+    FieldExtractor('Calisma_Saatleri', 'aria_label', [
+        '[aria-label*="Pazartesi"]',
+        '[aria-label*="Monday"]'
+    ], read=lambda node: node.get_attribute('aria-label'), accept=_looks_like_weekly_hours,
+        transform=lambda text: parse_opening_hours(text) or format_opening_hours(text), priority=1),
+    FieldExtractor('Calisma_Saatleri', 'section', [
+        'div:has-text("Pazartesi") ~ div',
+        'div:has-text("Monday") ~ div',
+        'div:has-text("Çalışma saatleri") ~ div',
+        'div[class*="hour"]',
+        'div[jslog*="hours"]'
+    ], accept=_looks_like_weekly_hours, transform=lambda text: parse_opening_hours(text) or format_opening_hours(text), priority=2),
+    # Haftalık tablo yoksa "Bugün XX:XX - XX:XX" ifadesi
+    FieldExtractor('Calisma_Saatleri', 'today', source='text',
+        patterns=[re.compile(r'(Bugün|Today).*?(\d{1,2}[:.]\d{2}).*?[-–].*?(\d{1,2}[:.]\d{2})', re.IGNORECASE)],
+        transform=lambda match: f"Bugün: {match.group(2)} - {match.group(3)}", priority=3),
+]
+
+# Modül yüklenirken bir kez kurulan kayıt; toplu modda istatistikler tüm mekanlar için birikir
+GENERAL_INFO_REGISTRY = FieldRegistry(GENERAL_INFO_FIELDS, GENERAL_INFO_EXTRACTORS, defaults={'Fiyat_Seviyesi': "Belirtilmemiş"})
+
+def extract_general_info(snapshot, place_name, metrics=None, tier="thorough", misses=None):
+    """Kategori, puan, yorum sayısı, adres, telefon, fiyat, saat ve web sitesini görüntüden ayrıştır"""
+    general_info = {'Mekan_Adi': [place_name]}
+    for field, value in GENERAL_INFO_REGISTRY.run(snapshot, metrics=metrics, tier=tier, misses=misses).items():
+        general_info[field] = [value]
+    return general_info
+
+async def fill_missing_general_info(page, general_info):
+    """Görüntüde bulunamayan adres, telefon ve saatler için canlı sayfada butonlara tıkla"""
+    # Adres bilgisinin görüntülendiği butonu tıkla
+    if general_info['Adres'] == [""]:
+        try:
+            for button in await page.locator('button:has-text("Adres"), button[jsaction*="address"]').all():
+                try:
+                    await button.click(timeout=2000)
+                    await asyncio.sleep(1)
+                    # Tıklamadan sonra popup içinde adresi ara
+                    for elem in await page.locator('div[role="dialog"] div').all():
+                        text = (await elem.text_content()).strip()
+                        if text and len(text) > 15 and ("cadde" in text.lower() or "sokak" in text.lower() or "mah" in text.lower()):
+                            general_info['Adres'] = [text]
+                            print(f"Adres (alternatif): {text}")
+                            break
+                    # Popup'ı kapat
+                    await page.keyboard.press("Escape")
+                    if general_info['Adres'] != [""]:
+                        break
+                except:
+                    continue
+        except Exception as e:
+            print(f"Adres alınamadı: {e}")
+
+    # Telefon bilgisinin görüntülendiği butonu tıkla
+    if general_info['Telefon'] == [""]:
+        try:
+            for button in await page.locator('button:has-text("Telefon"), button[jsaction*="phone"]').all():
+                try:
+                    await button.click(timeout=2000)
+                    await asyncio.sleep(1)
+                    # Tıklamadan sonra popup içinde telefonu ara
+                    for elem in await page.locator('div[role="dialog"] div').all():
+                        text = (await elem.text_content()).strip()
+                        if text and re.search(r'[0-9]', text) and len(text) >= 10:
+                            general_info['Telefon'] = [text]
+                            print(f"Telefon (alternatif): {text}")
+                            break
+                    # Popup'ı kapat
+                    await page.keyboard.press("Escape")
+                    if general_info['Telefon'] != [""]:
+                        break
+                except:
+                    continue
+        except Exception as e:
+            print(f"Telefon alınamadı: {e}")
+
+    # Çalışma saatleri butonuna tıklayıp açılan paneldeki haftalık tabloyu oku
+    if general_info['Calisma_Saatleri'] == [""]:
+        hours_text = ""
+        try:
+            hours_button = page.locator('button[data-item-id="oh"], button[aria-label*="saat"], button[jsaction*="hours"]').first
+            await hours_button.click(timeout=3000)
+            await asyncio.sleep(2)
+            for panel_selector in [
+                'div[role="dialog"]',
+                'div.m6QErb.tLjsW.eKbjU',
+                'table[class*="WgFkxc"]',
+                'div[aria-label*="Çalışma saatleri"]',
+                'div.OMl5r',
+                'div[jsaction*="modal"]'
+            ]:
+                try:
+                    panel_content = (await page.locator(panel_selector).first.text_content(timeout=1000)).strip()
+                except:
+                    continue
+                if any(day in panel_content.lower() for day in ["pazartesi", "salı", "monday", "tuesday"]):
+                    # Pattern bulamazsa, ham metni kullan
+                    hours_text = parse_opening_hours(panel_content) or format_opening_hours(panel_content)
+                    print("Çalışma saatleri panelden alındı")
+                    break
+            # Dialogu kapat
+            await page.keyboard.press("Escape")
+        except Exception as e:
+            print(f"Çalışma saatleri butonuna tıklamada hata: {e}")
+
+        if hours_text:
+            general_info['Calisma_Saatleri'] = [hours_text]
+            print(f"Çalışma saatleri kaydedildi ({len(hours_text)} karakter)")
+        else:
+            general_info['Calisma_Saatleri'] = ["Belirtilmemiş"]
+            print("Çalışma saatleri bulunamadı")
+    return general_info
+
+# Varsayılan olarak engellenen kaynak türleri ve URL kalıpları (harita karoları, analiz istekleri)
+BLOCKED_RESOURCE_TYPES = ['image', 'media', 'font']
+BLOCKED_URL_PATTERNS = [
+    r'/maps/vt[/?]',
+    r'/kh/v=|khms\d*\.google',
+    r'streetviewpixels',
+    r'google-analytics\.com|googletagmanager\.com|doubleclick\.net',
+    r'/gen_204\b|/log\?'
+]
+# Engellenen isteklerin boyutu bilinmediğinden türe göre ortalama boyut tahmini (bayt)
+RESOURCE_SIZE_ESTIMATES = {
+    'image': 25_000,
+    'media': 500_000,
+    'font': 40_000,
+    'stylesheet': 20_000,
+    'script': 50_000,
+    'xhr': 5_000,
+    'fetch': 15_000
+}
+
+class ResourceBlocker:
+    """page/context.route ile gereksiz istekleri engelleyen ve kazancı sayan katman"""
+    
+    def __init__(self, types=None, patterns=None):
+        self.types = set(BLOCKED_RESOURCE_TYPES if types is None else types)
+        self.patterns = [re.compile(pattern) for pattern in (BLOCKED_URL_PATTERNS if patterns is None else patterns)]
+        self.blocked = {}
+        self.allowed = 0
+        self.estimated_bytes_saved = 0
+    
+    async def install(self, target):
+        """Engelleme kuralını bir sayfaya veya context'e bağla"""
+        await target.route("**/*", self.handle)
+    
+    async def handle(self, route):
+        request = route.request
+        resource_type = request.resource_type
+        if resource_type in self.types or any(pattern.search(request.url) for pattern in self.patterns):
+            self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+            self.estimated_bytes_saved += RESOURCE_SIZE_ESTIMATES.get(resource_type, 10_000)
+            await route.abort()
+        else:
+            self.allowed += 1
+            await route.continue_()
+    
+    def summary(self):
+        return {
+            'blocked_requests': sum(self.blocked.values()),
+            'blocked_by_type': dict(self.blocked),
+            'allowed_requests': self.allowed,
+            'estimated_bytes_saved': self.estimated_bytes_saved
+        }
+
+# Her context için kullanılan tarayıcı ayarları
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1366, 'height': 768},
+    'user_agent': "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+# Havuzdaki ilk context'in çerez onayını geçmek için açtığı sayfa
+CONSENT_WARMUP_URL = "https://www.google.com/maps"
+
+async def accept_consent(page, timeout=5000):
+    """Çerez onayı butonu varsa tıkla; tıklandıysa True döndür"""
+    try:
+        accept_button = page.get_by_role("button", name=re.compile("(Kabul|Accept|Tümünü kabul|Agree)", re.IGNORECASE)).first
+        await accept_button.click(timeout=timeout)
+        await asyncio.sleep(2)
+        return True
+    except:
+        return False
+
+# ===== Sayfa durumu algılama =====
+# Mekan sayfası yerine çerez onayı, captcha, trafik sınırı veya "bulunamadı" sayfası geldiğinde genel bilgi
+# yedeklerini ve kaydırmayı boşuna çalıştırmamak için sayfa açılır açılmaz ve yorum sekmesinden sonra bakılır.
+
+PAGE_STATE_PLACE = "place"
+PAGE_STATE_CONSENT = "consent"
+PAGE_STATE_CAPTCHA = "captcha"
+PAGE_STATE_RATE_LIMIT = "rate_limit"
+PAGE_STATE_NOT_FOUND = "not_found"
+PAGE_STATE_UNKNOWN = "unknown"
+PAGE_STATE_LABELS = {
+    PAGE_STATE_PLACE: "mekan",
+    PAGE_STATE_CONSENT: "çerez onayı",
+    PAGE_STATE_CAPTCHA: "captcha",
+    PAGE_STATE_RATE_LIMIT: "trafik sınırı",
+    PAGE_STATE_NOT_FOUND: "mekan bulunamadı",
+    PAGE_STATE_UNKNOWN: "bilinmeyen"
+}
+# Bu durumlarda mekan hemen bırakılır; captcha ve trafik sınırında toplu çekim ayrıca bir süre bekler
+PAGE_FAIL_STATES = (PAGE_STATE_CAPTCHA, PAGE_STATE_RATE_LIMIT, PAGE_STATE_NOT_FOUND)
+PAGE_BACKOFF_STATES = (PAGE_STATE_CAPTCHA, PAGE_STATE_RATE_LIMIT)
+
+# Sayfa durumunu belirleyen elementler için seçiciler
+PAGE_STATE_SELECTORS = {
+    'captcha': 'iframe[src*="recaptcha"], div.g-recaptcha, form#captcha-form, #captcha',
+    'consent': 'form[action*="consent.google"], iframe[src*="consent.google"]',
+    'place': 'h1.DUwDvf, div[role="main"] h1'
+}
+# Mekan sayfasının veya onu engelleyen sayfanın hazır olduğunu gösteren seçici
+PAGE_READY_SELECTOR = f"h1, {PAGE_STATE_SELECTORS['captcha']}, {PAGE_STATE_SELECTORS['consent']}"
+# Google'ın "olağan dışı trafik" sayfası ve Maps'in "bulunamadı" mesajı (küçük harfli metinde aranır)
+RATE_LIMIT_KEYWORDS = [
+    "unusual traffic from your computer network", "our systems have detected unusual traffic",
+    "olağan dışı trafik", "alışılmadık trafik"
+]
+# Yalnızca Maps'in tam hata cümleleri aranır; "bulunamadı" gibi tek kelimeler yorum metinlerinde de geçer
+NOT_FOUND_PATTERN = re.compile(
+    r"google (?:haritalar|maps)\b[^\n]{0,120}?\b(?:bulamıyor|bulamadı|can['’]t find|cannot find|couldn['’]t find)"
+)
+
+# Sınıflandırma için gereken her şeyi tek evaluate çağrısıyla toplayan sayfa içi script
+PAGE_STATE_JS = r"""
+(selectors) => ({
+    url: location.href,
+    title: document.title,
+    text: (document.body ? document.body.innerText : '').slice(0, 5000),
+    captcha: !!document.querySelector(selectors.captcha),
+    consent: !!document.querySelector(selectors.consent),
+    place: !!document.querySelector(selectors.place)
+})
+"""
+
+class PageStateError(Exception):
+    """Sayfa mekan sayfası değil; state PAGE_FAIL_STATES'ten biri (veya geçilemeyen çerez onayı)"""
+    
+    def __init__(self, state, url, phase="goto"):
+        super().__init__(f"{PAGE_STATE_LABELS[state].capitalize()} sayfası algılandı ({phase}): {url}")
+        self.state = state
+        self.url = url
+        self.phase = phase
+
+def classify_page_state(info, status=None):
+    """PAGE_STATE_JS çıktısını (ve varsa HTTP durum kodunu) sayfa durumuna çevir"""
+    url = info.get('url', '').lower()
+    text = f"{info.get('title', '')}\n{info.get('text', '')}".lower()
+    if info.get('captcha') or "/sorry/" in url:
+        return PAGE_STATE_CAPTCHA
+    if status == 429 or any(keyword in text for keyword in RATE_LIMIT_KEYWORDS):
+        return PAGE_STATE_RATE_LIMIT
+    if "consent.google." in url or info.get('consent'):
+        return PAGE_STATE_CONSENT
+    if info.get('place'):
+        return PAGE_STATE_PLACE
+    if status == 404 or NOT_FOUND_PATTERN.search(text):
+        return PAGE_STATE_NOT_FOUND
+    return PAGE_STATE_UNKNOWN
+
+async def detect_page_state(page, response=None):
+    """Sayfanın o anki durumunu sınıflandır; sayfa okunamazsa PAGE_STATE_UNKNOWN döndür"""
+    try:
+        info = await page.evaluate(PAGE_STATE_JS, PAGE_STATE_SELECTORS)
+    except Exception as e:
+        print(f"Sayfa durumu okunamadı: {e}")
+        return PAGE_STATE_UNKNOWN
+    return classify_page_state(info, response.status if response else None)
+
+async def check_page_state(page, url, phase="goto", response=None, allow_consent=True):
+    """Sayfa durumunu al; mekan bırakılması gereken bir durumdaysa PageStateError fırlat"""
+    state = await detect_page_state(page, response)
+    if state != PAGE_STATE_PLACE:
+        print(f"Sayfa durumu ({phase}): {PAGE_STATE_LABELS[state]}")
+    if state in PAGE_FAIL_STATES or (state == PAGE_STATE_CONSENT and not allow_consent):
+        raise PageStateError(state, url, phase)
+    return state
+
+class BlockBackoff:
+    """Captcha veya trafik sınırı görülünce toplu çekimdeki tüm yeni istekleri bekleten üstel geri çekilme
+    
+    Her art arda engelde bekleme süresi ikiye katlanır (en fazla max_delay); başarılı bir mekan sıfırlar.
+    """
+    
+    def __init__(self, base_delay=30, max_delay=600):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.strikes = 0
+        self.until = 0.0
+    
+    def hit(self):
+        delay = min(self.max_delay, self.base_delay * 2 ** self.strikes)
+        self.strikes += 1
+        self.until = max(self.until, time.monotonic() + delay)
+        print(f"Google istekleri engelliyor, yeni mekanlar {delay:.0f} sn bekletilecek")
+    
+    def reset(self):
+        self.strikes = 0
+    
+    def record(self, result):
+        """Bir mekanın sonucuna göre geri çekilmeyi artır veya sıfırla"""
+        if result.get('page_state') in PAGE_BACKOFF_STATES:
+            self.hit()
+        elif 'error' not in result:
+            self.reset()
+    
+    async def wait(self):
+        delay = self.until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class ContextPool:
+    """Çerez onayını geçmiş, yeniden kullanılabilir browser context havuzu
+    
+    İlk context onayı bir kez geçer; storage_state'i diğer context'lere kopyalanır ve storage_state
+    yolu verilirse diske yazılarak sonraki çalıştırmalarda da kullanılır. Her kiralama için yeni bir
+    sayfa açılır; bir context max_uses kiralamadan sonra kapatılıp yerine yenisi açılır. Kapatılan bir
+    context'in yeri boş bir context beklerken uyuyan kiralamaya idle kuyruğundaki None ile bildirilir.
+    """
+    
+    def __init__(self, browser, size=4, max_uses=20, storage_state=None, block_resources=None):
+        self.browser = browser
+        self.size = size
+        self.max_uses = max_uses
+        self.storage_state = storage_state
+        self.block_resources = block_resources
+        self.state = None
+        self.state_lock = asyncio.Lock()
+        self.idle = asyncio.Queue()
+        self.open_contexts = 0
+        self.waiting = 0
+        self.recycled = 0
+        self.blockers = []
+    
+    async def _warm_state(self):
+        """Çerez onayı geçilmiş storage_state'i bir kez üret (diskte varsa onu kullan)"""
+        async with self.state_lock:
+            if self.state is not None:
+                return self.state
+            if self.storage_state and os.path.exists(self.storage_state):
+                self.state = self.storage_state
+                print(f"Kayıtlı oturum durumu kullanılıyor: {self.storage_state}")
+                return self.state
             
-            # Önce "Çalışma saatleri" metnini içeren butonu bul
-            hours_button = None
+            context = await self.browser.new_context(**CONTEXT_OPTIONS)
+            try:
+                page = await context.new_page()
+                try:
+                    await page.goto(CONSENT_WARMUP_URL, wait_until="domcontentloaded")
+                except Exception as e:
+                    print(f"Isınma sayfası açılamadı: {e}")
+                if await accept_consent(page):
+                    print("Çerez onayı havuz için bir kez geçildi")
+                self.state = await context.storage_state(path=self.storage_state) if self.storage_state else await context.storage_state()
+            finally:
+                await context.close()
+            return self.state
+    
+    async def _new_slot(self):
+        context = await self.browser.new_context(storage_state=await self._warm_state(), **CONTEXT_OPTIONS)
+        if self.block_resources:
+            blocker = ResourceBlocker(**self.block_resources) if isinstance(self.block_resources, dict) else ResourceBlocker()
+            await blocker.install(context)
+            self.blockers.append(blocker)
+        return {'context': context, 'uses': 0}
+    
+    async def _acquire(self):
+        while True:
+            slot = self.idle.get_nowait() if not self.idle.empty() else None
+            if slot is not None:
+                return slot
+            if self.open_contexts < self.size:
+                self.open_contexts += 1
+                try:
+                    return await self._new_slot()
+                except:
+                    self._free_slot()
+                    raise
+            self.waiting += 1
+            try:
+                slot = await self.idle.get()
+            finally:
+                self.waiting -= 1
+            if slot is not None:
+                return slot
+            # None: bir context kapatıldı, yerine yenisini açmayı dene
+    
+    def _free_slot(self):
+        """Bir context'in yerini boşalt; bekleyen kiralama varsa uyandır"""
+        self.open_contexts -= 1
+        if self.waiting:
+            self.idle.put_nowait(None)
+    
+    @contextlib.asynccontextmanager
+    async def lease(self):
+        """Isınmış bir context'te yeni sayfa kirala; iş bitince sayfayı kapat ve context'i havuza geri koy"""
+        slot = await self._acquire()
+        page = None
+        try:
+            page = await slot['context'].new_page()
+            yield page
+        finally:
+            if page:
+                try:
+                    await page.close()
+                except:
+                    pass
+            slot['uses'] += 1
+            if page is None or slot['uses'] >= self.max_uses:
+                await self._retire(slot)
+            else:
+                self.idle.put_nowait(slot)
+    
+    async def _retire(self, slot):
+        try:
+            await slot['context'].close()
+        except:
+            pass
+        self._free_slot()
+        self.recycled += 1
+    
+    async def close(self):
+        while not self.idle.empty():
+            slot = self.idle.get_nowait()
+            if slot is not None:
+                await self._retire(slot)
+        if self.blockers:
+            blocked = sum(blocker.summary()['blocked_requests'] for blocker in self.blockers)
+            saved = sum(blocker.estimated_bytes_saved for blocker in self.blockers)
+            print(f"Havuz: {blocked} istek engellendi (tahmini {saved / 1_000_000:.1f} MB tasarruf)")
+
+# ===== Yorum sekmesi, sıralama ve paralel parçalama =====
+
+# Sıralama menüsündeki seçenekler: aranacak menü metinleri ve seçimi doğrulayan anahtar kelimeler
+SORT_OPTIONS = {
+    'newest': {
+        'label': "en yeni",
+        'texts': ["En yeni", "Yeni", "Newest", "Most recent", "Recent"],
+        'keywords': ["yeni", "recent", "newest"]
+    },
+    'most_relevant': {
+        'label': "en alakalı",
+        'texts': ["En alakalı", "Alakalı", "Most relevant", "Relevant"],
+        'keywords': ["alakalı", "relevant"]
+    },
+    'highest_rating': {
+        'label': "en yüksek puan",
+        'texts': ["En yüksek puan", "Yüksek puan", "Highest rating", "Highest"],
+        'keywords': ["yüksek", "highest"]
+    },
+    'lowest_rating': {
+        'label': "en düşük puan",
+        'texts': ["En düşük puan", "Düşük puan", "Lowest rating", "Lowest"],
+        'keywords': ["düşük", "lowest"]
+    }
+}
+# Sıralama menüsünü açan buton için denenecek seçiciler
+SORT_BUTTON_SELECTORS = [
+    'button[aria-label*="Sıralama"]',
+    'button:has-text("Sırala")',
+    'button[aria-controls*="sort"]',
+    'button:has-text("Sort")',
+    'button[jsaction*="sort"]',
+    'div[role="button"]:has-text("Alakalı")',
+    'div[role="button"]:has-text("sırala")'
+]
+# Yorumlar sekmesi için denenecek seçiciler
+REVIEW_TAB_SELECTORS = [
+    'button[data-tab-index="1"]',
+    'button:has-text("Yorumlar")',
+    'button:has-text("Değerlendirmeler")',
+    'button:has-text("Reviews")',
+    'div[role="tab"]:has-text("Yorum")',
+    'div[role="tablist"] > div:nth-child(2)'
+]
+
+async def open_reviews_tab(page):
+    """Yorumlar sekmesini bul ve tıkla; tıklandıysa True döndür"""
+    for selector in REVIEW_TAB_SELECTORS:
+        try:
+            elements = await page.locator(selector).all()
+            for element in elements:
+                text = (await element.text_content()).lower()
+                if "yorum" in text or "değerlendirme" in text or "review" in text:
+                    await element.click(timeout=5000)
+                    print("Yorumlar sekmesine tıklandı")
+                    await asyncio.sleep(3)
+                    return True
+        except:
+            continue
+    return False
+
+async def select_sort(page, sort_by="newest", attempts=3):
+    """Sıralama menüsünü açıp sort_by seçeneğini seç (SORT_OPTIONS anahtarlarından biri); seçildiyse True döndür"""
+    if sort_by not in SORT_OPTIONS:
+        print(f"Bilinmeyen sıralama '{sort_by}', en yeni kullanılacak")
+        sort_by = "newest"
+    sort_option = SORT_OPTIONS[sort_by]
+
+    try:
+        # Önce sıralama butonunu bul (birkaç kez deneyeceğiz)
+        for attempt in range(attempts):
+            sort_button_found = False
+
+            for selector in SORT_BUTTON_SELECTORS:
+                try:
+                    sort_buttons = await page.locator(selector).all()
+                    for sort_button in sort_buttons:
+                        try:
+                            text = (await sort_button.text_content()).lower()
+                            if "sıra" in text or "sort" in text or "alak" in text or "en y" in text:
+                                await sort_button.click(timeout=3000)
+                                sort_button_found = True
+                                print(f"Sıralama butonu bulundu ve tıklandı: '{text}'")
+                                await asyncio.sleep(2)
+                                break
+                        except Exception as e:
+                            print(f"Sıralama butonuna tıklamada hata: {e}")
+                            continue
+
+                    if sort_button_found:
+                        break
+                except:
+                    continue
+
+            if sort_button_found:
+                # Sıralama menüsü açıldı, şimdi istenen seçeneği bul
+                for text in sort_option['texts']:
+                    try:
+                        menu_options = await page.locator(f'div[role="menuitem"]:has-text("{text}")').all()
+                        for menu_option in menu_options:
+                            try:
+                                option_text = (await menu_option.text_content()).lower()
+                                if any(keyword in option_text for keyword in sort_option['keywords']):
+                                    await menu_option.click(timeout=3000)
+                                    print(f"{sort_option['label'].upper()} sıralama seçildi: '{option_text}'")
+                                    await asyncio.sleep(3)  # Yorumların yeniden yüklenmesi için daha uzun bekle
+                                    return True
+                            except:
+                                continue
+                    except:
+                        continue
+
+                # Menü açıldı ama seçenek bulunamadı, menüyü kapat ve tekrar dene
+                await page.keyboard.press("Escape")
+                await asyncio.sleep(1)
+
+            # Bulunamadıysa biraz bekle ve sayfayı tazele
+            if attempt < attempts - 1:  # Son denemede değilsek
+                await page.mouse.wheel(0, 300)  # Biraz aşağı kaydır
+                await asyncio.sleep(2)
+
+        print(f"{sort_option['label'].capitalize()} sıralama seçeneği bulunamadı, varsayılan sıralama kullanılıyor")
+    except Exception as e:
+        print(f"Sıralama işlemi sırasında hata: {e}")
+    return False
+
+# Parçalamada sıralamaların kullanım sırası; istenen sıralama her zaman ilk parçadır
+SHARD_SORT_ORDER = ["newest", "lowest_rating", "highest_rating", "most_relevant"]
+
+def shard_sort_orders(sort_by, shards):
+    """İstenen sıralamayla başlayıp diğer sıralamalarla tamamlanan, en fazla shards elemanlı sıralama listesi"""
+    orders = [sort_by] + [order for order in SHARD_SORT_ORDER if order != sort_by]
+    return orders[:max(1, min(shards, len(SORT_OPTIONS)))]
+
+async def scrape_review_shards(page, url, sort_orders, max_reviews, writer, metrics, tier="thorough", misses=None,
+                               extraction_mode="stream"):
+    """Aynı mekanı her biri farklı sıralamada açılmış sayfalarda paralel kaydır ve yorumları tek yazıcıda birleştir
+
+    İlk parça yorumlar sekmesi açık olan mevcut sayfayı kullanır, diğerleri aynı context'te yeni sayfa açar.
+    Yorumlar yazıcının review_key kümesiyle tekilleştirilir. stream modunda parçalar kaydırırken çıkarır ve
+    benzersiz yorum sayısı max_reviews'a ulaşınca hep birlikte durur; diğer modlarda her parça önce kaydırır,
+    sonra seçilen yöntemle kalan hedef kadar çıkarır. Parça başına istatistik listesi döner. Bir parça captcha veya trafik sınırına
+    takılırsa diğerleri bitince PageStateError fırlatılır; mekan sıfır yorumla tamamlanmış sayılmaz.
+    """
+    print(f"Yorumlar {len(sort_orders)} sıralamada paralel çekiliyor: {', '.join(sort_orders)}")
+    all_stats = []
+    blocked = []
+    # Toplu modlarda çıkarımlar sırayla yapılır; kalan hedef her parçada güncel yazıcı sayısından hesaplanır
+    extraction_lock = asyncio.Lock()
+
+    async def run_shard(index, sort_by):
+        stats = {'sort_by': sort_by, 'sorted': False, 'cards': 0, 'extracted': 0, 'new': 0, 'duplicates': 0, 'exhausted': False}
+        all_stats.append(stats)
+        shard_page = page
+        collector = None
+        try:
+            if index > 0:
+                shard_page = MeteredObject(await page.context.new_page(), metrics)
+                response = await shard_page.goto(url, wait_until="load")
+                try:
+                    await shard_page.wait_for_selector(PAGE_READY_SELECTOR, timeout=10000)
+                except:
+                    pass
+                # Aynı context'te çerez onayı zaten geçildi; yeniden gelirse engel sayılır
+                await check_page_state(shard_page, url, phase=f"shard:{sort_by}", response=response, allow_consent=False)
+                if not await open_reviews_tab(shard_page):
+                    await check_page_state(shard_page, url, phase=f"shard:{sort_by}", allow_consent=False)
+                    print(f"[{sort_by}] Yorumlar sekmesi bulunamadı, parça atlanıyor")
+                    return
+            if extraction_mode == "network":
+                # Sıralama değişince liste yeniden istenir; yanıtlar yazıcıya bağlanana kadar bekletilir
+                collector = ReviewResponseCollector(max_reviews)
+                collector.attach(shard_page)
+            stats['sorted'] = await select_sort(shard_page, sort_by)
+            if not stats['sorted'] and index > 0:
+                # Varsayılan sıralama ilk parçayla büyük ölçüde örtüşür
+                print(f"[{sort_by}] Sıralama seçilemedi, parça atlanıyor")
+                return
+            if extraction_mode == "stream":
+                await stream_reviews(shard_page, max_reviews, writer, stats, tier=tier, misses=misses)
+                return
+            
+            # Toplu modlarda tekrar sayısı parça başına ayrılamaz
+            stats['duplicates'] = None
+            await load_reviews(shard_page, max_reviews)
+            stats['cards'] = await shard_page.locator(REVIEW_COUNT_SELECTOR).count()
+            await expand_reviews(shard_page)
+            async with extraction_lock:
+                remaining = max_reviews - writer.count
+                if extraction_mode == "network":
+                    # Dinleme sıralama seçiminden sonra başladığı için ağdan gelmeyen ilk kartlar DOM'dan tamamlanır
+                    await collector.drain()
+                    collector.max_reviews = max(0, remaining)
+                    collector.bind(writer)
+                    stats['new'] = await extract_reviews_network(shard_page, collector, collector.max_reviews, writer,
+                                                                 tier=tier, misses=misses)
+                    collector.detach(shard_page)
+                elif remaining > 0:
+                    if extraction_mode == "batch":
+                        stats['new'] = await extract_reviews_batch(shard_page, remaining, writer, tier=tier, misses=misses)
+                    else:
+                        stats['new'] = await extract_reviews_with_locators(shard_page, remaining, writer)
+        except PageStateError as e:
+            print(f"[{sort_by}] Parça engellendi: {e}")
+            blocked.append(e)
+        except Exception as e:
+            print(f"[{sort_by}] Parça hata verdi: {e}")
+        finally:
+            if collector:
+                collector.detach(shard_page)
+            if shard_page is not page:
+                try:
+                    await shard_page.close()
+                except:
+                    pass
+
+    await asyncio.gather(*(run_shard(index, sort_by) for index, sort_by in enumerate(sort_orders)))
+
+    for stats in all_stats:
+        if stats['duplicates'] is None:
+            print(f"[{stats['sort_by']}] {stats['cards']} kart, {stats['new']} yeni yorum")
+            continue
+        total = stats['new'] + stats['duplicates']
+        overlap = stats['duplicates'] / total * 100 if total else 0
+        state = "akış bitti" if stats['exhausted'] else "durduruldu"
+        print(f"[{stats['sort_by']}] {stats['cards']} kart, {stats['new']} yeni yorum, {stats['duplicates']} tekrar (%{overlap:.0f}), {state}")
+    print(f"Parçalardan toplam {writer.count} benzersiz yorum birleştirildi")
+    if blocked:
+        raise blocked[0]
+    return all_stats
+
+def scrape_google_maps(url, max_reviews=100, sort_by="newest", **options):
+    """Tek bir mekanı çek (async motorun senkron sarmalayıcısı)"""
+    return asyncio.run(scrape_google_maps_async(url, max_reviews, sort_by, **options))
+
+async def scrape_google_maps_async(url, max_reviews=100, sort_by="newest", browser=None, headless=False, pool=None, **options):
+    """Tek bir mekanı çek; pool verilirse ısınmış bir context'ten sayfa kirala, browser verilirse
+    yeni tarayıcı açmadan onu kullan
+    
+    Ek seçenekler scrape_place ve scrape_page'e aktarılır (ör. block_resources, extraction_mode).
+    """
+    # Benzersiz bir ID oluştur
+    session_id = generate_random_id()
+    print(f"Google Maps verisi çekiliyor... (Sıralama: {sort_by}, Maksimum yorum: {max_reviews}, İşlem ID: {session_id})")
+    
+    # Tarayıcı/context açılışı da ölçülsün diye ölçüm nesnesi burada oluşturulur
+    metrics = options.setdefault('metrics', RunMetrics())
+    metrics.begin("launch")
+    if pool is not None:
+        # Kaynak engelleme havuzun context'lerinde kurulu
+        options.pop('block_resources', None)
+        async with pool.lease() as page:
+            return await scrape_page(page, url, max_reviews, sort_by, session_id, consent_done=True, **options)
+    
+    if browser is not None:
+        return await scrape_place(browser, url, max_reviews, sort_by, session_id, **options)
+    
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        try:
+            return await scrape_place(browser, url, max_reviews, sort_by, session_id, **options)
+        finally:
+            await browser.close()
+
+async def scrape_place(browser, url, max_reviews, sort_by, session_id, block_resources=None, **options):
+    """Açık bir tarayıcıda yeni bir context açarak mekanı çek ve sonucu döndür
+    
+    block_resources True ise varsayılan kurallar, {'types': [...], 'patterns': [...]} ise özel kurallar uygulanır.
+    """
+    context = await browser.new_context(**CONTEXT_OPTIONS)
+    blocker = None
+    if block_resources:
+        blocker = ResourceBlocker(**block_resources) if isinstance(block_resources, dict) else ResourceBlocker()
+        await blocker.install(context)
+    
+    try:
+        result = await scrape_page(await context.new_page(), url, max_reviews, sort_by, session_id, **options)
+    finally:
+        await context.close()
+    
+    if blocker:
+        stats = blocker.summary()
+        print(f"{stats['blocked_requests']} istek engellendi (tahmini {stats['estimated_bytes_saved'] / 1_000_000:.1f} MB tasarruf)")
+        result.update(stats)
+    return result
+
+async def scrape_page(page, url, max_reviews, sort_by, session_id, extraction_mode="batch", write_jsonl=False, resume=False, since_last_run=False, consent_done=False,
+                      metrics=None, prometheus=None, shards=1, debug_artifacts="on_error", debug_sample_rate=0.1, debug_compress=False,
+                      dataset=None, store=None, extraction_tier="thorough", scheduler=None, place_cache=None):
+    """Verilen sayfada mekanın genel bilgilerini ve yorumlarını çek
+    
+    shards 1'den büyükse yorumlar aynı mekanın farklı sıralamalarda açılmış sayfalarında paralel
+    çekilir (scrape_review_shards). Ekran görüntüsü ve sayfa kaynağı kayıtları debug_artifacts
+    politikasına göre alınır (bkz. DebugArtifacts). dataset bir ParquetDataset ise genel bilgiler ve
+    yorumlar ayrıca bölümlü Parquet veri kümesine eklenir; store bir SqliteStore ise ona upsert edilir ve
+    --resume/--since-last-run için kayıtlı yorumlar ve işaret oradan okunur. scheduler bir AdaptiveScheduler
+    ise sayfa açılışı ve yorum yüklemeleri onun hız sınırından geçer. place_cache bir PlaceInfoCache ise
+    mekanın taze önbellek kaydı varken genel bilgiler sayfadan çıkarılmaz, kayıttan yazılır. Aşama süreleri ve Playwright çağrı sayıları metrics'e (verilmezse yeni bir RunMetrics) yazılır ve
+    run_metrics.json olarak kaydedilir; prometheus bir PrometheusExport ise ona da eklenir.
+    """
+    metrics = metrics or RunMetrics()
+    page = MeteredObject(page, metrics)
+    if scheduler:
+        await scheduler.install(page.context)
+    
+    # Parçalama yalnızca en yeni sıralamada durulabilen "son çalıştırmadan beri" moduyla birleşmez
+    sort_orders = shard_sort_orders(sort_by, shards)
+    if len(sort_orders) > 1 and since_last_run:
+        print("Son çalıştırmadan beri modunda parçalama kullanılamaz, tek sayfa ile devam ediliyor")
+        sort_orders = sort_orders[:1]
+    
+    # Ağ modunda yorum listesi yanıtlarını sayfa açılmadan dinlemeye başla (parçalamada her parça kendi dinleyicisini kurar)
+    collector = None
+    if extraction_mode == "network" and len(sort_orders) == 1:
+        collector = ReviewResponseCollector(max_reviews)
+        collector.attach(page)
+    
+    # URL'ye git
+    metrics.begin("goto")
+    if scheduler:
+        scheduler.take_wait(page)
+    try:
+        response = await page.goto(url, wait_until="networkidle")
+    except:
+        response = await page.goto(url, wait_until="load")
+    if scheduler:
+        # Zamanlayıcı açılışın ne kadarının hız sınırı kuyruğunda geçtiğini bilsin
+        metrics.extra['goto_rate_wait_seconds'] = round(scheduler.take_wait(page), 3)
+    
+    # Captcha, trafik sınırı veya bulunamadı sayfasıysa hiçbir şey çekmeden hemen bırak
+    metrics.begin("page_state")
+    state = await check_page_state(page, url, response=response)
+        
+    # Çerezleri kabul et (havuzdan gelen context'lerde onay zaten geçilmiş; yine de onay sayfası geldiyse geç)
+    metrics.begin("consent")
+    if not consent_done or state == PAGE_STATE_CONSENT:
+        if await accept_consent(page) or state == PAGE_STATE_CONSENT:
+            state = await check_page_state(page, url, phase="consent", allow_consent=False)
+            
+    # Sabit bekleme yerine mekan başlığı (veya onu engelleyen sayfa) görünene kadar bekle (en fazla 10 sn)
+    metrics.begin("place_name")
+    try:
+        await page.wait_for_selector(PAGE_READY_SELECTOR, timeout=10000)
+    except:
+        pass
+    if state != PAGE_STATE_PLACE:
+        state = await check_page_state(page, url, phase="load", allow_consent=False)
+    
+    # Birincil seçicilerin ıskaladığı alanlar run_metrics.json'a yazılır
+    field_misses = []
+    review_misses = collections.Counter()
+    
+    # Önbellekte taze kaydı olan mekanda genel bilgi aşaması tamamen atlanır, yalnızca yorumlar yenilenir
+    place_id = canonical_place_id(url) or canonical_place_id(page.url)
+    cached = place_cache.get(place_id) if place_cache and place_id else None
+    if cached:
+        place_name = cached['place_name']
+        print(f"Genel bilgiler önbellekten alınacak ({place_id}, {cached['cached_at']} tarihli)")
+    else:
+        # Ana bilgiler sekmesine geç ve daha çok veri yüklenmesi için ekranı biraz kaydır
+        try:
             for selector in [
-                'button[data-item-id="oh"]',
-                'button:has-text("Çalışma saatleri")',
-                'div:has-text("Çalışma saatleri") button',
-                'button[aria-label*="saat"]',
-                'button[jsaction*="hours"]',
-                'div[jsaction*="hours"]',
-                'div:has-text("Bugün") + div',  # "Bugün XX:XX - XX:XX" formatına sahip elementler
-                'div:has-text("Açık") + div'    # "Açık · XX:XX kapanıyor" formatına sahip elementler
+                'button[data-tab-index="0"]',
+                'button:has-text("Genel bakış")',
+                'button:has-text("Ana bilgiler")',
+                'div[role="tab"]:has-text("Genel")'
             ]:
                 try:
-                    elements = page.locator(selector).all()
+                    elements = await page.locator(selector).all()
                     for element in elements:
-                        content = element.text_content().lower()
-                        if ("saat" in content or "açık" in content or "kapalı" in content or 
-                            "bugün" in content or (":" in content and ("-" in content or "–" in content))):
-                            hours_button = element
-                            print(f"Çalışma saatleri butonu bulundu: '{content}'")
+                        text = (await element.text_content()).lower()
+                        if "genel" in text or "ana" in text or "bakış" in text:
+                            await element.click(timeout=3000)
+                            print("Ana bilgiler sekmesine geçildi")
+                            await asyncio.sleep(2)
                             break
-                    if hours_button:
-                        break
                 except:
                     continue
+        except:
+            pass
+        await page.mouse.wheel(0, 300)
+        await asyncio.sleep(1)
+    
+        # Mekan paneli bir kez alınır; ad ve genel bilgiler bu görüntüden Python tarafında ayrıştırılır
+        with metrics.phase("snapshot"):
+            snapshot = await capture_place_snapshot(page)
+        place_name = extract_place_name(snapshot, extraction_tier, field_misses)
+    
+    # Kontrol noktası varsa önceki klasöre devam et, yoksa klasör oluştur (mekan adı + random ID ile)
+    place_key = place_storage_key(place_id, place_name)
+    checkpoint = Checkpoint(place_key) if place_key else None
+    
+    if resume and checkpoint and checkpoint.folder_path and os.path.isdir(checkpoint.folder_path):
+        folder_path = checkpoint.folder_path
+        print(f"Kontrol noktasından devam ediliyor, {len(checkpoint.review_ids)} bilinen yorum atlanacak")
+    else:
+        folder_name = f"{slugify(place_name)}_{session_id}"
+        folder_path = os.path.join(os.path.expanduser("~/Downloads"), folder_name)
+        os.makedirs(folder_path, exist_ok=True)
+        if checkpoint:
+            checkpoint.reset(folder_path)
+    print(f"Veriler şu klasörde toplanacak: {folder_path}")
+    
+    # Debug için ekran görüntüsü al (politika izin veriyorsa; dosya yazımı arka planda)
+    artifacts = DebugArtifacts(folder_path, debug_artifacts, debug_sample_rate, debug_compress)
+    await artifacts.screenshot(page, "main_page")
+    
+    # ===== Restoran genel bilgilerini topla =====
+    metrics.begin("general_info")
+    if cached:
+        general_info = cached['general_info']
+    else:
+        print("Genel bilgiler toplanıyor...")
+        parse_started = time.perf_counter()
+        general_info = extract_general_info(snapshot, place_name, metrics, extraction_tier, field_misses)
+        print(f"Genel bilgiler {time.perf_counter() - parse_started:.2f} sn içinde ayrıştırıldı (DOM görüntüsü: {metrics.phases['snapshot']['seconds']:.2f} sn)")
+        
+        # Görüntüde bulunamayan alanlar için canlı sayfada butonlara tıkla (yalnızca thorough katmanında)
+        if extraction_tier == "thorough":
+            metrics.begin("general_info_fallback")
+            await fill_missing_general_info(page, general_info)
+        
+        if place_cache and place_id and place_name != "Bilinmeyen_Mekan":
+            place_cache.put(place_id, place_name, general_info)
+    
+    # Genel bilgileri kaydet
+    metrics.begin("save")
+    write_general_info(folder_path, general_info)
+    sinks = []
+    scraped_at = datetime.now().replace(microsecond=0)
+    output_key = place_key or slugify(place_name)
+    if dataset:
+        dataset.write_place(output_key, session_id, url, general_info, scraped_at)
+        sinks.append(dataset.review_writer(output_key, session_id, url, scraped_at))
+    if store:
+        store.write_place(output_key, url, general_info, scraped_at)
+        sinks.append(store.review_writer(output_key, session_id, scraped_at))
+    print("Genel bilgiler kaydedildi.")
+    
+    # Yorumlar ayrıştırıldıkça diske yazılır
+    writer = ReviewWriter(folder_path, jsonl=write_jsonl, checkpoint=checkpoint, sinks=sinks)
+    if store and resume:
+        known_ids = store.review_ids(output_key)
+        writer.seen |= known_ids
+        print(f"Veritabanında {len(known_ids)} kayıtlı yorum var, bunlar atlanacak")
+    
+    # "Son çalıştırmadan beri" modunda önceki çalıştırmanın en yeni yorumları işaret olarak kullanılır
+    watermarks = (store or WatermarkStore()) if since_last_run and place_key else None
+    watermark_ids = watermarks.get(place_key) if watermarks else set()
+    if watermarks:
+        print(f"Son çalıştırma işareti: {len(watermark_ids)} yorum kimliği" if watermark_ids else "Bu mekan için işaret yok, tüm yorumlar çekilecek")
+    
+    if collector:
+        collector.bind(writer, stop_ids=watermark_ids or None)
+    
+    # ===== Yorumlar sekmesine git =====
+    metrics.begin("review_tab")
+    reviews_failed = False
+    watermark_reached = False
+    blocked = None
+    try:
+        # Yorumlar sekmesini bul ve tıkla
+        if not await open_reviews_tab(page):
+            print("Yorumlar sekmesi bulunamadı, ana sayfada devam ediliyor.")
+        # Sekme tıklaması trafik sınırına veya captcha'ya takıldıysa kaydırmaya hiç başlama
+        await check_page_state(page, url, phase="review_tab", allow_consent=False)
+        
+        # Ekran görüntüsü al (debug için)
+        await artifacts.screenshot(page, "reviews_tab")
+        
+        # ===== Yorumları topla =====
+        sort_label = SORT_OPTIONS.get(sort_by, SORT_OPTIONS['newest'])['label']
+        print(f"Yorumlar toplanıyor... ({max_reviews} yorum hedefleniyor, sıralama: {sort_label})")
+        
+        if len(sort_orders) > 1:
+            # Her sıralama kendi sayfasında kaydırılır; sıralama seçimi de parçaların içinde yapılır
+            metrics.begin("scroll")
+            await scrape_review_shards(page, url, sort_orders, max_reviews, writer, metrics, extraction_tier, review_misses,
+                                       extraction_mode)
+            sort_by_newest_tried = False
+        else:
+            # İstenen sıralamayı seç; bilinen yorumda durma yalnızca en yeni sıralamada güvenli
+            metrics.begin("sort")
+            sort_by_newest_tried = await select_sort(page, sort_by) and sort_by == "newest"
             
-            # Butonu bulamadıysak, direkt sayfada saatleri arayalım
-            if not hours_button:
-                today_pattern = r'(Bugün|Today).*?(\d{1,2}[:.]\d{2}).*?[-–].*?(\d{1,2}[:.]\d{2})'
-                page_text = page.content().lower()
-                today_match = re.search(today_pattern, page_text)
-                if today_match:
-                    today_hours = f"Bugün: {today_match.group(2)} - {today_match.group(3)}"
-                    print(f"Bugünün çalışma saati bulundu: {today_hours}")
-                    hours_text = today_hours
-                    days_info = {"Bugün": f"{today_match.group(2)} - {today_match.group(3)}"}
-            
-            # Bulunan butona tıklayarak detaylı saatleri al
-            full_schedule_found = False
-            if hours_button and not hours_text:
-                try:
-                    hours_button.click(timeout=3000)
-                    time.sleep(2)
-                    
-                    # Çalışma saatleri popupını bul
-                    for panel_selector in [
-                        'div[role="dialog"]',
-                        'div.m6QErb.tLjsW.eKbjU',
-                        'table[class*="WgFkxc"]',
-                        'div[aria-label*="Çalışma saatleri"]',
-                        'div.OMl5r',
-                        'div[role="dialog"] table',
-                        'div[jsaction*="modal"]'
-                    ]:
-                        try:
-                            panel = page.locator(panel_selector).first
-                            if panel:
-                                panel_content = panel.text_content().strip()
-                                if ("pazartesi" in panel_content.lower() or "salı" in panel_content.lower() or
-                                    "monday" in panel_content.lower() or "tuesday" in panel_content.lower()):
-                                    
-                                    # Haftanın her günü için saatleri bul
-                                    days = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar",
-                                            "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-                                    
-                                    days_pattern = '|'.join(days)
-                                    day_matches = re.findall(rf'({days_pattern})[\s:]*([^a-zA-Z\n]+)', panel_content, re.IGNORECASE)
-                                    
-                                    if day_matches:
-                                        for day, hours in day_matches:
-                                            # Saatleri temizle
-                                            hours = re.sub(r'\s+', ' ', hours).strip()
-                                            
-                                            # Gün adını Türkçe'ye standardize et
-                                            day_map = {
-                                                "Monday": "Pazartesi", "Tuesday": "Salı", "Wednesday": "Çarşamba",
-                                                "Thursday": "Perşembe", "Friday": "Cuma", "Saturday": "Cumartesi", "Sunday": "Pazar"
-                                            }
-                                            
-                                            tr_day = day_map.get(day, day)
-                                            days_info[tr_day] = hours
-                                        
-                                        # Tüm günleri sıralı şekilde birleştir
-                                        ordered_days = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
-                                        hours_parts = []
-                                        
-                                        for day in ordered_days:
-                                            if day in days_info:
-                                                hours_parts.append(f"{day}: {days_info[day]}")
-                                        
-                                        if hours_parts:
-                                            hours_text = "\n".join(hours_parts)
-                                            full_schedule_found = True
-                                            print("Çalışma saatleri tüm günler için alındı")
-                                    
-                                    # Pattern bulamazsa, ham metni kullan
-                                    if not full_schedule_found:
-                                        hours_text = panel_content
-                                        print("Çalışma saatleri ham metin olarak alındı")
-                                    
-                                    # Dialogu kapat
-                                    page.keyboard.press("Escape")
-                                    break
-                        except Exception as e:
-                            print(f"Panel içeriği alınırken hata: {e}")
-                            continue
-                except Exception as e:
-                    print(f"Çalışma saatleri butonuna tıklamada hata: {e}")
-            
-            # Hala bulunamadıysa, özel formatları kontrol et
-            if not hours_text:
-                # Sayfa içerisinde çalışma saatleri bilgisini içeren bölüm var mı diye arat
-                for selector in [
-                    'div:has-text("Pazartesi") ~ div',
-                    'div:has-text("Monday") ~ div',
-                    'div:has-text("Çalışma saatleri") ~ div',
-                    'div[class*="hour"]',
-                    'div[jslog*="hours"]',
-                    'table:has(tr:has-text("Pazartesi"))',
-                    'table:has(tr:has-text("Monday"))'
-                ]:
-                    try:
-                        elements = page.locator(selector).all()
-                        for element in elements:
-                            text = element.text_content().strip()
-                            # Hem gün adı hem de saat içeriyor mu kontrol et
-                            if (("pazartesi" in text.lower() or "monday" in text.lower()) and
-                                (":" in text) and len(text) > 20):
-                                hours_text = text
-                                print("Çalışma saatleri sayfa içinden alındı")
-                                break
-                        if hours_text:
-                            break
-                    except Exception as e:
-                        print(f"Çalışma saatleri elemanı araması sırasında hata: {e}")
-                        continue
+            # Yorum akışını kart sayısı artışına göre kaydırarak yükle
+            # En yeni sıralamada bilinen bir yoruma ulaşınca daha eskiler de bilinir; kaydırmayı orada kes
+            stop_ids = None
+            if sort_by_newest_tried:
+                if watermark_ids:
+                    stop_ids = watermark_ids
+                elif resume and writer.seen:
+                    stop_ids = writer.seen
+            elif watermark_ids:
+                print("En yeni sıralama uygulanamadı, işaret kullanılmadan tüm yorumlar çekilecek")
+                watermark_ids = set()
+                if collector:
+                    collector.stop_ids = None
             
-            # Çalışma saatlerini düzenle
-            if hours_text:
-                # Gereksiz boşlukları temizle
-                hours_text = re.sub(r'\s+', ' ', hours_text)
+            heap = HeapMonitor()
+            await heap.attach(page)
+            metrics.begin("scroll")
+            if extraction_mode == "stream":
+                # Kaydırma ve çıkarım iç içe: kartlar geldikçe yazılır ve sayfada boşaltılır
+                stream_stats = await stream_reviews(page, max_reviews, writer, stop_ids=stop_ids, heap=heap,
+                                                    tier=extraction_tier, misses=review_misses)
+                print(f"Akış modunda {stream_stats['extracted']} kart işlendi, {stream_stats['new']} yorum yazıldı")
+                watermark_reached = bool(watermark_ids) and stream_stats['reached_known']
                 
-                # Saatleri daha okunabilir hale getir
-                if not full_schedule_found:  # Eğer tam düzenli format elde edemediyse
-                    days = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar",
-                            "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-                    
-                    for day in days:
-                        hours_text = re.sub(rf'({day})', r'\n\1', hours_text, flags=re.IGNORECASE)
+                metrics.begin("debug_artifacts")
+                await artifacts.page_source(page)
+            else:
+                await load_reviews(page, max_reviews, stop_ids=stop_ids)
+                await heap.sample(await page.locator(REVIEW_COUNT_SELECTOR).count())
                 
-                # Başındaki gereksiz boşlukları temizle
-                hours_text = hours_text.strip()
+                # "Daha fazla" butonlarını yorum başına tıklamak yerine hepsini tek seferde aç
+                metrics.begin("expand")
+                await expand_reviews(page)
                 
-                general_info['Calisma_Saatleri'] = [hours_text]
-                print(f"Çalışma saatleri kaydedildi ({len(hours_text)} karakter)")
+                # Debug için HTML kaydı
+                metrics.begin("debug_artifacts")
+                await artifacts.page_source(page)
+                
+                # Yorumları çıkar (her yorum ayrıştırıldığı anda yazılır)
+                metrics.begin("extraction")
+                extraction_stats = {}
+                if extraction_mode == "network":
+                    await extract_reviews_network(page, collector, max_reviews, writer, stop_ids=watermark_ids,
+                                                  tier=extraction_tier, misses=review_misses, stats=extraction_stats)
+                    watermark_reached = collector.reached_watermark
+                elif extraction_mode == "batch":
+                    await extract_reviews_batch(page, max_reviews, writer, stop_ids=watermark_ids,
+                                                tier=extraction_tier, misses=review_misses, stats=extraction_stats)
+                else:
+                    await extract_reviews_with_locators(page, max_reviews, writer, stop_ids=watermark_ids, stats=extraction_stats)
+                watermark_reached = watermark_reached or extraction_stats.get('reached_known', False)
+            
+            # JS heap ölçümleri run_metrics.json'a yazılır
+            metrics.extra['heap'] = heap.summary()
+            if heap.samples:
+                print(f"JS heap tepe değeri {metrics.extra['heap']['peak_heap_mb']} MB, DOM düğümü tepe değeri {metrics.extra['heap']['peak_nodes']}")
+        
+        # İşareti akışın en üstündeki (en yeni) yorumlarla güncelle; max_reviews eski işarete varmadan
+        # kestiyse eski işaret kalır, aradaki yorumlar sonraki çalıştırmada çekilir
+        metrics.begin("save")
+        if watermarks and sort_by_newest_tried:
+            if watermark_complete(watermark_ids, writer.count, max_reviews, watermark_reached):
+                watermarks.update(place_key, await loaded_review_ids(page))
             else:
-                general_info['Calisma_Saatleri'] = ["Belirtilmemiş"]
-                print("Çalışma saatleri bulunamadı")
-        except Exception as e:
-            print(f"Çalışma saatleri alınamadı: {e}")
-            general_info['Calisma_Saatleri'] = ["Hata: Alınamadı"]
+                print(f"{max_reviews} yorum sınırı son çalıştırma işaretine ulaşmadan doldu, işaret ilerletilmedi")
         
-        # Web sitesi al (ana sayfadan)
-        try:
-            for selector in [
-                'a[data-tooltip="Web sitesi"]', 
-                'a[aria-label*="web"]',
-                'div:has-text("Web sitesi") ~ div a',
-                'a:has-text("Web sitesi")',
-                'a[href*="http"]:not([href*="google"])',
-                'a[jsaction*="website"]',
-                'div[jsaction*="website"] a'
-            ]:
-                try:
-                    elements = page.locator(selector).all()
-                    for element in elements:
-                        text = element.text_content().strip()
-                        href = element.get_attribute("href")
-                        if (text and ("http" in text.lower() or "www" in text.lower() or ".com" in text.lower() or ".net" in text.lower())) or (href and ("http" in href.lower() and "google" not in href.lower())):
-                            website = text or href
-                            # Google Translate URL'lerini filtrele
-                            if "translate.google.com" not in website:
-                                general_info['Web_Sitesi'] = [website]
-                                print(f"Web sitesi: {website}")
-                                break
-                    if general_info['Web_Sitesi'] != [""]:
-                        break
-                except:
+        if writer.count:
+            print(f"Toplam {writer.count} yorum kaydedildi.")
+        elif watermark_ids:
+            print("Son çalıştırmadan beri yeni yorum yok.")
+        elif writer.skipped:
+            print(f"Yeni yorum yok ({writer.skipped} yorum zaten kayıtlı).")
+        else:
+            writer.write({
+                'Kullanici': 'Yorum bulunamadı',
+                'Tarih': '',
+                'Puan': '',
+                'Yorum': 'Yorumlar çekilemedi',
+                'Yorum_ID': ''
+            }, placeholder=True)
+            print("Yorum bulunamadı.")
+            reviews_failed = True
+    except Exception as e:
+        print(f"Yorumlar toplanırken hata oluştu: {e}")
+        reviews_failed = True
+        if isinstance(e, PageStateError):
+            blocked = e
+        writer.write({
+            'Kullanici': 'Hata',
+            'Tarih': '',
+            'Puan': '',
+            'Yorum': f'Hata: {str(e)}',
+            'Yorum_ID': ''
+        }, placeholder=True)
+    finally:
+        metrics.begin("save")
+        writer.close()
+    
+    # Tamamlandı; yorumlar çekilemediyse (on_error politikasında da) sayfanın son hâlini kaydet
+    metrics.begin("debug_artifacts")
+    if reviews_failed:
+        await artifacts.capture_error(page)
+    await artifacts.screenshot(page, "ekran_goruntusu_son")
+    await artifacts.wait()
+    
+    # Ölçümleri yorumlar.csv'nin yanına kaydet
+    if field_misses or review_misses:
+        print(f"Birincil seçicilerin ıskaladığı alanlar: {', '.join(field_misses) or '-'}; yorum alanları: {dict(review_misses) or '-'}")
+    metrics.extra.update({'url': url, 'place_name': place_name, 'extraction_mode': extraction_mode, 'extraction_tier': extraction_tier,
+                          'extraction_misses': {'general_info': field_misses, 'reviews': dict(review_misses)}, 'review_count': writer.count,
+                          'page_state': blocked.state if blocked else state, 'place_id': place_id, 'general_info_cached': bool(cached)})
+    run_metrics = metrics.save(folder_path)
+    if prometheus:
+        prometheus.add(place_key or folder_path, run_metrics, writer.count)
+    
+    print(f"\nTüm veriler {folder_path} klasörüne kaydedildi.")
+    
+    result = {
+        'url': url,
+        'place_id': place_id,
+        'place_key': place_key,
+        'place_name': place_name,
+        'folder_path': folder_path,
+        'review_count': writer.count,
+        'metrics': run_metrics
+    }
+    if blocked:
+        # Genel bilgiler kaydedildi ama yorumlar engellendi; toplu çekim bunu hatalı sayar ve geri çekilir
+        result.update({'error': str(blocked), 'page_state': blocked.state})
+    return result
+
+
+def read_url_file(path):
+    """txt, CSV veya JSONL dosyasından mekan URL'lerini oku"""
+    ext = os.path.splitext(path)[1].lower()
+    urls = []
+    
+    with open(path, encoding="utf-8") as f:
+        if ext == ".csv":
+            rows = [row for row in csv.reader(f) if row]
+            if not rows:
+                return urls
+            # Başlıkta "url" sütunu varsa onu, yoksa ilk sütunu kullan
+            header = [cell.strip().lower() for cell in rows[0]]
+            if "url" in header:
+                column = header.index("url")
+                rows = rows[1:]
+            else:
+                column = 0
+                if not rows[0][0].strip().startswith("http"):
+                    rows = rows[1:]
+            urls = [row[column].strip() for row in rows if len(row) > column and row[column].strip()]
+        elif ext in (".jsonl", ".ndjson"):
+            for line in f:
+                line = line.strip()
+                if not line:
                     continue
-        except Exception as e:
-            print(f"Web sitesi alınamadı: {e}")
-        
-        # Genel bilgileri kaydet
-        pd.DataFrame(general_info).to_csv(os.path.join(folder_path, 'genel_bilgiler.csv'), index=False)
-        print("Genel bilgiler kaydedildi.")
-        
-        # ===== Yorumlar sekmesine git =====
+                record = json.loads(line)
+                url = record.get("url") if isinstance(record, dict) else record
+                if url:
+                    urls.append(url.strip())
+        else:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    urls.append(line)
+    
+    return urls
+
+# Mekan bağlantısındaki özellik kimliği ("!1s0x...:0x..." veya ftid=0x...:0x...); ikinci yarısı mekanın CID'sidir
+PLACE_FEATURE_ID_PATTERN = re.compile(r'(?:!1s|[?&]ftid=)(0x[0-9a-f]+):(0x[0-9a-f]+)', re.IGNORECASE)
+# Doğrudan CID içeren bağlantılar (maps?cid=..., ludocid=...)
+PLACE_CID_PATTERN = re.compile(r'[?&](?:cid|ludocid)=(\d+)')
+
+def canonical_place_id(url):
+    """Bağlantıdaki özellik kimliğinden veya CID'den "cid:<sayı>" biçiminde kanonik mekan kimliği üret; yoksa None
+
+    Aynı mekanın farklı biçimlerdeki bağlantıları (arama parametreleri, yakınlaştırma, dil) aynı kimliğe çıkar.
+    """
+    url = unquote(url or "")
+    match = PLACE_FEATURE_ID_PATTERN.search(url)
+    if match:
+        return f"cid:{int(match.group(2), 16)}"
+    match = PLACE_CID_PATTERN.search(url)
+    if match:
+        return f"cid:{int(match.group(1))}"
+    return None
+
+def place_storage_key(place_id, place_name):
+    """Kontrol noktası, işaret, SQLite place_id ve Parquet place= bölümü için mekan anahtarı
+
+    Aynı adlı şubeler (ör. iki "Starbucks") çakışmasın diye kanonik kimlikten ("cid-<sayı>") üretilir; kimlik
+    yoksa mekan adının slug'ı, ad da bulunamadıysa None döner.
+    """
+    if place_id:
+        return slugify(place_id)
+    return slugify(place_name) if place_name != "Bilinmeyen_Mekan" else None
+
+def dedupe_place_urls(urls):
+    """Aynı mekana çıkan bağlantıları ilk geçtiği sırayla tek bağlantıya indir (kimliği çıkmayanlar URL'ye göre)"""
+    unique = {}
+    for url in urls:
+        unique.setdefault(canonical_place_id(url) or url, url)
+    if len(unique) < len(urls):
+        print(f"{len(urls) - len(unique)} tekrarlanan mekan bağlantısı birleştirildi")
+    return list(unique.values())
+
+def scrape_batch(path, max_reviews=100, sort_by="newest", concurrency=4, **options):
+    """Dosyadaki tüm mekan URL'lerini eşzamanlı çek (async motorun senkron sarmalayıcısı)"""
+    return asyncio.run(scrape_batch_async(path, max_reviews, sort_by, concurrency, **options))
+
+# ===== Uyarlanabilir eşzamanlılık ve hız sınırı =====
+
+# Hız sınırına tabi istekler: mekan sayfası açılışları ve kaydırmanın tetiklediği yorum yüklemeleri
+SCHEDULED_REQUEST_PATTERN = re.compile(r'/maps/place/|/maps/rpc/listugcposts|/maps/preview/review/listentitiesreviews')
+# Engelde yarıya inen hız sınırının en düşük oranı ve her başarılı mekanla geri kazanılan oran
+RATE_SCALE_MIN = 0.1
+RATE_SCALE_STEP = 0.05
+# Bu durumlarla biten mekanlar yeniden denenmez (tekrar açmak aynı sonucu verir)
+NO_RETRY_STATES = (PAGE_STATE_NOT_FOUND, PAGE_STATE_CONSENT)
+
+class TokenBucket:
+    """Saniyede rate jeton dolan, en fazla burst jeton biriktiren kova; jeton yoksa acquire bekler"""
+    
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.waited = 0.0
+    
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+
+class AimdLimiter:
+    """Eşzamanlı mekan sayısını AIMD ile ayarlayan sınırlayıcı
+    
+    Her başarılı mekan sınırı 1/sınır artırır (tam bir tur başarı +1); yavaş açılış veya engel sınırı
+    decrease ile çarpar. Bir düşüşten sonraki cooldown saniye içindeki sinyaller aynı tıkanıklık sayılır.
+    """
+    
+    def __init__(self, initial=4, minimum=1, maximum=8, decrease=0.5, cooldown=10.0):
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.active = 0
+        self.last_decrease = None
+        self.condition = asyncio.Condition()
+        self.peak = self.limit
+        self.decreases = 0
+    
+    async def acquire(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.active < int(self.limit))
+            self.active += 1
+    
+    async def release(self, outcome):
+        """outcome: 'ok' sınırı artırır, 'slow' ve 'blocked' düşürür, diğerleri değiştirmez; düştüyse True döndür"""
+        decreased = False
+        async with self.condition:
+            self.active -= 1
+            now = time.monotonic()
+            if outcome == "ok":
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self.peak = max(self.peak, self.limit)
+            elif outcome in ("slow", "blocked") and (self.last_decrease is None or now - self.last_decrease >= self.cooldown):
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self.last_decrease = now
+                self.decreases += 1
+                decreased = True
+                print(f"Eşzamanlılık sınırı {self.limit:.1f} değerine düşürüldü ({outcome})")
+            self.condition.notify_all()
+        return decreased
+
+class AdaptiveScheduler:
+    """scrape_google_maps_async etrafında host başına hız sınırı, AIMD eşzamanlılık ve titreşimli yeniden deneme
+    
+    rate: host başına saniyedeki mekan açılışı ve yorum yüklemesi (token bucket, istekler context.route ile
+    kovadan geçer). Sayfa açılışı slow_seconds'tan uzun sürerse veya captcha/trafik sınırı gelirse eşzamanlılık
+    düşer; engelde hız sınırı da yarıya iner ve başarılı mekanlarla yavaşça rate'e geri döner. Hatalı mekanlar en fazla max_attempts kez, [0, retry_base * 2^deneme] aralığında rastgele
+    beklemeyle yeniden denenir. Bekleyen denemeler eşzamanlılık payı tutmaz.
+    """
+    
+    def __init__(self, rate=2.0, burst=None, concurrency=4, max_concurrency=None, slow_seconds=15.0,
+                 max_attempts=3, retry_base=5.0, retry_max=120.0):
+        self.rate = rate
+        self.rate_scale = 1.0
+        self.burst = burst
+        self.buckets = {}
+        self.limiter = AimdLimiter(initial=concurrency, maximum=max_concurrency or concurrency * 2)
+        self.backoff = BlockBackoff()
+        self.slow_seconds = slow_seconds
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.contexts = weakref.WeakSet()
+        # Sayfa başına isteklerin bu zamanlayıcının kovasında beklediği süre (yavaş host sayılmasın diye)
+        self.page_waits = weakref.WeakKeyDictionary()
+        self.stats = {'ok': 0, 'slow': 0, 'blocked': 0, 'failed': 0, 'retries': 0}
+    
+    @property
+    def max_concurrency(self):
+        return self.limiter.maximum
+    
+    def _bucket(self, host):
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate * self.rate_scale, self.burst)
+        return self.buckets[host]
+    
+    def _scale_rate(self, scale):
+        self.rate_scale = max(RATE_SCALE_MIN, min(1.0, scale))
+        for bucket in self.buckets.values():
+            bucket.rate = self.rate * self.rate_scale
+    
+    async def install(self, context):
+        """Context'in hız sınırına tabi isteklerini kovadan geçir (context başına bir kez)"""
+        if context in self.contexts:
+            return
+        self.contexts.add(context)
+        await context.route(SCHEDULED_REQUEST_PATTERN, self._throttle)
+    
+    async def _throttle(self, route):
+        started = time.monotonic()
+        await self._bucket(urlparse(route.request.url).hostname).acquire()
         try:
-            # Yorumlar sekmesini bul ve tıkla
-            review_tab_clicked = False
-            for selector in [
-                'button[data-tab-index="1"]',
-                'button:has-text("Yorumlar")',
-                'button:has-text("Değerlendirmeler")',
-                'button:has-text("Reviews")',
-                'div[role="tab"]:has-text("Yorum")',
-                'div[role="tablist"] > div:nth-child(2)'
-            ]:
-                try:
-                    elements = page.locator(selector).all()
-                    for element in elements:
-                        if "yorum" in element.text_content().lower() or "değerlendirme" in element.text_content().lower() or "review" in element.text_content().lower():
-                            element.click(timeout=5000)
-                            review_tab_clicked = True
-                            print("Yorumlar sekmesine tıklandı")
-                            time.sleep(3)
-                            break
-                    if review_tab_clicked:
-                        break
-                except:
-                    continue
-            
-            if not review_tab_clicked:
-                print("Yorumlar sekmesi bulunamadı, ana sayfada devam ediliyor.")
-            
-            # Ekran görüntüsü al (debug için)
-            page.screenshot(path=os.path.join(folder_path, "reviews_tab.png"), full_page=True)
-            
-            # ===== Yorumları topla =====
-            reviews = []
-            print(f"Yorumlar toplanıyor... ({max_reviews} yorum hedefleniyor, sıralama: en yeni)")
-            
-            # "En yeni" sıralamayı bul ve seç - garantilemek için daha detaylı yaklaşım
-            sort_by_newest_tried = False
+            page = route.request.frame.page
+            self.page_waits[page] = self.page_waits.get(page, 0.0) + time.monotonic() - started
+        except:
+            pass
+        # Kaynak engelleme gibi context'e daha önce bağlanmış kurallar da çalışsın
+        await route.fallback()
+    
+    def take_wait(self, page):
+        """page'in istekleri için kovada beklenen toplam süreyi döndür ve sıfırla"""
+        page = page._target if isinstance(page, MeteredObject) else page
+        return self.page_waits.pop(page, 0.0)
+    
+    def _outcome(self, result):
+        if result.get('page_state') in PAGE_BACKOFF_STATES:
+            return "blocked"
+        if 'error' in result:
+            return "failed"
+        metrics = result.get('metrics', {})
+        # Açılışın kendi kovamızda sırada beklediği kısmı hostun yavaşlığı değildir
+        goto_seconds = metrics.get('phases', {}).get('goto', {}).get('seconds', 0) - metrics.get('goto_rate_wait_seconds', 0)
+        return "slow" if goto_seconds > self.slow_seconds else "ok"
+    
+    def retry_delay(self, attempt):
+        """Tam titreşimli üstel bekleme (aynı anda engellenen mekanlar aynı anda geri dönmesin)"""
+        return random.uniform(0, min(self.retry_max, self.retry_base * 2 ** attempt))
+    
+    async def run(self, url, max_reviews=100, sort_by="newest", **options):
+        """Mekanı sırası gelince çek; engel veya hata durumunda titreşimli beklemeyle yeniden dene"""
+        for attempt in range(self.max_attempts):
+            await self.backoff.wait()
+            await self.limiter.acquire()
             try:
-                # Önce sıralama butonunu bul (birkaç kez deneyeceğiz)
-                for attempt in range(3):
-                    sort_button_found = False
-                    
-                    for selector in [
-                        'button[aria-label*="Sıralama"]',
-                        'button:has-text("Sırala")',
-                        'button[aria-controls*="sort"]',
-                        'button:has-text("Sort")',
-                        'button[jsaction*="sort"]',
-                        'div[role="button"]:has-text("Alakalı")',
-                        'div[role="button"]:has-text("sırala")'
-                    ]:
-                        try:
-                            sort_buttons = page.locator(selector).all()
-                            for sort_button in sort_buttons:
-                                try:
-                                    text = sort_button.text_content().lower()
-                                    if "sıra" in text or "sort" in text or "alak" in text or "en y" in text:
-                                        sort_button.click(timeout=3000)
-                                        sort_button_found = True
-                                        print(f"Sıralama butonu bulundu ve tıklandı: '{text}'")
-                                        time.sleep(2)
-                                        break
-                                except Exception as e:
-                                    print(f"Sıralama butonuna tıklamada hata: {e}")
-                                    continue
-                            
-                            if sort_button_found:
-                                break
-                        except:
-                            continue
-                    
-                    if sort_button_found:
-                        # Sıralama menüsü açıldı, şimdi "En yeni" seçeneğini bul
-                        newest_option_found = False
-                        
-                        for newest_selector in [
-                            'div[role="menuitem"]:has-text("En yeni")',
-                            'div[role="menuitem"]:has-text("Yeni")',
-                            'div[role="menuitem"]:has-text("Newest")',
-                            'div[role="menuitem"]:has-text("Most recent")',
-                            'div[role="menuitem"]:has-text("Recent")'
-                        ]:
-                            try:
-                                options = page.locator(newest_selector).all()
-                                for option in options:
-                                    try:
-                                        option_text = option.text_content().lower()
-                                        if "yeni" in option_text or "recent" in option_text or "newest" in option_text:
-                                            option.click(timeout=3000)
-                                            newest_option_found = True
-                                            sort_by_newest_tried = True
-                                            print(f"EN YENİ sıralama seçildi: '{option_text}'")
-                                            time.sleep(3)  # Yorumların yeniden yüklenmesi için daha uzun bekle
-                                            break
-                                    except:
-                                        continue
-                                
-                                if newest_option_found:
-                                    break
-                            except:
-                                continue
-                        
-                        if newest_option_found:
-                            break
-                        else:
-                            # Menu açıldı ama en yeni bulunamadı, menüyü kapat ve tekrar dene
-                            page.keyboard.press("Escape")
-                            time.sleep(1)
-                    
-                    # Bulunamadıysa biraz bekle ve sayfayı tazele
-                    if attempt < 2:  # Son denemede değilsek
-                        page.mouse.wheel(0, 300)  # Biraz aşağı kaydır
-                        time.sleep(2)
-                
-                if not sort_by_newest_tried:
-                    print("En yeni sıralama seçeneği bulunamadı, varsayılan sıralama kullanılıyor")
+                result = await scrape_google_maps_async(url, max_reviews, sort_by, scheduler=self, **options)
             except Exception as e:
-                print(f"Sıralama işlemi sırasında hata: {e}")
-            
-            # Daha fazla scroll yapmak için dinamik sayıda döngü
-            # 200 yorum için daha fazla scroll
-            scroll_count = max(40, int(max_reviews / 3))  # Her scroll'da ortalama 3 yorum yüklendiğini varsayalım
-            
-            # Scroll yaparak daha fazla yorum yükle
-            print(f"Yorumları yüklemek için {scroll_count} kez kaydırma yapılacak...")
+                print(f"Mekan çekilemedi ({url}): {e}")
+                result = {'url': url, 'error': str(e)}
+                if isinstance(e, PageStateError):
+                    result['page_state'] = e.state
+            outcome = self._outcome(result)
+            self.stats[outcome] += 1
+            if await self.limiter.release(outcome) and outcome == "blocked":
+                self._scale_rate(self.rate_scale * 0.5)
+            elif outcome == "ok" and self.rate_scale < 1.0:
+                self._scale_rate(self.rate_scale + RATE_SCALE_STEP)
+            self.backoff.record(result)
             
-            # Yorumları yüklemek için scroll yapma
-            for i in tqdm(range(scroll_count)):
-                page.mouse.wheel(0, 1000)
-                time.sleep(0.3)
-                
-                # Her 5 scroll'da bir daha uzun bekle
-                if i % 5 == 4:
-                    time.sleep(1)
-                
-                # Her 10 scroll'da bir kontrol et, eğer yeterli yorum yüklenmişse erken çık
-                if i > 0 and i % 10 == 0:
-                    try:
-                        review_count = len(page.locator('div.jftiEf, div[data-review-id], div[jslog*="review"]').all())
-                        print(f"Şu ana kadar {review_count} yorum yüklendi")
-                        if review_count >= max_reviews * 1.2:  # Biraz fazladan yorum yükleyelim (bazıları filtreleneceği için)
-                            print(f"Yeterli yorum yüklendi, scroll işlemi sonlandırılıyor")
-                            break
-                    except:
-                        pass
-            
-            # Son bir scroll daha yap ve bekle
-            page.mouse.wheel(0, 500)
-            time.sleep(3)
-            
-            # Yorumları bul
-            review_elements = []
-            
-            for selector in [
-                'div.jftiEf',
-                'div[data-review-id]',
-                'div[jsaction*="reviewActionsGroup"]',
-                'div[jslog*="review"]',
-                'div.fontBodyMedium[style*="line-height"]',
-                'div[class*="review"]',
-                '[jsinstance*="review"]',
-                'div[data-hveid]'
-            ]:
+            if outcome in ("ok", "slow") or result.get('page_state') in NO_RETRY_STATES or attempt == self.max_attempts - 1:
+                result['attempts'] = attempt + 1
+                return result
+            delay = self.retry_delay(attempt)
+            self.stats['retries'] += 1
+            print(f"{url} {delay:.1f} sn sonra yeniden denenecek ({attempt + 2}/{self.max_attempts})")
+            await asyncio.sleep(delay)
+    
+    def summary(self):
+        return {
+            **self.stats,
+            'concurrency_limit': round(self.limiter.limit, 2),
+            'concurrency_peak': round(self.limiter.peak, 2),
+            'concurrency_decreases': self.limiter.decreases,
+            'rate_per_host': round(self.rate * self.rate_scale, 2),
+            'rate_wait_seconds': round(sum(bucket.waited for bucket in self.buckets.values()), 2)
+        }
+    
+    def print_summary(self):
+        summary = self.summary()
+        print(f"Zamanlayıcı: {summary['ok']} başarılı, {summary['slow']} yavaş, {summary['blocked']} engellendi, "
+              f"{summary['failed']} hatalı, {summary['retries']} yeniden deneme; eşzamanlılık sınırı {summary['concurrency_limit']} "
+              f"(en yüksek {summary['concurrency_peak']}, {summary['concurrency_decreases']} düşüş), "
+              f"hız sınırı {summary['rate_per_host']} istek/sn, bekleme {summary['rate_wait_seconds']} sn")
+
+def print_page_states(failed):
+    """Hatalı sonuçlardan sayfa durumu algılananları (captcha, trafik sınırı, ...) durum başına say"""
+    states = collections.Counter(result['page_state'] for result in failed if 'page_state' in result)
+    if states:
+        print("Sayfa durumu nedeniyle bırakılanlar: " + ", ".join(f"{PAGE_STATE_LABELS[state]} {count}" for state, count in states.items()))
+
+async def scrape_batch_async(path, max_reviews=100, sort_by="newest", concurrency=4, headless=False,
+                             context_max_uses=20, storage_state=None, rate=None, max_concurrency=None, **options):
+    """Dosyadaki tüm mekan URL'lerini tek tarayıcıyı paylaşan, ısınmış context havuzundan kiralanan sayfalarla çek
+    
+    rate verilirse sabit eşzamanlılık yerine AdaptiveScheduler kullanılır: concurrency başlangıç değeridir,
+    sınır max_concurrency'ye (varsayılan: 2 x concurrency) kadar çıkabilir.
+    """
+    urls = dedupe_place_urls(read_url_file(path))
+    scheduler = AdaptiveScheduler(rate, concurrency=concurrency, max_concurrency=max_concurrency) if rate else None
+    if scheduler:
+        print(f"{len(urls)} mekan bağlantısı okundu, uyarlanabilir zamanlayıcı ile çekilecek "
+              f"(host başına {rate} istek/sn, eşzamanlılık {concurrency} -> en fazla {scheduler.max_concurrency})")
+    else:
+        print(f"{len(urls)} mekan bağlantısı okundu, {concurrency} eşzamanlı sayfa ile çekilecek")
+    
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    backoff = BlockBackoff()
+    progress = tqdm(total=len(urls), desc="Mekanlar")
+    
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        pool = ContextPool(browser, size=scheduler.max_concurrency if scheduler else max(1, concurrency), max_uses=context_max_uses,
+                           storage_state=storage_state, block_resources=options.pop('block_resources', None))
+        
+        async def run(url):
+            if scheduler:
+                result = await scheduler.run(url, max_reviews, sort_by, pool=pool, **options)
+                progress.update(1)
+                return result
+            async with semaphore:
+                await backoff.wait()
                 try:
-                    found_elements = page.locator(selector).all()
-                    if found_elements and len(found_elements) > 0:
-                        print(f"{len(found_elements)} potansiyel yorum elementi bulundu: {selector}")
-                        
-                        # İçerik kontrolü yap
-                        valid_elements = []
-                        for elem in found_elements:
-                            try:
-                                # Yorum içeriği kontrolü
-                                content = elem.text_content()
-                                # Yıldız değeri kontrolü
-                                has_star = elem.locator('span[role="img"], span[aria-label*="yıldız"], div[role="img"]').count() > 0
-                                
-                                if has_star and len(content) > 50:  # Mantıklı bir içerik mi?
-                                    valid_elements.append(elem)
-                            except:
-                                pass
-                        
-                        if len(valid_elements) > 5:  # Yeterince yorum bulduk mu?
-                            review_elements = valid_elements
-                            break
+                    result = await scrape_google_maps_async(url, max_reviews, sort_by, pool=pool, **options)
                 except Exception as e:
-                    print(f"Yorum elementleri aranırken hata: {e}")
-            
-            # Debug için HTML kaydı
+                    print(f"Mekan çekilemedi ({url}): {e}")
+                    result = {'url': url, 'error': str(e)}
+                    if isinstance(e, PageStateError):
+                        result['page_state'] = e.state
+                backoff.record(result)
+                progress.update(1)
+                return result
+        
+        try:
+            results = await asyncio.gather(*(run(url) for url in urls))
+        finally:
+            await pool.close()
+            await browser.close()
+    
+    progress.close()
+    
+    failed = [result for result in results if 'error' in result]
+    print(f"Toplu çekim tamamlandı: {len(results) - len(failed)} başarılı, {len(failed)} hatalı")
+    print_page_states(failed)
+    if scheduler:
+        scheduler.print_summary()
+    return results
+
+# ===== Çok süreçli toplu çekim =====
+
+# Süreç modunda işçi başına sonuç parçalarının ve birleşik sonuçların yazıldığı klasörün öneki
+BATCH_RUN_PREFIX = "toplu_calisma"
+# Süreç modunda birleştirilmiş sonuç dosyası
+BATCH_RESULTS_FILE = "sonuclar.jsonl"
+
+def _worker_shard_path(run_dir, worker_id):
+    return os.path.join(run_dir, f"isci_{worker_id}.jsonl")
+
+async def batch_worker_async(worker_id, conn, shard_path, max_reviews, sort_by, concurrency=4, headless=False,
+                             context_max_uses=20, storage_state=None, rate=None, max_concurrency=None, **options):
+    """Tek bir işçi sürecinin kendi tarayıcısı ve context havuzuyla ana süreçten gelen URL'leri işlemesi
+
+    URL'ler conn üzerinden tek tek gelir, None gelince işçi elindekileri bitirip kapanır. Her sonuç önce
+    işçinin parça dosyasına yazılır, sonra ('done', url, sonuç) mesajıyla ana sürece bildirilir. rate
+    verilirse mekanlar işçinin kendi AdaptiveScheduler'ından geçer.
+    """
+    loop = asyncio.get_running_loop()
+    inbox = asyncio.Queue()
+    backoff = BlockBackoff()
+    scheduler = AdaptiveScheduler(rate, concurrency=concurrency, max_concurrency=max_concurrency) if rate else None
+    slots = scheduler.max_concurrency if scheduler else concurrency
+    # Oturum durumu dosyasını yalnızca ilk işçi üretir; diğerleri dosya yoksa kendi onaylarını geçer
+    if worker_id > 0 and storage_state and not os.path.exists(storage_state):
+        storage_state = None
+
+    async def receive():
+        while True:
             try:
-                html_content = page.content()
-                with open(os.path.join(folder_path, "page_source.html"), "w", encoding="utf-8") as f:
-                    f.write(html_content)
-                print("Sayfa kaynağı kaydedildi")
+                url = await loop.run_in_executor(None, conn.recv)
+            except EOFError:
+                url = None
+            if url is None:
+                for _ in range(slots):
+                    inbox.put_nowait(None)
+                return
+            inbox.put_nowait(url)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        pool = ContextPool(browser, size=slots, max_uses=context_max_uses,
+                           storage_state=storage_state, block_resources=options.pop('block_resources', None))
+        shard = open(shard_path, 'a', encoding='utf-8')
+
+        async def scrape(url):
+            if scheduler:
+                return await scheduler.run(url, max_reviews, sort_by, pool=pool, **options)
+            await backoff.wait()
+            try:
+                result = await scrape_google_maps_async(url, max_reviews, sort_by, pool=pool, **options)
             except Exception as e:
-                print(f"Sayfa kaynağı kaydedilemedi: {e}")
-            
-            print(f"İşlenecek {len(review_elements)} yorum elementi bulundu")
-            counter = 0
-            
-            # Her bir yorum için işlem yap
-            for review in review_elements:
+                print(f"Mekan çekilemedi ({url}): {e}")
+                result = {'url': url, 'error': str(e)}
+                if isinstance(e, PageStateError):
+                    result['page_state'] = e.state
+            backoff.record(result)
+            return result
+
+        async def consume():
+            while True:
+                url = await inbox.get()
+                if url is None:
+                    return
+                result = await scrape(url)
+                result['worker'] = worker_id
+                shard.write(json.dumps(result, ensure_ascii=False) + "\n")
+                shard.flush()
+                conn.send(('done', url, result))
+
+        try:
+            await asyncio.gather(receive(), *(consume() for _ in range(slots)))
+        finally:
+            shard.close()
+            await pool.close()
+            await browser.close()
+    if scheduler:
+        print(f"İşçi {worker_id}:", end=" ")
+        scheduler.print_summary()
+
+def batch_worker(worker_id, conn, shard_path, max_reviews, sort_by, options):
+    """İşçi sürecinin giriş noktası (spawn ile başlatıldığı için modül düzeyinde)"""
+    asyncio.run(batch_worker_async(worker_id, conn, shard_path, max_reviews, sort_by, **options))
+    # Genel bilgi çıkarıcı istatistikleri ana süreçte birleştirilir
+    conn.send(('stats', None, GENERAL_INFO_REGISTRY.stats))
+    conn.close()
+
+def merge_worker_shards(run_dir, urls):
+    """İşçi parça dosyalarını URL sırasına göre tek bir sonuç listesinde birleştir ve sonuclar.jsonl'e yaz
+
+    Yeniden denenen bir URL için başarılı sonuç hatalı olana tercih edilir.
+    """
+    by_url = {}
+    shard_paths = sorted(os.path.join(run_dir, name) for name in os.listdir(run_dir) if name.startswith("isci_"))
+    for shard_path in shard_paths:
+        with open(shard_path, encoding='utf-8') as f:
+            for line in f:
                 try:
-                    # Önce yorum metnini bul
-                    review_text = ""
-                    for text_selector in ['span', 'div > span', '*[role="text"]', '[jscontroller]']:
-                        try:
-                            elements = review.locator(text_selector).all()
-                            for el in elements:
-                                text = el.text_content().strip()
-                                if len(text.split()) > 10:  # 10 kelimeden uzun
-                                    review_text = text
-                                    break
-                            if review_text:
-                                break
-                        except:
-                            continue
-                    
-                    # "Daha fazla" / "More" butonuna tıklayarak tam yorumları görüntüle
-                    if review_text:
-                        try:
-                            # İlk önce yorum içinde "Daha fazla" veya "More" butonu olup olmadığını kontrol et
-                            more_buttons = review.locator('button:has-text("Daha fazla"), button:has-text("More"), span:has-text("Daha fazla"), span:has-text("more"), [aria-label="Daha fazla"], [aria-label="More"]').all()
-                            if more_buttons:
-                                for more_button in more_buttons:
-                                    try:
-                                        # Butonun görünür olduğundan emin ol
-                                        if more_button.is_visible():
-                                            # Düğmeye tıkla
-                                            more_button.click(timeout=1000)
-                                            print(f"'Daha fazla' butonuna tıklandı.")
-                                            time.sleep(0.5)  # Yorumun açılması için kısa bir süre bekle
-                                            
-                                            # Tam metni tekrar al
-                                            for text_selector in ['span', 'div > span', '*[role="text"]', '[jscontroller]']:
-                                                try:
-                                                    elements = review.locator(text_selector).all()
-                                                    for el in elements:
-                                                        updated_text = el.text_content().strip()
-                                                        # Daha uzun ve muhtemelen tam metin mi kontrol et
-                                                        if len(updated_text) > len(review_text) and len(updated_text.split()) > 10:
-                                                            review_text = updated_text
-                                                            print("Tam yorum metni alındı.")
-                                                            break
-                                                except Exception as exp:
-                                                    print(f"Tam metin çekilirken hata: {exp}")
-                                            break  # İlk görünür butona tıkladıktan sonra döngüden çık
-                                    except Exception as e:
-                                        print(f"'Daha fazla' butonuna tıklarken hata: {e}")
-                                        continue
-                        except Exception as e:
-                            print(f"'Daha fazla' butonu aranırken hata: {e}")
-                    
-                    if not review_text or len(review_text.split()) <= 10:
-                        continue
-                    
-                    # Kullanıcı adını ve bilgilerini daha doğru çek
-                    user_info = {
-                        'name': "Bilinmeyen Kullanıcı",
-                        'is_local_guide': False,
-                        'review_count': "",
-                        'photos_count': "",
-                        'local_guide_level': ""
-                    }
-                    
-                    # ÖNEMLİ: Kullanıcı bloğunu doğru bul
-                    user_block = None
-                    try:
-                        # Kullanıcı bloğu genellikle yorum içindeki ilk link veya belirli sınıfları içeren bir div
-                        user_selectors = [
-                            "a", 
-                            "div.d4r55", 
-                            "div[class*='user']", 
-                            "div.WNxzHc"
-                        ]
-                        
-                        for selector in user_selectors:
-                            elements = review.locator(selector).all()
-                            for elem in elements:
-                                # Bağlantı varsa ve katkıda bulunan kullanıcı linki ise
-                                href = elem.get_attribute("href") or ""
-                                content = elem.text_content().strip()
-                                
-                                if ("contrib" in href or "maps/contrib" in href) and content:
-                                    user_block = elem
-                                    break
-                                    
-                                # Link olmayan bir kullanıcı bloğu olabilir
-                                if content and len(content) > 2 and len(content) < 50 and "+" not in content:
-                                    if not re.search(r'http|www|\.(com|net|org)', content.lower()):
-                                        user_block = elem
-                                        break
-                            
-                            if user_block:
-                                break
-                        
-                        # Bulunan bloğun metin içeriğini al
-                        if user_block:
-                            # Ana kullanıcı ismini al
-                            user_text = user_block.text_content().strip()
-                            
-                            # İsim ve diğer bilgileri ayırmaya çalış
-                            if '\n' in user_text:
-                                parts = user_text.split('\n')
-                                user_info['name'] = parts[0].strip()
-                                
-                                # Diğer parçalardan yerel rehber ve inceleme sayısı bilgilerini çıkart
-                                for part in parts[1:]:
-                                    part = part.strip()
-                                    if "yerel rehber" in part.lower() or "local guide" in part.lower():
-                                        user_info['is_local_guide'] = True
-                                        
-                                        # Seviye bilgisini çıkart (örn: "Yerel Rehber · Düzey 5")
-                                        level_match = re.search(r'düzey\s+(\d+)', part.lower())
-                                        if level_match:
-                                            user_info['local_guide_level'] = f"Düzey {level_match.group(1)}"
-                                        else:
-                                            level_match = re.search(r'level\s+(\d+)', part.lower())
-                                            if level_match:
-                                                user_info['local_guide_level'] = f"Düzey {level_match.group(1)}"
-                                    
-                                    # İnceleme sayısını çıkart
-                                    review_count_match = re.search(r'(\d+)\s*(inceleme|yorum|değerlendirme|review)', part.lower())
-                                    if review_count_match:
-                                        user_info['review_count'] = f"{review_count_match.group(1)} inceleme"
-                                    
-                                    # Fotoğraf sayısını çıkart
-                                    photo_count_match = re.search(r'(\d+)\s*(fotoğraf|photo)', part.lower())
-                                    if photo_count_match:
-                                        user_info['photos_count'] = f"{photo_count_match.group(1)} fotoğraf"
-                            else:
-                                # Tek satır varsa sadece isim olarak kaydet
-                                user_info['name'] = user_text
-                            
-                            # Yerel rehber bilgisini ayrıca kontrol et
-                            if not user_info['is_local_guide']:
-                                # Ana kullanıcı bloğunun yakınında "Yerel Rehber" veya "Local Guide" yazısı olabilir
-                                guide_element = review.locator('span:has-text("Yerel Rehber"), span:has-text("Local Guide")').first
-                                if guide_element:
-                                    user_info['is_local_guide'] = True
-                            
-                            # İnceleme sayısı bilgisini ayrıca kontrol et
-                            if not user_info['review_count']:
-                                stats_elements = review.locator('span:has-text("inceleme"), span:has-text("review"), span:has-text("yorum")').all()
-                                for elem in stats_elements:
-                                    text = elem.text_content().strip()
-                                    if re.search(r'\d+\s*(inceleme|yorum|değerlendirme|review)', text.lower()):
-                                        user_info['review_count'] = text
-                                        break
-                    except Exception as e:
-                        print(f"Kullanıcı bilgileri alınırken hata: {e}")
-                    
-                    # Kullanıcı ismi boşsa veya çok uzunsa, alternatif yöntemleri dene
-                    if not user_info['name'] or len(user_info['name']) > 50 or user_info['name'] == "Bilinmeyen Kullanıcı":
-                        for name_selector in ['div.d4r55', 'a', 'div > a', 'div[class*="user"]', 'div[class*="name"]']:
-                            try:
-                                elements = review.locator(name_selector).all()
-                                for el in elements:
-                                    text = el.text_content().strip()
-                                    if text and len(text) > 2 and len(text) < 50 and "+" not in text and "yorum" not in text.lower() and "yıldız" not in text.lower():
-                                        user_info['name'] = text
-                                        break
-                                if user_info['name'] != "Bilinmeyen Kullanıcı":
-                                    break
-                            except:
-                                continue
-                    
-                    # Yorum tarihini bul
-                    review_date = "Belirtilmemiş"
-                    for date_selector in [
-                        'span.rsqaWe', 
-                        'span[class*="date"]', 
-                        'span[aria-label*="gün"]', 
-                        'span:has-text("ay önce")', 
-                        'span:has-text("gün önce")',
-                        'span:has-text("hafta önce")', 
-                        'span:has-text("week")'
-                    ]:
-                        try:
-                            elements = review.locator(date_selector).all()
-                            for el in elements:
-                                text = el.text_content().strip()
-                                if text and ("gün" in text.lower() or "ay" in text.lower() or "yıl" in text.lower() or 
-                                            "hafta" in text.lower() or "week" in text.lower() or 
-                                            re.search(r'\d{4}', text)):
-                                    review_date = text
-                                    break
-                            if review_date != "Belirtilmemiş":
-                                break
-                        except:
-                            continue
-                    
-                    # Tarih belirtilmemişse ve "birkaç hafta önce" tarzında bir şey olabilir
-                    if review_date == "Belirtilmemiş":
-                        try:
-                            # Genel zamana ilişkin metinleri kontrol et
-                            time_texts = review.locator('span').all()
-                            for el in time_texts:
-                                text = el.text_content().strip().lower()
-                                if ("önce" in text or "ago" in text) and len(text) < 30:
-                                    if any(keyword in text for keyword in ["gün", "ay", "yıl", "hafta", "week", "day", "month", "year"]):
-                                        review_date = text
-                                        break
-                        except:
-                            pass
-                    
-                    # Eğer hala bulunamadıysa ve içerik kısa bir süre önce gönderildiyse, varsayılan bir değer atayabiliriz
-                    if review_date == "Belirtilmemiş":
-                        review_date = "Yeni yorum"
-                    
-                    # Puanı bul
-                    rating = "Belirtilmemiş"
-                    for rating_selector in ['span.kvMYJc', 'span[role="img"]', 'div[role="img"]', 'span[aria-label*="yıldız"]']:
-                        try:
-                            elements = review.locator(rating_selector).all()
-                            for el in elements:
-                                try:
-                                    # Önce aria-label'dan bak
-                                    aria_label = el.get_attribute('aria-label')
-                                    if aria_label and ("yıldız" in aria_label.lower() or "star" in aria_label.lower()):
-                                        rating = aria_label
-                                    break
-                                except:
-                                    pass
-                            if rating != "Belirtilmemiş":
-                                break
-                        except:
-                            continue
-                    
-                    # Kullanıcı altı açıklama metninden ek bilgileri daha esnek çek
-                    review_count = ""
-                    photo_count = ""
-                    is_local_guide = False
-                    try:
-                        # Kullanıcı bloğunun hemen altındaki veya yakınındaki tüm metinleri birleştir
-                        info_texts = []
-                        if user_block:
-                            # Kullanıcı bloğunun kardeş veya alt elementlerinde metin ara
-                            try:
-                                # XPath ile erişim yerine daha güvenli bir yöntem kullanalım
-                                parent = user_block.locator('xpath=..').first
-                                if parent:
-                                    siblings = parent.locator('*').all()
-                                    for sib in siblings:
-                                        sib_text = sib.text_content().strip()
-                                        if sib_text:
-                                            info_texts.append(sib_text)
-                                # Ayrıca kendi bloğunun içindeki tüm metinleri de ekle
-                                block_text = user_block.text_content().strip()
-                                if block_text:
-                                    info_texts.append(block_text)
-                            except Exception as e:
-                                print(f"Kullanıcı bloğu işlenirken hata: {e}")
-                        
-                        # Yedek: Yorum bloğundaki tüm span ve div'lerde de ara
-                        for el in review.locator('span, div').all():
-                            t = el.text_content().strip()
-                            if t and t not in info_texts:
-                                info_texts.append(t)
-                        # Tüm metinleri birleştir
-                        all_info = ' | '.join(info_texts).lower()
-                        # Yerel rehber kontrolü
-                        if re.search(r'yerel rehber|local guide', all_info):
-                            is_local_guide = True
-                        # İnceleme/yorum sayısı
-                        review_count_match = re.search(r'(\d+)\s*(inceleme|yorum|değerlendirme|review|reviews)', all_info)
-                        if review_count_match:
-                            review_count = f"{review_count_match.group(1)} inceleme"
-                        # Fotoğraf sayısı
-                        photo_count_match = re.search(r'(\d+)\s*(fotoğraf|photo|photos)', all_info)
-                        if photo_count_match:
-                            photo_count = f"{photo_count_match.group(1)} fotoğraf"
-                    except Exception as e:
-                        print(f"Kullanıcı ek bilgileri alınırken hata: {e}")
-                    # Temizlik işlemi: Kullanıcı adını sadeleştir
-                    user_name = user_info['name']
-                    if len(user_name) > 50:
-                        user_name = user_name[:47] + "..."
-                    # Veri eklerken filtreleme yapıyoruz - müşteri isteğine göre
-                    reviews.append({
-                        'Kullanici': user_name,
-                        'Tarih': review_date,
-                        'Puan': rating,
-                        'Yorum': review_text
-                    })
-                    counter += 1
-                    if counter >= max_reviews:
-                        break
-                except Exception as e:
-                    print(f"Yorum işlenirken hata: {e}")
+                    result = json.loads(line)
+                except ValueError:
+                    # Çöken bir işçinin yarım kalmış son satırı
                     continue
-            
-            print(f"{len(reviews)} yorum başarıyla toplandı.")
-            
-            # Yorumları kaydet
-            if reviews:
-                pd.DataFrame(reviews).to_csv(os.path.join(folder_path, 'yorumlar.csv'), index=False)
-                print(f"Toplam {len(reviews)} yorum kaydedildi.")
+                previous = by_url.get(result['url'])
+                if previous is None or 'error' in previous or 'error' not in result:
+                    by_url[result['url']] = result
+
+    results = [by_url.get(url, {'url': url, 'error': "Sonuç bulunamadı"}) for url in dict.fromkeys(urls)]
+    with open(os.path.join(run_dir, BATCH_RESULTS_FILE), 'w', encoding='utf-8') as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    for shard_path in shard_paths:
+        os.remove(shard_path)
+    return results
+
+def scrape_batch_processes(path, max_reviews=100, sort_by="newest", workers=2, concurrency=4, max_restarts=3,
+                           max_attempts=2, prometheus=None, rate=None, max_concurrency=None, **options):
+    """Dosyadaki mekan URL'lerini her biri kendi tarayıcısını açan workers adet süreçte çek
+
+    Ana süreç URL kuyruğunu tutar ve her işçiye kendi borusundan en fazla concurrency URL verir; böylece
+    bir işçi ölürse elindeki URL'ler kesin olarak bilinir. Bunlar (en fazla max_attempts deneme) kuyruğa
+    geri konur ve işçi yeniden başlatılır (toplam en fazla max_restarts kez). İşçiler sonuçlarını kendi
+    parça dosyalarına yazar; parçalar sonunda sonuclar.jsonl'de birleştirilir. rate verilirse her işçi
+    kendi AdaptiveScheduler'ını kullanır; host başına hız sınırı işçiler arasında eşit bölünür ve işçiye
+    eşzamanlılık sınırının çıkabileceği kadar (max_concurrency) URL verilir.
+    """
+    urls = dedupe_place_urls(read_url_file(path))  # Aynı mekana çıkan URL'ler bir kez çekilir
+    backlog = collections.deque(urls)
+    total = len(backlog)
+    run_dir = os.path.join(os.path.expanduser("~/Downloads"), f"{BATCH_RUN_PREFIX}_{generate_random_id()}")
+    os.makedirs(run_dir, exist_ok=True)
+    workers = max(1, min(workers, total or 1))
+    concurrency = max(1, concurrency)
+    print(f"{total} mekan bağlantısı okundu, {workers} süreç x {concurrency} eşzamanlı sayfa ile çekilecek")
+    print(f"Toplu çalışma klasörü: {run_dir}")
+
+    mp = multiprocessing.get_context("spawn")
+    worker_options = dict(options, concurrency=concurrency)
+    capacity = concurrency
+    if rate:
+        capacity = max_concurrency or concurrency * 2
+        worker_options.update(rate=rate / workers, max_concurrency=capacity)
+    running = {}  # worker_id -> {'process', 'conn', 'assigned'}
+    attempts = {url: 0 for url in backlog}
+    done = set()
+    failed = {}
+    restarts = 0
+    progress = tqdm(total=total, desc="Mekanlar")
+
+    def dispatch():
+        """Boşta kapasitesi olan işçilere kuyruktaki URL'leri ver"""
+        for worker_id, worker in list(running.items()):
+            while backlog and len(worker['assigned']) < capacity:
+                url = backlog.popleft()
+                try:
+                    worker['conn'].send(url)
+                except OSError:
+                    # İşçi son sonucunu gönderip ölmüş olabilir: URL denenmiş sayılmaz, kuyruğa geri döner
+                    backlog.appendleft(url)
+                    lose_worker(worker_id)
+                    break
+                attempts[url] += 1
+                worker['assigned'].add(url)
+
+    def start_worker(worker_id):
+        conn, child_conn = mp.Pipe()
+        process = mp.Process(target=batch_worker, name=f"isci-{worker_id}", daemon=True,
+                             args=(worker_id, child_conn, _worker_shard_path(run_dir, worker_id), max_reviews, sort_by, worker_options))
+        process.start()
+        child_conn.close()
+        running[worker_id] = {'process': process, 'conn': conn, 'assigned': set()}
+
+    def handle(worker_id, message):
+        kind, url, payload = message
+        if kind == 'done':
+            running[worker_id]['assigned'].discard(url)
+            if url not in done:
+                done.add(url)
+                progress.update(1)
+                if prometheus and 'metrics' in payload:
+                    prometheus.add(payload.get('place_key') or slugify(payload['place_name']), payload['metrics'], payload['review_count'])
+        elif kind == 'stats':
+            GENERAL_INFO_REGISTRY.merge_stats(payload)
+
+    def lose_worker(worker_id):
+        """Ölen işçinin elindeki URL'leri kuyruğa geri koy, hakkı varsa işçiyi yeniden başlat"""
+        nonlocal restarts
+        worker = running.pop(worker_id)
+        worker['process'].join(timeout=5)
+        lost = [url for url in worker['assigned'] if url not in done]
+        print(f"İşçi {worker_id} beklenmedik şekilde sonlandı (çıkış kodu {worker['process'].exitcode}), {len(lost)} mekan yarım kaldı")
+        for url in lost:
+            if attempts[url] < max_attempts:
+                backlog.appendleft(url)
             else:
-                empty_reviews = [{
-                    'Kullanici': 'Yorum bulunamadı',
-                    'Tarih': '',
-                    'Puan': '',
-                    'Yorum': 'Yorumlar çekilemedi'
-                }]
-                pd.DataFrame(empty_reviews).to_csv(os.path.join(folder_path, 'yorumlar.csv'), index=False)
-                print("Yorum bulunamadı.")
-        except Exception as e:
-            print(f"Yorumlar toplanırken hata oluştu: {e}")
-            empty_reviews = [{
-                'Kullanici': 'Hata',
-                'Tarih': '',
-                'Puan': '',
-                'Yorum': f'Hata: {str(e)}'
-            }]
-            pd.DataFrame(empty_reviews).to_csv(os.path.join(folder_path, 'yorumlar.csv'), index=False)
-        
-        # Tamamlandı
-        try:
-            page.screenshot(path=os.path.join(folder_path, "ekran_goruntusu_son.png"), full_page=True)
-        except:
-            pass
-            
-        time.sleep(2)
-        browser.close()
-        print(f"\nTüm veriler {folder_path} klasörüne kaydedildi.")
+                failed[url] = f"İşçi süreci {attempts[url]} denemede de çöktü"
+                progress.update(1)
+        if restarts < max_restarts and (backlog or any(worker['assigned'] for worker in running.values())):
+            restarts += 1
+            print(f"İşçi {worker_id} yeniden başlatılıyor ({restarts}/{max_restarts})")
+            start_worker(worker_id)
+
+    def receive(timeout):
+        """Hazır mesajları işle; boru kapanmışsa işçi ölmüştür"""
+        conns = {worker['conn']: worker_id for worker_id, worker in running.items()}
+        for conn in multiprocessing.connection.wait(list(conns), timeout=timeout):
+            worker_id = conns[conn]
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                lose_worker(worker_id)
+                continue
+            handle(worker_id, message)
+
+    for worker_id in range(workers):
+        start_worker(worker_id)
+
+    try:
+        while len(done) + len(failed) < total:
+            dispatch()
+            if not running:
+                print("Çalışan işçi kalmadı, kalan mekanlar hatalı sayılacak")
+                for url in attempts:
+                    if url not in done and url not in failed:
+                        failed[url] = "Çalışan işçi kalmadı"
+                break
+            receive(timeout=1)
+
+        # İşler bitti: işçileri kapat ve son istatistiklerini topla
+        for worker in running.values():
+            try:
+                worker['conn'].send(None)
+            except OSError:
+                pass
+        deadline = time.time() + 60
+        while running and time.time() < deadline:
+            conns = {worker['conn']: worker_id for worker_id, worker in running.items()}
+            for conn in multiprocessing.connection.wait(list(conns), timeout=1):
+                try:
+                    handle(conns[conn], conn.recv())
+                except (EOFError, OSError):
+                    running.pop(conns[conn])['process'].join(timeout=5)
+    finally:
+        for worker in running.values():
+            worker['process'].terminate()
+        progress.close()
+
+    results = merge_worker_shards(run_dir, urls)
+    for result in results:
+        if result['url'] in failed and 'error' in result:
+            result['error'] = failed[result['url']]
+    errors = [result for result in results if 'error' in result]
+    print(f"Toplu çekim tamamlandı: {len(results) - len(errors)} başarılı, {len(errors)} hatalı, {restarts} işçi yeniden başlatıldı")
+    print_page_states(errors)
+    print(f"Sonuçlar: {os.path.join(run_dir, BATCH_RESULTS_FILE)}")
+    return results
 
 if __name__ == "__main__":
-    url = input("Google Maps mekan bağlantısını girin: ")
+    parser = argparse.ArgumentParser(description="Google Maps mekan bilgilerini ve yorumlarını çek")
+    parser.add_argument("url", nargs="?", help="Google Maps mekan bağlantısı")
+    parser.add_argument("max_reviews", nargs="?", type=int, help="Maksimum yorum sayısı (varsayılan: 200)")
+    parser.add_argument("sort_by", nargs="?", default="newest", help="Sıralama: newest, most_relevant, highest_rating, lowest_rating")
+    parser.add_argument("--batch", metavar="DOSYA", help="URL listesi içeren txt/CSV/JSONL dosyası")
+    parser.add_argument("--concurrency", type=int, default=4, help="Toplu modda eşzamanlı sayfa sayısı (varsayılan: 4)")
+    parser.add_argument("--workers", type=int, default=1, help="Toplu modda her biri kendi tarayıcısını açan süreç sayısı (varsayılan: 1, tek süreç)")
+    parser.add_argument("--rate", type=float, help="Toplu modda uyarlanabilir zamanlayıcıyı aç: host başına saniyedeki mekan açılışı ve yorum yüklemesi sınırı")
+    parser.add_argument("--max-concurrency", type=int, help="Uyarlanabilir zamanlayıcıda eşzamanlılığın çıkabileceği üst sınır (varsayılan: 2 x --concurrency)")
+    parser.add_argument("--max-restarts", type=int, default=3, help="Süreç modunda ölen işçilerin toplamda en fazla kaç kez yeniden başlatılacağı (varsayılan: 3)")
+    parser.add_argument("--context-max-uses", type=int, default=20, help="Toplu modda bir context'in yenilenmeden önce kullanılacağı mekan sayısı (varsayılan: 20)")
+    parser.add_argument("--storage-state", metavar="DOSYA", help="Toplu modda çerez onaylı oturum durumunun saklanacağı/okunacağı JSON dosyası")
+    parser.add_argument("--headless", action="store_true", help="Tarayıcıyı arayüz olmadan çalıştır")
+    parser.add_argument("--block-resources", action="store_true", help="Görsel, harita karosu, medya, font ve analiz isteklerini engelle")
+    parser.add_argument("--block-types", help="Engellenecek kaynak türleri, virgülle ayrılmış (varsayılan: image,media,font)")
+    parser.add_argument("--block-pattern", action="append", help="Engellenecek URL için regex (birden çok kez verilebilir)")
+    parser.add_argument("--extraction", choices=["batch", "locator", "network", "stream"], default="batch", help="Yorum çıkarım yöntemi (varsayılan: batch; stream: kaydırırken çıkar ve işlenen kartları sayfadan boşalt)")
+    parser.add_argument("--extraction-tier", choices=EXTRACTION_TIERS, default="thorough",
+                        help="Alan çıkarım katmanı: fast yalnızca birincil seçicileri dener, thorough yedekleri yalnızca ıskalanan alanlar için çalıştırır (varsayılan: thorough)")
+    parser.add_argument("--shards", type=int, default=1, help="Büyük mekanlarda yorumları bu kadar farklı sıralamada paralel çek (1-4, varsayılan: 1)")
+    parser.add_argument("--debug-artifacts", choices=DEBUG_ARTIFACT_POLICIES, default="on_error", help="Ekran görüntüsü ve sayfa kaynağı kaydı: off, on_error (varsayılan), sampled, always")
+    parser.add_argument("--debug-sample-rate", type=float, default=0.1, help="sampled politikasında her adımda kayıt alınacak mekan oranı (varsayılan: 0.1)")
+    parser.add_argument("--debug-compress", action="store_true", help="Ekran görüntülerini JPEG, sayfa kaynağını gzip olarak yaz")
+    parser.add_argument("--dataset", metavar="KLASÖR", help="Mekan bilgilerini ve yorumları ayrıca bu klasördeki mekan/tarih bölümlü Parquet veri kümesine ekle (pyarrow gerekir)")
+    parser.add_argument("--sqlite", metavar="DOSYA", help="Mekan bilgilerini ve yorumları ayrıca bu SQLite veritabanına upsert et; --resume ve --since-last-run bunu kaynak olarak kullanır")
+    parser.add_argument("--jsonl", action="store_true", help="Yorumları ayrıca yorumlar.jsonl dosyasına yaz")
+    parser.add_argument("--resume", action="store_true", help="Mekanın kontrol noktasından devam et, kayıtlı yorumları atla")
+    parser.add_argument("--since-last-run", action="store_true", help="Yalnızca son çalıştırmadan sonra gelen yorumları çek (en yeni sıralama)")
+    parser.add_argument("--place-cache-ttl", type=float, metavar="SAAT", help="Genel bilgileri mekan kimliğine göre bu kadar saat önbellekte tut; taze kaydı olan mekanlarda yalnızca yorumlar yenilenir")
+    parser.add_argument("--metrics-prometheus", metavar="DOSYA", help="Aşama sürelerini ve Playwright çağrı sayılarını Prometheus metin biçiminde bu dosyaya yaz")
+    parser.add_argument("--extractor-stats", action="store_true", help="Genel bilgi çıkarıcılarının isabet oranlarını kaydet ve tüm çalıştırmalar için raporla")
+    parser.add_argument("--decode-payload", metavar="DOSYA", help="Kaydedilmiş bir yorum listesi yanıtını çevrimdışı çöz ve çık")
+    args = parser.parse_args()
     
-    # Maksimum yorum sayısını sor (varsayılan 200)
-    try:
-        max_reviews_input = input("Kaç yorum çekmek istersiniz? (varsayılan: 200): ")
-        max_reviews = int(max_reviews_input) if max_reviews_input.strip() else 200
-    except:
-        max_reviews = 200
+    if args.decode_payload:
+        with open(args.decode_payload, encoding="utf-8") as f:
+            for record in decode_review_payload(f.read()):
+                print(json.dumps(record, ensure_ascii=False))
+        sys.exit(0)
+    
+    options = {
+        'headless': args.headless,
+        'extraction_mode': args.extraction,
+        'extraction_tier': args.extraction_tier,
+        'write_jsonl': args.jsonl,
+        'resume': args.resume,
+        'since_last_run': args.since_last_run,
+        'shards': args.shards,
+        'debug_artifacts': args.debug_artifacts,
+        'debug_sample_rate': args.debug_sample_rate,
+        'debug_compress': args.debug_compress
+    }
+    if args.dataset:
+        options['dataset'] = ParquetDataset(args.dataset)
+    if args.sqlite:
+        options['store'] = SqliteStore(args.sqlite)
+    if args.place_cache_ttl:
+        options['place_cache'] = PlaceInfoCache(args.place_cache_ttl)
+    if args.metrics_prometheus:
+        options['prometheus'] = PrometheusExport(args.metrics_prometheus)
+    if args.block_resources or args.block_types or args.block_pattern:
+        options['block_resources'] = {
+            'types': args.block_types.split(",") if args.block_types else None,
+            'patterns': BLOCKED_URL_PATTERNS + args.block_pattern if args.block_pattern else None
+        }
     
-    # En yeni sıralama kullan
-    sort_by = "newest"
+    if args.batch and args.workers > 1:
+        scrape_batch_processes(args.batch, args.max_reviews or 200, args.sort_by, args.workers, args.concurrency,
+                               max_restarts=args.max_restarts, context_max_uses=args.context_max_uses,
+                               storage_state=args.storage_state, rate=args.rate, max_concurrency=args.max_concurrency, **options)
+    elif args.batch:
+        scrape_batch(args.batch, args.max_reviews or 200, args.sort_by, args.concurrency,
+                     context_max_uses=args.context_max_uses, storage_state=args.storage_state,
+                     rate=args.rate, max_concurrency=args.max_concurrency, **options)
+    else:
+        url = args.url or input("Google Maps mekan bağlantısını girin: ")
+        
+        # Maksimum yorum sayısını sor (varsayılan 200)
+        max_reviews = args.max_reviews
+        if max_reviews is None:
+            try:
+                max_reviews_input = input("Kaç yorum çekmek istersiniz? (varsayılan: 200): ")
+                max_reviews = int(max_reviews_input) if max_reviews_input.strip() else 200
+            except:
+                max_reviews = 200
+        
+        try:
+            scrape_google_maps(url, max_reviews, args.sort_by, **options)
+        except PageStateError as e:
+            print(e)
+            sys.exit(2)
     
-    scrape_google_maps(url, max_reviews, sort_by)
+    if args.extractor_stats:
+        GENERAL_INFO_REGISTRY.print_report(GENERAL_INFO_REGISTRY.save_stats())
+        print(f"Çıkarıcı istatistikleri kaydedildi: {EXTRACTOR_STATS_PATH}")
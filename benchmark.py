@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""Google Maps kazıyıcısı için çevrimdışı benchmark
+
+fixtures/bench_place.html sayfasını ve kaydırıldıkça yorum yükleyen sahte bir listugcposts uç noktasını
+yerel bir HTTP sunucusundan sunar, tam işlem hattını (scrape_page) bu sahte mekana karşı çalıştırır ve
+her yorum sayısı için aşama sürelerini, Playwright çağrı sayılarını ve saniyedeki yorum sayısını raporlar.
+
+    python benchmark.py                          # 50, 500 ve 5000 yorum
+    python benchmark.py --sizes 50 --extraction network
+    python benchmark.py --sizes 500 --extraction-tier fast
+    python benchmark.py --output sonuc.json --baseline onceki.json --tolerance 0.25
+    python benchmark.py --fleet 40 --throttle 8 --rate 3    # sabit eşzamanlılık / uyarlanabilir zamanlayıcı
+    python benchmark.py --snapshot-scaling --sizes 300 1000 3000   # tarayıcısız, genel bilgi çıkarımı
+
+--throttle verilirse sunucu saniyede bundan fazla mekan açılışı veya yorum yüklemesi gelince Google gibi
+429 ve "unusual traffic" sayfası döndürür; --fleet bu sunucuya karşı toplu çekimi bir kez sabit
+eşzamanlılıkla, bir kez AdaptiveScheduler ile çalıştırıp sonuçları karşılaştırır.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+import importlib.util
+import contextlib
+import collections
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SCRAPER_PATH = os.path.join(ROOT, "Google Place URL Review Scraper.py")
+PLACE_TEMPLATE_PATH = os.path.join(ROOT, "fixtures", "bench_place.html")
+
+DEFAULT_SIZES = [50, 500, 5000]
+
+# Sahte yorum metinleri için kelime havuzu
+REVIEW_WORDS = ("kahveler lezzetli servis hızlı personel güler yüzlü fiyatlar makul manzara harika "
+                "tatlılar taze ortam sakin müzik hoş masa temiz sipariş geç geldi ama değdi").split()
+
+def fake_review(index):
+    """index numaralı yorum için listugcposts öğesi üret (her çalıştırmada aynı)"""
+    words = [REVIEW_WORDS[(index + k) % len(REVIEW_WORDS)] for k in range(20 + index % 25)]
+    text = f"{' '.join(words)} (yorum {index})"
+    post = [
+        f"bench-{index:06d}",
+        [None, None, 1700000000000000 - index, None, [None, None, None, None, None, [f"Kullanıcı {index}", "", [""]]], None, f"{index % 11 + 1} gün önce"],
+        [[index % 5 + 1]] + [None] * 14 + [[[text]]]
+    ]
+    return [post]
+
+def review_page_payload(offset, count, total):
+    """Maps'in listugcposts yanıt biçiminde (XSSI önekiyle) bir yorum sayfası"""
+    items = [fake_review(index) for index in range(offset, min(offset + count, total))]
+    return ")]}'\n" + json.dumps([None, f"token-{offset + count}", items], ensure_ascii=False)
+
+# Google'ın trafik sınırı sayfasının sadeleştirilmiş hali
+RATE_LIMIT_PAGE = ("<!DOCTYPE html><html><head><title>Sorry...</title></head><body>"
+                   "<p>Our systems have detected unusual traffic from your computer network.</p></body></html>")
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Mekan sayfasını ve yorum akışı isteklerini yanıtlayan yerel sunucu
+
+    throttle ayarlıysa son bir saniyedeki mekan açılışı ve yorum yüklemesi sayısı bunu aşınca 429 döner.
+    """
+    throttle = None
+    recent = collections.deque()
+    recent_lock = threading.Lock()
+    throttled = 0
+
+    @classmethod
+    def over_limit(cls):
+        if not cls.throttle:
+            return False
+        now = time.monotonic()
+        with cls.recent_lock:
+            while cls.recent and now - cls.recent[0] > 1.0:
+                cls.recent.popleft()
+            cls.recent.append(now)
+            if len(cls.recent) > cls.throttle:
+                cls.throttled += 1
+                return True
+        return False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if (url.path.startswith("/maps/place/") or url.path == "/maps/rpc/listugcposts") and self.over_limit():
+            self._send(RATE_LIMIT_PAGE, "text/html; charset=utf-8", status=429)
+        elif url.path.startswith("/maps/place/"):
+            total = int(query.get("reviews", ["50"])[0])
+            with open(PLACE_TEMPLATE_PATH, encoding="utf-8") as f:
+                body = f.read().replace("__TOTAL__", str(total))
+            self._send(body, "text/html; charset=utf-8")
+        elif url.path == "/maps/rpc/listugcposts":
+            total = int(query.get("total", ["0"])[0])
+            offset = int(query.get("offset", ["0"])[0])
+            count = int(query.get("count", ["10"])[0])
+            self._send(review_page_payload(offset, count, total), "application/json; charset=utf-8")
+        else:
+            self.send_error(404)
+
+    def _send(self, body, content_type, status=200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+@contextlib.contextmanager
+def stand_in_server(throttle=None):
+    """Boş bir portta sunucuyu arka planda başlat, taban URL'yi döndür"""
+    StandInHandler.throttle = throttle
+    StandInHandler.recent.clear()
+    StandInHandler.throttled = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def load_scraper(home):
+    """Dosya adı boşluk içerdiği için kazıyıcıyı importlib ile yükle; çıktılar geçici HOME altına yazılır"""
+    os.environ["HOME"] = home
+    os.makedirs(os.path.join(home, "Downloads"), exist_ok=True)
+    spec = importlib.util.spec_from_file_location("maps_scraper", SCRAPER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+async def run_case(module, base_url, size, extraction_mode, headless, extraction_tier="thorough"):
+    """Tek bir yorum sayısı için tam işlem hattını çalıştır; ölçümler kazıyıcının RunMetrics'inden alınır"""
+    from playwright.async_api import async_playwright  # type: ignore
+
+    # load_reviews hedefi max_reviews'un 1.2 katı; akış tam bu kadar yorum sunar ki son kaydırmada beklenmesin
+    url = f"{base_url}/maps/place/benchmark-kahve-evi?reviews={int(size * 1.2)}"
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        context = await browser.new_context(**module.CONTEXT_OPTIONS)
+        page = await context.new_page()
+        started = time.perf_counter()
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+                result = await module.scrape_page(page, url, size, "newest", module.generate_random_id(),
+                                                  extraction_mode=extraction_mode, extraction_tier=extraction_tier, consent_done=True)
+        finally:
+            total = time.perf_counter() - started
+            await context.close()
+            await browser.close()
+
+    metrics = result['metrics']
+    calls = sorted(metrics['calls_total'].items(), key=lambda item: -item[1])
+    return {
+        'size': size,
+        'extraction_mode': extraction_mode,
+        'extraction_tier': extraction_tier,
+        'reviews': result['review_count'],
+        'seconds': round(total, 3),
+        'reviews_per_second': round(result['review_count'] / total, 2) if total else 0.0,
+        'playwright_calls': sum(metrics['calls_total'].values()),
+        'calls_by_method': dict(calls),
+        'phases': {phase: entry['seconds'] for phase, entry in metrics['phases'].items()},
+        'peak_heap_mb': metrics.get('heap', {}).get('peak_heap_mb'),
+        'peak_nodes': metrics.get('heap', {}).get('peak_nodes'),
+        'extraction_misses': metrics.get('extraction_misses')
+    }
+
+async def run_fleet(module, base_url, home, places, size, concurrency, rate, headless):
+    """places adet sahte mekanı toplu modda çek; rate verilirse AdaptiveScheduler kullanılır"""
+    url_path = os.path.join(home, "fleet_urls.txt")
+    with open(url_path, "w", encoding="utf-8") as f:
+        for index in range(places):
+            f.write(f"{base_url}/maps/place/benchmark-kahve-evi-{index}?reviews={int(size * 1.2)}\n")
+    # Havuzun çerez onayı için gerçek Google'a gitmemesi adına boş bir oturum durumu verilir
+    state_path = os.path.join(home, "fleet_state.json")
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump({"cookies": [], "origins": []}, f)
+
+    throttled_before = StandInHandler.throttled
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        results = await module.scrape_batch_async(url_path, size, "newest", concurrency, headless=headless,
+                                                  storage_state=state_path, rate=rate)
+    total = time.perf_counter() - started
+    ok = [result for result in results if 'error' not in result]
+    states = collections.Counter(result['page_state'] for result in results if 'page_state' in result)
+    return {
+        'mode': f"adaptive ({rate}/sn)" if rate else "fixed",
+        'places': places,
+        'ok': len(ok),
+        'blocked': sum(states.get(state, 0) for state in module.PAGE_BACKOFF_STATES),
+        'reviews': sum(result['review_count'] for result in ok),
+        'seconds': round(total, 2),
+        'places_per_minute': round(len(ok) / total * 60, 1) if total else 0.0,
+        'throttled_requests': StandInHandler.throttled - throttled_before
+    }
+
+def snapshot_html(cards):
+    """Yorumlar sekmesinde cards adet kart yüklenmiş mekan panelinin outerHTML'i (DOM görüntüsü ölçümü için)"""
+    with open(PLACE_TEMPLATE_PATH, encoding="utf-8") as f:
+        html = f.read().replace("__TOTAL__", str(cards))
+    parts = []
+    for index in range(cards):
+        post = fake_review(index)[0]
+        # Gerçek yorumlarda gün adları da geçer; kardeş birleştiricili yedek seçiciler bunları da dener
+        text = post[2][15][0][0] + (" pazartesi akşamı gittik" if index % 7 == 0 else "")
+        parts.append(
+            f'<div class="jftiEf fontBodyMedium" data-review-id="{post[0]}"><div class="WNxzHc"><a href="/maps/contrib/{index}">'
+            f'<div class="d4r55">{post[1][4][5][0]}</div></a></div><div><span class="kvMYJc" role="img" aria-label="{post[2][0][0]} yıldız"></span>'
+            f'<span class="rsqaWe">{post[1][6]}</span></div><div class="MyEned"><span class="wiI7pd">{text}</span></div></div>'
+        )
+    return html.replace('<div class="m6QErb DxyBCb" id="feed"></div>', f'<div class="m6QErb DxyBCb" id="feed">{"".join(parts)}</div>')
+
+def run_snapshot_scaling(sizes):
+    """Genel bilgi çıkarımını kart sayısı artan DOM görüntülerinde ölç
+    
+    Birincil seçiciler ıskalamış gibi her alanın yedek zinciri de tamamen çalıştırılır; süre kart sayısıyla
+    doğrusal büyümelidir.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as home:
+        module = load_scraper(home)
+        registry = module.GENERAL_INFO_REGISTRY
+        for size in sizes:
+            html = snapshot_html(size)
+            started = time.perf_counter()
+            snapshot = module.PlaceSnapshot(html)
+            parse_seconds = time.perf_counter() - started
+            fields = {}
+            for field in registry.fields:
+                started = time.perf_counter()
+                registry.primary[field].run(snapshot)
+                for extractor in registry.fallbacks[field]:
+                    extractor.run(snapshot, scoped=True)
+                fields[field] = time.perf_counter() - started
+            rows.append({
+                'size': size,
+                'html_mb': round(len(html.encode("utf-8")) / 1_000_000, 2),
+                'parse_seconds': round(parse_seconds, 3),
+                'extract_seconds': round(sum(fields.values()), 3),
+                'fields': {field: round(seconds, 4) for field, seconds in fields.items()}
+            })
+    return rows
+
+def print_snapshot_scaling(rows):
+    print(f"{'kart':>6} {'HTML (MB)':>10} {'ayrıştırma (sn)':>16} {'çıkarım (sn)':>13}  en yavaş alanlar (ms)")
+    for row in rows:
+        slowest = sorted(row['fields'].items(), key=lambda item: -item[1])[:3]
+        print(f"{row['size']:>6} {row['html_mb']:>10.2f} {row['parse_seconds']:>16.3f} {row['extract_seconds']:>13.3f}  "
+              + ", ".join(f"{field}={seconds * 1000:.0f}" for field, seconds in slowest))
+
+def snapshot_scaling_regressions(rows, tolerance):
+    """Çıkarım süresi kart sayısından belirgin şekilde hızlı büyüyorsa (doğrusal değilse) açıklama listesi"""
+    rows = sorted(rows, key=lambda row: row['size'])
+    regressions = []
+    for small, large in zip(rows, rows[1:]):
+        growth = large['size'] / small['size']
+        # Sabit maliyet küçük boyutta baskın olabilir; 10 ms altı ölçümler karşılaştırılmaz
+        if small['extract_seconds'] >= 0.01 and large['extract_seconds'] > small['extract_seconds'] * growth * (1 + tolerance):
+            regressions.append(f"{small['size']} -> {large['size']} kart: çıkarım {small['extract_seconds']} -> {large['extract_seconds']} sn "
+                               f"(kart sayısı {growth:.1f} kat, süre {large['extract_seconds'] / small['extract_seconds']:.1f} kat)")
+    return regressions
+
+async def run_fleet_benchmark(places, size, concurrency, rate, throttle, headless=True):
+    rows = []
+    with tempfile.TemporaryDirectory() as home, stand_in_server(throttle) as base_url:
+        module = load_scraper(home)
+        for mode_rate in (None, rate):
+            print(f"{places} mekan çekiliyor ({'uyarlanabilir' if mode_rate else 'sabit'} eşzamanlılık {concurrency})...")
+            rows.append(await run_fleet(module, base_url, home, places, size, concurrency, mode_rate, headless))
+    return rows
+
+def print_fleet(rows):
+    print(f"{'mod':<20} {'başarılı':>9} {'engel':>6} {'429':>6} {'süre (sn)':>10} {'mekan/dk':>9}")
+    for row in rows:
+        print(f"{row['mode']:<20} {row['ok']:>4}/{row['places']:<4} {row['blocked']:>6} {row['throttled_requests']:>6} {row['seconds']:>10.2f} {row['places_per_minute']:>9.1f}")
+
+def print_results(results):
+    print(f"{'yorum':>7} {'yazılan':>8} {'süre (sn)':>10} {'yorum/sn':>9} {'PW çağrısı':>11}  aşamalar (sn)")
+    for row in results:
+        phases = ", ".join(f"{phase}={seconds:.2f}" for phase, seconds in sorted(row['phases'].items(), key=lambda item: -item[1]))
+        print(f"{row['size']:>7} {row['reviews']:>8} {row['seconds']:>10.2f} {row['reviews_per_second']:>9.1f} {row['playwright_calls']:>11}  {phases}")
+    for row in results:
+        top_calls = ", ".join(f"{method}={count}" for method, count in list(row['calls_by_method'].items())[:8])
+        print(f"{row['size']} yorum, en sık çağrılar: {top_calls}")
+        if row.get('peak_heap_mb') is not None:
+            print(f"{row['size']} yorum, JS heap tepe değeri: {row['peak_heap_mb']} MB, {row['peak_nodes']} DOM düğümü")
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Saniyedeki yorum sayısı düşen veya Playwright çağrıları artan durumları listele"""
+    key = lambda row: (row['size'], row['extraction_mode'], row.get('extraction_tier', 'thorough'))
+    previous = {key(row): row for row in baseline}
+    regressions = []
+    for row in results:
+        old = previous.get(key(row))
+        if not old:
+            continue
+        if row['reviews_per_second'] < old['reviews_per_second'] * (1 - tolerance):
+            regressions.append(f"{row['size']} yorum: {old['reviews_per_second']} -> {row['reviews_per_second']} yorum/sn")
+        if row['playwright_calls'] > old['playwright_calls'] * (1 + tolerance):
+            regressions.append(f"{row['size']} yorum: {old['playwright_calls']} -> {row['playwright_calls']} Playwright çağrısı")
+        if row['reviews'] < old['reviews']:
+            regressions.append(f"{row['size']} yorum: yazılan yorum {old['reviews']} -> {row['reviews']}")
+    return regressions
+
+async def run_benchmark(sizes, extraction_mode="batch", headless=True, extraction_tier="thorough"):
+    results = []
+    with tempfile.TemporaryDirectory() as home, stand_in_server() as base_url:
+        module = load_scraper(home)
+        for size in sizes:
+            print(f"{size} yorum ölçülüyor ({extraction_mode}, {extraction_tier})...")
+            results.append(await run_case(module, base_url, size, extraction_mode, headless, extraction_tier))
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kazıyıcıyı yerel sahte Google Maps sayfasına karşı ölç")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Ölçülecek yorum sayıları (varsayılan: 50 500 5000)")
+    parser.add_argument("--extraction", choices=["batch", "locator", "network", "stream"], default="batch", help="Yorum çıkarım yöntemi (varsayılan: batch)")
+    parser.add_argument("--extraction-tier", choices=["fast", "thorough"], default="thorough", help="Alan çıkarım katmanı (varsayılan: thorough)")
+    parser.add_argument("--fleet", type=int, metavar="N", help="N sahte mekanı toplu modda sabit eşzamanlılık ve uyarlanabilir zamanlayıcı ile çek")
+    parser.add_argument("--throttle", type=float, help="Sahte sunucunun saniyede kabul ettiği en fazla mekan açılışı/yorum yüklemesi")
+    parser.add_argument("--rate", type=float, default=3.0, help="--fleet'te zamanlayıcının host başına istek/sn sınırı (varsayılan: 3)")
+    parser.add_argument("--concurrency", type=int, default=4, help="--fleet'te eşzamanlı sayfa sayısı (varsayılan: 4)")
+    parser.add_argument("--snapshot-scaling", action="store_true", help="Tarayıcısız: genel bilgi çıkarımını --sizes kadar yorum kartı içeren DOM görüntülerinde ölç; doğrusal değilse çıkış kodu 1")
+    parser.add_argument("--headed", action="store_true", help="Tarayıcıyı arayüzle çalıştır")
+    parser.add_argument("--output", metavar="DOSYA", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", metavar="DOSYA", help="Karşılaştırılacak önceki sonuç dosyası; gerileme varsa çıkış kodu 1")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Gerileme sayılmadan önce izin verilen oran (varsayılan: 0.25)")
+    args = parser.parse_args()
+
+    if args.snapshot_scaling:
+        rows = run_snapshot_scaling(args.sizes)
+        print_snapshot_scaling(rows)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(rows, f, ensure_ascii=False, indent=2)
+        regressions = snapshot_scaling_regressions(rows, args.tolerance)
+        if regressions:
+            print("Genel bilgi çıkarımı kart sayısıyla doğrusal büyümüyor:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        sys.exit(0)
+
+    if args.fleet:
+        rows = asyncio.run(run_fleet_benchmark(args.fleet, args.sizes[0], args.concurrency, args.rate, args.throttle, headless=not args.headed))
+        print_fleet(rows)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(rows, f, ensure_ascii=False, indent=2)
+        sys.exit(0)
+
+    results = asyncio.run(run_benchmark(args.sizes, args.extraction, headless=not args.headed, extraction_tier=args.extraction_tier))
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Sonuçlar kaydedildi: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Performans gerilemesi:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("Önceki sonuçlara göre gerileme yok")
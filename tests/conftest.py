@@ -0,0 +1,33 @@
+import importlib.util
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRAPER_PATH = os.path.join(ROOT, "Google Place URL Review Scraper.py")
+FIXTURES_DIR = os.path.join(ROOT, "fixtures")
+
+
+@pytest.fixture(scope="session")
+def scraper(tmp_path_factory):
+    """Dosya adı boşluk içerdiği için kazıyıcıyı importlib ile yükle; durum dosyaları geçici HOME altına yazılır"""
+    home = tmp_path_factory.mktemp("home")
+    os.makedirs(home / "Downloads", exist_ok=True)
+    previous_home = os.environ.get("HOME")
+    os.environ["HOME"] = str(home)
+    try:
+        spec = importlib.util.spec_from_file_location("maps_scraper", SCRAPER_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        if previous_home is not None:
+            os.environ["HOME"] = previous_home
+    return module
+
+
+@pytest.fixture
+def fixture_text():
+    def read(name):
+        with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+            return f.read()
+    return read
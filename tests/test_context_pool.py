@@ -0,0 +1,86 @@
+"""ContextPool kiralama ve context yenileme için testler"""
+import asyncio
+
+
+class FakePage:
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self, fail_pages=False):
+        self.fail_pages = fail_pages
+        self.closed = False
+
+    async def new_page(self):
+        await asyncio.sleep(0.01)
+        if self.fail_pages:
+            raise RuntimeError("sayfa açılamadı")
+        return FakePage()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, fail_first=0):
+        self.contexts = []
+        self.fail_first = fail_first
+
+    async def new_context(self, **options):
+        context = FakeContext(fail_pages=len(self.contexts) < self.fail_first)
+        self.contexts.append(context)
+        return context
+
+
+def make_pool(scraper, browser, **options):
+    pool = scraper.ContextPool(browser, **options)
+    pool.state = {}  # ısınma sayfasını atla
+    return pool
+
+
+async def use(pool, hold=0.01):
+    async with pool.lease():
+        await asyncio.sleep(hold)
+
+
+def test_waiters_wake_after_retire(scraper):
+    async def run():
+        browser = FakeBrowser()
+        pool = make_pool(scraper, browser, size=1, max_uses=1)
+        await asyncio.wait_for(asyncio.gather(*(use(pool) for _ in range(5))), timeout=2)
+        return browser, pool
+
+    browser, pool = asyncio.run(run())
+    assert len(browser.contexts) == 5
+    assert pool.recycled == 5
+    assert pool.open_contexts == 0
+
+
+def test_waiters_wake_when_new_page_fails(scraper):
+    async def run():
+        browser = FakeBrowser(fail_first=1)
+        pool = make_pool(scraper, browser, size=1, max_uses=10)
+        results = await asyncio.wait_for(asyncio.gather(*(use(pool) for _ in range(3)), return_exceptions=True), timeout=2)
+        await pool.close()
+        return browser, pool, results
+
+    browser, pool, results = asyncio.run(run())
+    assert isinstance(results[0], RuntimeError)
+    assert results[1:] == [None, None]
+    assert len(browser.contexts) == 2
+    assert all(context.closed for context in browser.contexts)
+    assert pool.open_contexts == 0
+
+
+def test_contexts_are_reused(scraper):
+    async def run():
+        browser = FakeBrowser()
+        pool = make_pool(scraper, browser, size=2, max_uses=20)
+        await asyncio.wait_for(asyncio.gather(*(use(pool) for _ in range(8))), timeout=2)
+        await pool.close()
+        return browser, pool
+
+    browser, pool = asyncio.run(run())
+    assert len(browser.contexts) == 2
+    assert pool.recycled == 2
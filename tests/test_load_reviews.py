@@ -0,0 +1,50 @@
+"""load_reviews'ın bilinen yorumda durması ve kimlikleri artımlı okuması için testler"""
+import asyncio
+
+
+class FakeLocator:
+    def __init__(self, page):
+        self.page = page
+
+    async def count(self):
+        return self.page.loaded
+
+
+class FeedPage:
+    """Her kaydırmada step kart yükleyen, sayfadan aktarılan kimlik sayısını sayan akış"""
+
+    def __init__(self, total, step=10):
+        self.ids = [f"id-{index}" for index in range(total)]
+        self.step = step
+        self.loaded = step
+        self.transferred = 0
+
+    def locator(self, selector):
+        return FakeLocator(self)
+
+    async def evaluate(self, script, arg=None):
+        if "data-review-id" in script:
+            ids = self.ids[arg:self.loaded]
+            self.transferred += len(ids)
+            return [self.loaded, ids]
+        self.loaded = min(len(self.ids), self.loaded + self.step)
+        return self.loaded
+
+    async def wait_for_function(self, script, arg=None, timeout=None):
+        if self.loaded <= arg[1]:
+            raise TimeoutError()
+
+
+def test_stops_at_known_review_reading_each_id_once(scraper):
+    page = FeedPage(total=500)
+    asyncio.run(scraper.load_reviews(page, 1000, stop_ids={"id-399"}))
+    assert 400 <= page.loaded <= 410
+    # Her kimlik sayfadan bir kez aktarılır; her turda tüm akış okunmaz
+    assert page.transferred == page.loaded
+
+
+def test_without_stop_ids_no_ids_are_read(scraper):
+    page = FeedPage(total=50)
+    asyncio.run(scraper.load_reviews(page, 1000, max_stalls=1))
+    assert page.loaded == 50
+    assert page.transferred == 0
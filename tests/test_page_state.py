@@ -0,0 +1,26 @@
+"""classify_page_state için testler"""
+
+
+def info(text="", place=False, **extra):
+    return dict({'url': "https://www.google.com/maps/place/x", 'title': "Google Haritalar", 'text': text,
+                 'captcha': False, 'consent': False, 'place': place}, **extra)
+
+
+def test_full_not_found_messages(scraper):
+    assert scraper.classify_page_state(info("Google Haritalar bu konumu bulamıyor")) == scraper.PAGE_STATE_NOT_FOUND
+    assert scraper.classify_page_state(info("Google Maps can't find Test Kafe")) == scraper.PAGE_STATE_NOT_FOUND
+    assert scraper.classify_page_state(info("Google Maps can’t find \"Test Kafe\"")) == scraper.PAGE_STATE_NOT_FOUND
+    assert scraper.classify_page_state(info(), status=404) == scraper.PAGE_STATE_NOT_FOUND
+
+
+def test_review_text_is_not_a_not_found_page(scraper):
+    text = "Otopark bulunamadı, aradığımı bulamadım.\nI couldn't find the entrance and can't find parking."
+    assert scraper.classify_page_state(info(text)) == scraper.PAGE_STATE_UNKNOWN
+    assert scraper.classify_page_state(info(text, place=True)) == scraper.PAGE_STATE_PLACE
+
+
+def test_blocking_states_win(scraper):
+    assert scraper.classify_page_state(info(captcha=True, place=True)) == scraper.PAGE_STATE_CAPTCHA
+    assert scraper.classify_page_state(info("Our systems have detected unusual traffic")) == scraper.PAGE_STATE_RATE_LIMIT
+    assert scraper.classify_page_state(info(place=True), status=429) == scraper.PAGE_STATE_RATE_LIMIT
+    assert scraper.classify_page_state(info(consent=True)) == scraper.PAGE_STATE_CONSENT
@@ -0,0 +1,36 @@
+"""Kanonik mekan kimliği, mekan anahtarı ve toplu modda tekrarlanan bağlantıların birleştirilmesi için testler"""
+import pytest
+
+CID = 0x9c1e2f3a4b5c6d7e
+FEATURE = f"0x14cab9e7a7777c43:{CID:#x}"
+
+
+@pytest.mark.parametrize("url", [
+    f"https://www.google.com/maps/place/Kahve/@41.0,29.0,17z/data=!3m1!4b1!4m6!3m5!1s{FEATURE}!8m2!3d41!4d29?entry=ttu",
+    f"https://www.google.com/maps/place/Kahve/data=!4m2!3m1!1s{FEATURE.replace(':', '%3A')}?hl=en",
+    f"https://www.google.com/maps?ftid={FEATURE}",
+    f"https://maps.google.com/?cid={CID}",
+    f"https://www.google.com/search?q=kahve&ludocid={CID}",
+])
+def test_canonical_place_id_forms(scraper, url):
+    assert scraper.canonical_place_id(url) == f"cid:{CID}"
+
+
+@pytest.mark.parametrize("url", ["https://maps.app.goo.gl/abc", "https://www.google.com/maps/place/Kahve/@41,29,17z", "", None])
+def test_canonical_place_id_missing(scraper, url):
+    assert scraper.canonical_place_id(url) is None
+
+
+def test_place_storage_key(scraper):
+    # Aynı adlı iki şube farklı anahtar alır; kimlik yoksa ad slug'ına düşülür
+    assert scraper.place_storage_key("cid:1", "Starbucks") != scraper.place_storage_key("cid:2", "Starbucks")
+    assert scraper.place_storage_key("cid:1", "Starbucks") == "cid-1"
+    assert scraper.place_storage_key(None, "Starbucks Moda") == "starbucks-moda"
+    assert scraper.place_storage_key(None, "Bilinmeyen_Mekan") is None
+
+
+def test_dedupe_place_urls_keeps_first_per_place(scraper):
+    first = f"https://www.google.com/maps/place/Kahve/data=!1s{FEATURE}"
+    short = "https://maps.app.goo.gl/abc"
+    urls = [first, short, f"https://maps.google.com/?cid={CID}", short, "https://maps.google.com/?cid=7"]
+    assert scraper.dedupe_place_urls(urls) == [first, short, "https://maps.google.com/?cid=7"]
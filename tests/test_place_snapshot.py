@@ -0,0 +1,115 @@
+"""PlaceSnapshot seçici motoru ve genel bilgi aramasının kapsamı için testler"""
+import pytest
+
+PANEL = """
+<div id="app">
+  <a href="https://disari.example.com/">disari.example.com</a>
+  <div role="main" aria-label="Test Kafe">
+    <h1 class="DUwDvf">Test Kafe</h1>
+    <div><span>Fiyat</span><span class="a">₺₺</span><span class="b">x</span></div>
+    <div>Adres</div><p>ara</p><div>Moda Cad. No:12, Kadıköy</div>
+    <div class="m6QErb DxyBCb">{cards}</div>
+  </div>
+</div>
+"""
+
+CARD = ('<div class="jftiEf fontBodyMedium" data-review-id="r{index}"><div>Adres</div>'
+        '<div>Kartın içindeki adres gibi görünen uzun metin {index}</div>'
+        '<a href="https://kart.example.com/{index}">kart.example.com</a></div>')
+
+
+def snapshot(scraper, cards=0):
+    return scraper.PlaceSnapshot(PANEL.format(cards="".join(CARD.format(index=index) for index in range(cards))))
+
+
+def texts(nodes):
+    return [node.text_content().strip() for node in nodes]
+
+
+def test_sibling_combinators(scraper):
+    snap = snapshot(scraper)
+    assert texts(snap.select('span:has-text("Fiyat") + span')) == ["₺₺"]
+    assert texts(snap.select('span:has-text("Fiyat") ~ span')) == ["₺₺", "x"]
+    assert texts(snap.select('span.b + span')) == []
+    assert texts(snap.select('div:has-text("Adres") ~ div')) == ["Moda Cad. No:12, Kadıköy", ""]
+    # + yalnızca hemen önceki kardeşe bakar; arada <p> var
+    assert texts(snap.select('div:has-text("Adres") + div')) == []
+    assert texts(snap.select('p + div')) == ["Moda Cad. No:12, Kadıköy"]
+
+
+@pytest.mark.parametrize("selector", [
+    'div > a', 'div:nth-child(2)', '#kimlik', 'a[href^="http"]', 'a[href=http]', 'span:has-text(Fiyat)',
+    'div +', '+ div', 'a,', 'a ~ ~ b', 'div:has(', 'span[aria-label="x]', 'a::after',
+])
+def test_unsupported_selectors_raise(scraper, selector):
+    with pytest.raises(ValueError):
+        scraper.compile_selector(selector)
+
+
+def test_registry_selectors_are_supported(scraper):
+    extractors = [extractor for chain in scraper.GENERAL_INFO_REGISTRY.extractors.values() for extractor in chain]
+    selectors = [selector for extractor in extractors for selector in extractor.selectors]
+    assert selectors
+    for selector in selectors + scraper.PLACE_NAME_SELECTORS:
+        scraper.compile_selector(selector)
+
+
+def test_repeated_select_is_stable(scraper):
+    snap = snapshot(scraper, cards=20)
+    first = snap.select('div:has-text("Adres") ~ div')
+    assert snap.select('div:has-text("Adres") ~ div') == first
+    assert len(first) > 20
+
+
+def in_review_card(node):
+    while node is not None:
+        if node.get_attribute("data-review-id"):
+            return True
+        node = node.parent
+    return False
+
+
+def test_select_info_skips_review_cards(scraper):
+    snap = snapshot(scraper, cards=5)
+    everywhere = snap.select('div:has-text("Adres") ~ div')
+    info = snap.select_info('div:has-text("Adres") ~ div')
+    assert any(map(in_review_card, everywhere))
+    assert not any(map(in_review_card, info))
+    assert "Moda Cad. No:12, Kadıköy" in texts(info)
+
+
+def test_scoped_select_info_stays_in_place_panel(scraper):
+    snap = snapshot(scraper, cards=5)
+    assert snap.info_root.get_attribute("role") == "main"
+    assert texts(snap.select_info('a[href*="http"]')) == ["disari.example.com"]
+    assert texts(snap.select_info('a[href*="http"]', scoped=True)) == []
+
+
+def test_info_root_falls_back_to_document(scraper):
+    snap = scraper.PlaceSnapshot("<div><span>tek</span></div>")
+    assert snap.info_root is snap.root
+    assert texts(snap.select_info("span", scoped=True)) == ["tek"]
+
+
+def test_sibling_matching_scales_linearly(scraper, monkeypatch):
+    """Kart sayısı 8 katına çıkınca değerlendirilen bileşik seçici sayısı kabaca 8 katına çıkmalı
+    (ikinci dereceden büyümede 64 kat); süre yerine sayılan iş karşılaştırılır"""
+    calls = [0]
+    match_compound = scraper._match_compound
+
+    def counted(node, compound):
+        calls[0] += 1
+        return match_compound(node, compound)
+
+    monkeypatch.setattr(scraper, "_match_compound", counted)
+
+    def work(cards):
+        calls[0] = 0
+        snap = snapshot(scraper, cards)
+        snap.select('div:has-text("Pazartesi") ~ div')
+        snap.select('span:has-text("Telefon") + span')
+        return calls[0]
+
+    small, large = work(400), work(3200)
+    assert small > 400
+    assert large < small * 10
@@ -0,0 +1,183 @@
+"""Yorum listesi XHR yanıtlarının çözümü ve ReviewResponseCollector için regresyon testleri
+
+fixtures/ altındaki yanıtlar sentetiktir (bkz. fixtures/README.md); her iki uç noktada da aynı üç geçerli
+yorum ve metni olmadığı için atlanması gereken bir dördüncü öğe bulunur.
+"""
+import asyncio
+import json
+
+import pytest
+
+FIXTURE_IDS = [
+    "ChZDSUhNMG9nS0VJQ0FnSURUMV9pYlVnEAE",
+    "ChdDSUhNMG9nS0VJQ0FnSUNUcE1UaDZRRRAB",
+    "ChZDSUhNMG9nS0VJQ0FnSUR6bk1mQmZ3EAE",
+]
+ENDPOINT_FIXTURES = ["listugcposts.json", "listentitiesreviews.json"]
+
+
+class ListWriter:
+    """ReviewWriter yerine geçen, yazılan kayıtları listede tutan yazıcı"""
+
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+        return True
+
+
+class FakeResponse:
+    def __init__(self, url, body):
+        self.url = url
+        self.body = body
+
+    async def text(self):
+        return self.body
+
+
+def ugc_payload(*posts):
+    """(id, ad, tarih, puan, metin) demetlerinden XSSI önekli bir listugcposts gövdesi üret"""
+    items = []
+    for review_id, name, date, rating, text in posts:
+        review = [None] * 16
+        review[0] = [rating]
+        review[15] = [[text]]
+        items.append([[review_id, [None, None, 0, None, [None] * 5 + [[name]], None, date], review]])
+    return ")]}'\n" + json.dumps([None, None, items])
+
+
+@pytest.mark.parametrize("name", ENDPOINT_FIXTURES)
+def test_decodes_both_endpoints(scraper, fixture_text, name):
+    records = scraper.decode_review_payload(fixture_text(name))
+
+    assert [record['Yorum_ID'] for record in records] == FIXTURE_IDS
+    assert records[0] == {
+        'Kullanici': "Ayşe Yılmaz",
+        'Tarih': "2 hafta önce",
+        'Puan': "5 yıldız",
+        'Yorum': "Kahveleri çok lezzetli, personel güler yüzlü ve ilgili. Hafta sonu biraz kalabalık oluyor ama beklemeye değer.",
+        'Yorum_ID': FIXTURE_IDS[0],
+    }
+    assert [record['Puan'] for record in records] == ["5 yıldız", "3 yıldız", "4 yıldız"]
+
+
+def test_endpoints_agree(scraper, fixture_text):
+    ugc, entities = (scraper.decode_review_payload(fixture_text(name)) for name in ENDPOINT_FIXTURES)
+    assert ugc == entities
+
+
+@pytest.mark.parametrize("name", ENDPOINT_FIXTURES)
+def test_xssi_prefix_is_optional(scraper, fixture_text, name):
+    text = fixture_text(name)
+    assert text.startswith(scraper.XSSI_PREFIX)
+    unprefixed = text.strip()[len(scraper.XSSI_PREFIX):]
+    assert scraper.decode_review_payload(unprefixed) == scraper.decode_review_payload(text)
+    assert scraper.decode_review_payload("\n  " + text) == scraper.decode_review_payload(text)
+
+
+@pytest.mark.parametrize("body", [
+    "",
+    ")]}'",
+    ")]}'\n",
+    "<!DOCTYPE html><html>Bir hata oluştu</html>",
+    ")]}'\n[null, null, [[[\"abc\", ",
+    "null",
+    "42",
+    "{}",
+    "[null, null, \"metin\"]",
+    "[null, null, [1, [2], {\"a\": 3}, null]]",
+])
+def test_malformed_payload_returns_empty(scraper, body):
+    assert scraper.decode_review_payload(body) == []
+
+
+@pytest.mark.parametrize("name", ENDPOINT_FIXTURES)
+def test_truncated_fixture_returns_empty(scraper, fixture_text, name):
+    text = fixture_text(name)
+    for cut in (len(text) // 4, len(text) // 2, len(text) - 3):
+        assert scraper.decode_review_payload(text[:cut]) == []
+
+
+def test_invalid_reviews_are_skipped(scraper):
+    body = ugc_payload(
+        ("id-1", "Ali", "1 gün önce", 4, "Güzel"),
+        ("id-2", "Veli", "2 gün önce", 7, "Puan aralık dışı"),
+        ("id-3", "Ayşe", "3 gün önce", 3, "   "),
+        ("id-4", "", "", 2, "Adsız ve tarihsiz"),
+    )
+    records = scraper.decode_review_payload(body)
+    assert [record['Yorum_ID'] for record in records] == ["id-1", "id-4"]
+    assert records[1]['Kullanici'] == "Bilinmeyen Kullanıcı"
+    assert records[1]['Tarih'] == "Yeni yorum"
+
+
+def collect(collector, *bodies, url="https://www.google.com/maps/rpc/listugcposts?x=1"):
+    async def run():
+        for body in bodies:
+            collector.on_response(FakeResponse(url, body))
+        await collector.drain()
+    asyncio.run(run())
+
+
+def test_collector_buffers_until_bound(scraper, fixture_text):
+    collector = scraper.ReviewResponseCollector(max_reviews=10)
+    collect(collector, fixture_text("listugcposts.json"))
+    assert collector.responses == 1
+    assert [record['Yorum_ID'] for record in collector.buffer] == FIXTURE_IDS
+
+    writer = ListWriter()
+    collector.bind(writer)
+    assert collector.buffer == []
+    assert [record['Yorum_ID'] for record in writer.records] == FIXTURE_IDS
+    assert collector.written == 3
+
+
+def test_collector_ignores_other_responses_and_duplicates(scraper, fixture_text):
+    collector = scraper.ReviewResponseCollector(max_reviews=10)
+    collect(collector, fixture_text("listugcposts.json"), url="https://www.google.com/maps/vt/pb=tile")
+    assert collector.responses == 0
+
+    writer = ListWriter()
+    collector.bind(writer)
+    collect(collector, fixture_text("listugcposts.json"))
+    collect(collector, fixture_text("listentitiesreviews.json"),
+            url="https://www.google.com/maps/preview/review/listentitiesreviews?x=1")
+    assert collector.responses == 2
+    assert [record['Yorum_ID'] for record in writer.records] == FIXTURE_IDS
+
+
+def test_collector_respects_max_reviews(scraper, fixture_text):
+    collector = scraper.ReviewResponseCollector(max_reviews=2)
+    writer = ListWriter()
+    collector.bind(writer)
+    collect(collector, fixture_text("listugcposts.json"))
+    assert len(writer.records) == 2
+    assert collector.written == 2
+
+
+def test_bind_stops_buffered_records_at_watermark(scraper, fixture_text):
+    collector = scraper.ReviewResponseCollector(max_reviews=10)
+    collect(collector, fixture_text("listugcposts.json"))
+
+    writer = ListWriter()
+    collector.bind(writer, stop_ids={FIXTURE_IDS[1]})
+    assert [record['Yorum_ID'] for record in writer.records] == FIXTURE_IDS[:1]
+    assert collector.reached_watermark
+
+    # İşarete ulaşıldıktan sonra gelen yanıtlar yazılmaz
+    collect(collector, ugc_payload(("id-yeni", "Ali", "1 gün önce", 5, "Sonradan gelen")))
+    assert len(writer.records) == 1
+
+
+def test_stop_ids_apply_to_live_responses(scraper, fixture_text):
+    collector = scraper.ReviewResponseCollector(max_reviews=10)
+    writer = ListWriter()
+    collector.bind(writer, stop_ids={FIXTURE_IDS[2]})
+    assert not collector.reached_watermark
+
+    collect(collector, fixture_text("listentitiesreviews.json"))
+    assert [record['Yorum_ID'] for record in writer.records] == FIXTURE_IDS[:2]
+    assert collector.reached_watermark
+    # İşaretin kendisi ve sonrası görülmüş sayılmaz; DOM yedeği de onları atlamamalı
+    assert collector.seen_ids == set(FIXTURE_IDS[:2])
@@ -0,0 +1,123 @@
+"""scrape_review_shards'ın çıkarım modunu izlemesi ve parça sayfalarındaki durum kontrolü için testler"""
+import asyncio
+
+import pytest
+
+
+class FakeLocator:
+    async def count(self):
+        return 10
+
+
+class FakeContext:
+    def __init__(self, state_info):
+        self.state_info = state_info
+
+    async def new_page(self):
+        return FakePage(self, self.state_info)
+
+
+class FakePage:
+    def __init__(self, context=None, state_info=None):
+        self.context = context
+        self.state_info = state_info
+        self.listeners = []
+
+    async def goto(self, url, **options):
+        return None
+
+    async def wait_for_selector(self, selector, **options):
+        pass
+
+    async def evaluate(self, script, arg=None):
+        return self.state_info
+
+    def locator(self, selector):
+        return FakeLocator()
+
+    def on(self, event, handler):
+        self.listeners.append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners.remove(handler)
+
+    async def close(self):
+        pass
+
+
+class CountingWriter:
+    def __init__(self):
+        self.count = 0
+
+    def write(self, record):
+        self.count += 1
+        return True
+
+
+PLACE_INFO = {'url': "https://www.google.com/maps/place/x", 'title': "", 'text': "", 'captcha': False, 'consent': False, 'place': True}
+
+
+@pytest.fixture
+def shards(scraper, monkeypatch):
+    calls = []
+
+    async def fake_async(*args, **kwargs):
+        return True
+
+    async def extractor(name, page, max_reviews, writer):
+        calls.append((name, max_reviews))
+        for _ in range(min(3, max_reviews)):
+            writer.write({})
+        return min(3, max_reviews)
+
+    async def stream(page, max_reviews, writer, stats, **options):
+        calls.append(("stream", max_reviews))
+
+    async def batch(page, max_reviews, writer, **options):
+        return await extractor("batch", page, max_reviews, writer)
+
+    async def locators(page, max_reviews, writer, **options):
+        return await extractor("locator", page, max_reviews, writer)
+
+    async def network(page, collector, max_reviews, writer, **options):
+        assert collector.writer is writer
+        return await extractor("network", page, max_reviews, writer)
+
+    for name in ("open_reviews_tab", "select_sort", "load_reviews", "expand_reviews"):
+        monkeypatch.setattr(scraper, name, fake_async)
+    monkeypatch.setattr(scraper, "stream_reviews", stream)
+    monkeypatch.setattr(scraper, "extract_reviews_batch", batch)
+    monkeypatch.setattr(scraper, "extract_reviews_with_locators", locators)
+    monkeypatch.setattr(scraper, "extract_reviews_network", network)
+
+    def run(extraction_mode, max_reviews=5, state_info=PLACE_INFO):
+        page = FakePage(FakeContext(state_info), PLACE_INFO)
+        writer = CountingWriter()
+        coro = scraper.scrape_review_shards(page, "https://www.google.com/maps/place/x", ["newest", "lowest_rating"],
+                                            max_reviews, writer, scraper.RunMetrics(), extraction_mode=extraction_mode)
+        asyncio.run(coro)
+        return calls, writer, page
+
+    return run
+
+
+@pytest.mark.parametrize("mode", ["batch", "locator", "network"])
+def test_shards_use_selected_extraction(shards, mode):
+    calls, writer, page = shards(mode)
+    assert [name for name, _ in calls] == [mode, mode]
+    # Ortak hedef sıralı çıkarımda kalan sayıya göre bölünür
+    assert sorted(limit for _, limit in calls) == [2, 5]
+    assert writer.count == 5
+    assert page.listeners == []
+
+
+def test_stream_shards_keep_stream_loader(shards):
+    calls, writer, page = shards("stream")
+    assert calls == [("stream", 5), ("stream", 5)]
+
+
+def test_blocked_shard_raises(scraper, shards):
+    captcha = dict(PLACE_INFO, captcha=True)
+    with pytest.raises(scraper.PageStateError) as error:
+        shards("batch", state_info=captcha)
+    assert error.value.state == scraper.PAGE_STATE_CAPTCHA
@@ -0,0 +1,47 @@
+"""AdaptiveScheduler'ın yavaş host kararı ve hız sınırı bekleme muhasebesi için testler"""
+import asyncio
+import types
+
+
+class FakeRoute:
+    def __init__(self, page, url="https://www.google.com/maps/place/kahve"):
+        self.request = types.SimpleNamespace(url=url, frame=types.SimpleNamespace(page=page))
+        self.fell_back = False
+
+    async def fallback(self):
+        self.fell_back = True
+
+
+class FakePage:
+    pass
+
+
+def goto_result(seconds, rate_wait=None):
+    metrics = {'phases': {'goto': {'seconds': seconds}}}
+    if rate_wait is not None:
+        metrics['goto_rate_wait_seconds'] = rate_wait
+    return {'url': "https://example.com", 'metrics': metrics}
+
+
+def test_outcome_ignores_own_rate_limit_queueing(scraper):
+    scheduler = scraper.AdaptiveScheduler(rate=2, slow_seconds=15)
+    assert scheduler._outcome(goto_result(20)) == "slow"
+    assert scheduler._outcome(goto_result(20, rate_wait=8)) == "ok"
+    assert scheduler._outcome(goto_result(20, rate_wait=2)) == "slow"
+    assert scheduler._outcome({'url': "x", 'error': "hata", 'page_state': scraper.PAGE_STATE_CAPTCHA}) == "blocked"
+
+
+def test_throttle_records_wait_per_page(scraper):
+    async def run():
+        scheduler = scraper.AdaptiveScheduler(rate=4, burst=1)
+        page, other = FakePage(), FakePage()
+        routes = [FakeRoute(page) for _ in range(3)]
+        for route in routes:
+            await scheduler._throttle(route)
+        assert all(route.fell_back for route in routes)
+        waited = scheduler.take_wait(page)
+        # Kova saniyede 4 jeton doluyor; ilk istek beklemez, sonraki ikisi ~0,25 sn bekler
+        assert 0.4 <= waited < 1.0
+        assert scheduler.take_wait(page) == 0.0
+        assert scheduler.take_wait(other) == 0.0
+    asyncio.run(run())
@@ -0,0 +1,21 @@
+"""SqliteStore mekan upsert'i için testler"""
+from datetime import datetime
+
+
+def info(**fields):
+    return {field: [value] for field, value in fields.items()}
+
+
+def test_missed_fields_keep_previous_values(scraper, tmp_path):
+    store = scraper.SqliteStore(str(tmp_path / "maps.db"))
+    store.write_place("cid-1", "https://maps/1", info(Mekan_Adi="Test Kafe", Puan="4,5", Yorum_Sayisi="(1.234)",
+                                                      Adres="Moda Cad. No:12"), datetime(2026, 1, 1))
+    # Hızlı katmanda ad, puan, yorum sayısı ve adres ıskalandı
+    store.write_place("cid-1", "https://maps/1", info(Mekan_Adi="Bilinmeyen_Mekan", Puan="Belirtilmemiş",
+                                                      Yorum_Sayisi="Belirtilmemiş", Adres="Belirtilmemiş"), datetime(2026, 1, 2))
+    row = store.conn.execute("SELECT name, rating, review_count, address, last_scraped_at FROM places").fetchone()
+    assert row == ("Test Kafe", 4.5, 1234, "Moda Cad. No:12", "2026-01-02T00:00:00")
+
+    store.write_place("cid-1", "https://maps/1", info(Mekan_Adi="Test Kafe Moda", Puan="4,6"), datetime(2026, 1, 3))
+    assert store.conn.execute("SELECT name, rating FROM places").fetchone() == ("Test Kafe Moda", 4.6)
+    store.close()
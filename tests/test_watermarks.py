@@ -0,0 +1,62 @@
+"""--since-last-run işaretinin ne zaman ilerletildiği için testler"""
+import asyncio
+
+
+def test_watermark_complete(scraper):
+    old = {"eski-1", "eski-2"}
+    # İlk çalıştırma: işaret yok
+    assert scraper.watermark_complete(set(), 100, 100)
+    # Eski işarete ulaşıldı (sınır tam dolmuş olsa bile)
+    assert scraper.watermark_complete(old, 100, 100, reached=True)
+    # Akış sınır dolmadan bitti
+    assert scraper.watermark_complete(old, 40, 100)
+    # Sınır eski işarete varmadan kesti
+    assert not scraper.watermark_complete(old, 100, 100)
+
+
+def test_store_keeps_newest_ids(scraper, tmp_path):
+    path = str(tmp_path / "isaretler.json")
+    store = scraper.WatermarkStore(path)
+    store.update("cid-1", [f"id-{index}" for index in range(10)])
+    store.update("cid-2", [])
+    reloaded = scraper.WatermarkStore(path)
+    assert reloaded.get("cid-1") == {f"id-{index}" for index in range(scraper.WATERMARK_SIZE)}
+    assert reloaded.get("cid-2") == set()
+
+
+def test_concurrent_stores_keep_each_others_marks(scraper, tmp_path):
+    path = str(tmp_path / "isaretler.json")
+    first, second = scraper.WatermarkStore(path), scraper.WatermarkStore(path)
+    first.update("cid-1", ["a"])
+    second.update("cid-2", ["b"])
+    reloaded = scraper.WatermarkStore(path)
+    assert reloaded.get("cid-1") == {"a"}
+    assert reloaded.get("cid-2") == {"b"}
+
+
+class CountingWriter:
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+        return True
+
+
+def test_batch_reports_watermark_reached_at_limit(scraper, monkeypatch):
+    async def cards(page, **options):
+        return [{'id': review_id} for review_id in ("yeni-1", "yeni-2", "eski-1", "eski-2")]
+
+    monkeypatch.setattr(scraper, "extract_review_cards", cards)
+    monkeypatch.setattr(scraper, "parse_review_card", lambda card: {'Yorum_ID': card['id']})
+
+    def run(max_reviews):
+        stats, writer = {}, CountingWriter()
+        written = asyncio.run(scraper.extract_reviews_batch(None, max_reviews, writer, stop_ids={"eski-1"}, stats=stats))
+        return written, stats.get('reached_known', False)
+
+    # Sınır tam işaretin önünde doldu: işarete ulaşılmış sayılır
+    assert run(2) == (2, True)
+    assert run(10) == (2, True)
+    # Sınır işaretten önce kesti
+    assert run(1) == (1, False)